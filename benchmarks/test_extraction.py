@@ -0,0 +1,23 @@
+from typing import Any
+
+import pytest
+
+from mdcrawler.content_extractor import extract_content
+from mdcrawler.synthetic import PAGE_KINDS, generate_page
+
+pytest.importorskip("pytest_benchmark")
+
+
+@pytest.mark.parametrize("kind", PAGE_KINDS)
+def test_extract_content(benchmark: Any, kind: str) -> None:
+    html = generate_page(kind)
+
+    result = benchmark(
+        extract_content,
+        html,
+        "https://docs.example.com/docs/page",
+        "https://docs.example.com/docs/",
+        include_images=True,
+    )
+
+    assert result.markdown.strip()
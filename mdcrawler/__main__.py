@@ -0,0 +1,3 @@
+from mdcrawler.cli import main
+
+raise SystemExit(main())
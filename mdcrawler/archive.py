@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import zlib
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from mdcrawler.crawler import Page
+from mdcrawler.markdown_writer import render_markdown, slugify
+
+PACK_FILENAME = "pages.pack"
+INDEX_FILENAME = "pages.index.json"
+PACK_MAGIC = b"MDCPACK1\n"
+
+
+@dataclass
+class ArchiveEntry:
+    url: str
+    slug: str
+    title: str
+    offset: int
+    length: int
+    hash: str
+    compressed: bool
+
+
+@dataclass
+class ArchivedPage:
+    url: str
+    slug: str
+    title: str
+    markdown: str
+
+
+def write_archive(pages: Iterable[Page], output_dir: Path, compress: bool = False) -> None:
+    with ArchiveWriter(output_dir, compress=compress) as writer:
+        for page in pages:
+            writer.write_page(page)
+
+
+class ArchiveWriter:
+    """Append rendered pages to a single pack file and record their offsets in an index."""
+
+    def __init__(self, output_dir: Path, compress: bool = False) -> None:
+        self.output_dir = output_dir
+        self.compress = compress
+        self.entries: list[ArchiveEntry] = []
+        self._handle = (output_dir / PACK_FILENAME).open("wb")
+        self._handle.write(PACK_MAGIC)
+        self._offset = len(PACK_MAGIC)
+
+    def __enter__(self) -> ArchiveWriter:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def write_page(self, page: Page) -> None:
+        data = render_markdown(page, image_prefix="images/").encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        if self.compress:
+            data = zlib.compress(data)
+        self._handle.write(data)
+        self.entries.append(
+            ArchiveEntry(
+                url=page.url,
+                slug=slugify(page.url),
+                title=page.title,
+                offset=self._offset,
+                length=len(data),
+                hash=digest,
+                compressed=self.compress,
+            )
+        )
+        self._offset += len(data)
+
+    def close(self) -> None:
+        if self._handle.closed:
+            return
+        self._handle.close()
+        index = {"pack": PACK_FILENAME, "pages": [entry.__dict__ for entry in self.entries]}
+        (self.output_dir / INDEX_FILENAME).write_text(
+            json.dumps(index, indent=2) + "\n", encoding="utf-8"
+        )
+
+
+class Archive:
+    """Read pages from a pack written by :class:`ArchiveWriter` without loading the whole file."""
+
+    def __init__(self, directory: Path | str) -> None:
+        directory = Path(directory)
+        index = json.loads((directory / INDEX_FILENAME).read_text(encoding="utf-8"))
+        self.entries = [ArchiveEntry(**entry) for entry in index["pages"]]
+        self._by_url = {entry.url: entry for entry in self.entries}
+        self._by_slug = {entry.slug: entry for entry in self.entries}
+        self._file = (directory / index["pack"]).open("rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[: len(PACK_MAGIC)] != PACK_MAGIC:
+            self.close()
+            raise ValueError(f"Not an mdcrawler pack: {directory / index['pack']}")
+
+    def __enter__(self) -> Archive:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, url: object) -> bool:
+        return url in self._by_url
+
+    def __iter__(self) -> Iterator[ArchiveEntry]:
+        return iter(self.entries)
+
+    def get(self, url: str) -> ArchivedPage | None:
+        entry = self._by_url.get(url)
+        return self._load(entry) if entry else None
+
+    def get_by_slug(self, slug: str) -> ArchivedPage | None:
+        entry = self._by_slug.get(slug)
+        return self._load(entry) if entry else None
+
+    def close(self) -> None:
+        self._mmap.close()
+        self._file.close()
+
+    def _load(self, entry: ArchiveEntry) -> ArchivedPage:
+        data = self._mmap[entry.offset : entry.offset + entry.length]
+        if entry.compressed:
+            data = zlib.decompress(data)
+        return ArchivedPage(
+            url=entry.url, slug=entry.slug, title=entry.title, markdown=data.decode("utf-8")
+        )
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlsplit
+
+from mdcrawler.crawler import Crawler, Page, derive_prefix
+from mdcrawler.hosts import HostLimiter
+from mdcrawler.options import OUTPUT_FORMATS
+from mdcrawler.outputs import write_outputs
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:  # pragma: no cover - Python 3.10
+    import tomli as tomllib
+
+
+@dataclass
+class Job:
+    """One site of a batch run, as read from a ``[[job]]`` table of ``jobs.toml``."""
+
+    name: str
+    start_url: str
+    output: str
+    prefix: str | None = None
+    include_images: bool = False
+    tag_blacklist: list[str] | None = None
+    attr_blacklist: list[str] | None = None
+    formats: list[str] = field(default_factory=lambda: ["markdown"])
+
+
+@dataclass
+class BatchConfig:
+    jobs: list[Job]
+    workers: int = 16
+    per_host: int = 4
+
+
+def load_jobs(path: Path) -> BatchConfig:
+    """Read a batch file: optional ``[batch]`` limits plus one ``[[job]]`` table per site."""
+    with path.open("rb") as handle:
+        document = tomllib.load(handle)
+    settings = document.get("batch", {})
+    jobs = []
+    for index, table in enumerate(document.get("job", [])):
+        missing = {"start_url", "output"} - set(table)
+        if missing:
+            raise ValueError(f"job {index} is missing {', '.join(sorted(missing))}")
+        table = dict(table)
+        table.setdefault("name", urlsplit(table["start_url"]).netloc or f"job-{index}")
+        if "format" in table:
+            table["formats"] = table.pop("format")
+        if isinstance(table.get("formats"), str):
+            table["formats"] = [table["formats"]]
+        unknown = sorted(set(table.get("formats", [])) - set(OUTPUT_FORMATS))
+        if unknown:
+            raise ValueError(f"job {table['name']}: unknown output format(s) {', '.join(unknown)}")
+        jobs.append(Job(**table))
+    if not jobs:
+        raise ValueError(f"{path} defines no [[job]] tables")
+    return BatchConfig(
+        jobs=jobs,
+        workers=settings.get("workers", BatchConfig.workers),
+        per_host=settings.get("per_host", BatchConfig.per_host),
+    )
+
+
+@dataclass
+class _JobState:
+    job: Job
+    crawler: Crawler
+    pending: dict[str, deque[str]] = field(default_factory=dict)
+    pages: list[Page] = field(default_factory=list)
+    in_flight: int = 0
+    done: bool = False
+
+    def queue(self, url: str) -> None:
+        self.pending.setdefault(urlsplit(url).netloc, deque()).append(url)
+
+
+class BatchScheduler:
+    """Crawl many sites in one process under a shared worker budget.
+
+    ``workers`` threads fetch and parse URLs of all jobs; at most ``per_host`` of them hit any
+    single host at once, and only one while a host is quarantined for latency spikes (see
+    :class:`~mdcrawler.hosts.HostLimiter`). Finished URLs go through each job's
+    :meth:`Crawler.complete <mdcrawler.crawler.Crawler.complete>`, so retries of timed-out
+    URLs, link discovery and failures work as in a single-site crawl. Free workers
+    are handed out round-robin across jobs that have eligible work, so a large site cannot
+    starve the small ones. Each job's outputs are written on the same pool as soon as its
+    crawl is finished; a job whose outputs fail to write is recorded in :attr:`errors`
+    without affecting the others.
+    """
+
+    def __init__(self, jobs: list[Job], workers: int = 16, per_host: int = 4) -> None:
+        self.workers = max(1, workers)
+        self.per_host = max(1, per_host)
+        self.states: list[_JobState] = []
+        self._hosts = HostLimiter(self.per_host)
+        for job in jobs:
+            crawler = Crawler(
+                start_url=job.start_url,
+                prefix=job.prefix or derive_prefix(job.start_url),
+                include_images=job.include_images,
+                tag_blacklist=job.tag_blacklist,
+                attr_blacklist=job.attr_blacklist,
+                hosts=self._hosts,
+            )
+            crawler.mark_visited(job.start_url)
+            state = _JobState(job, crawler)
+            state.queue(job.start_url)
+            self.states.append(state)
+        self._next = 0
+        self.errors: dict[str, str] = {}
+
+    def run(self) -> dict[str, int]:
+        """Crawl and write every job; returns the number of pages written per job name.
+
+        Jobs whose outputs could not be written count as zero pages.
+        """
+        results: dict[str, int] = {}
+        tasks: dict[Future[Any], tuple[_JobState, str | None]] = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while True:
+                while len(tasks) < self.workers:
+                    picked = self._pick()
+                    if picked is None:
+                        break
+                    state, url = picked
+                    tasks[executor.submit(state.crawler.crawl_url, url)] = (state, url)
+                if not tasks:
+                    break
+                finished, _ = wait(list(tasks), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    owner, crawled_url = tasks.pop(future)
+                    if crawled_url is None:
+                        results[owner.job.name] = self._written(owner, future)
+                        continue
+                    owner.in_flight -= 1
+                    page = owner.crawler.complete(crawled_url, future.result(), owner.queue)
+                    if page is not None:
+                        owner.pages.append(page)
+                    if not owner.pending and not owner.in_flight and not owner.done:
+                        owner.done = True
+                        tasks[executor.submit(self._write, owner)] = (owner, None)
+        return results
+
+    def _pick(self) -> tuple[_JobState, str] | None:
+        for offset in range(len(self.states)):
+            index = (self._next + offset) % len(self.states)
+            state = self.states[index]
+            for host, urls in state.pending.items():
+                if not self._hosts.acquire(host):
+                    continue
+                url = urls.popleft()
+                if not urls:
+                    del state.pending[host]
+                state.in_flight += 1
+                self._next = index + 1
+                return state, url
+        return None
+
+    def _written(self, state: _JobState, future: Future[Any]) -> int:
+        try:
+            future.result()
+        except Exception as exc:
+            self.errors[state.job.name] = f"{type(exc).__name__}: {exc}"
+            print(f"[{state.job.name}] writing failed: {self.errors[state.job.name]}", flush=True)
+            return 0
+        return len(state.pages)
+
+    def _write(self, state: _JobState) -> None:
+        job = state.job
+        if not state.pages:
+            print(f"[{job.name}] no pages crawled", flush=True)
+            return
+        output_path = Path(job.output)
+        output_path.mkdir(parents=True, exist_ok=True)
+        write_outputs(
+            state.pages,
+            output_path,
+            start_url=job.start_url,
+            formats=job.formats,
+            unfinished=state.crawler.unfinished,
+        )
+        print(f"[{job.name}] {len(state.pages)} pages -> {output_path}", flush=True)
+
+
+def batch_main(argv: list[str]) -> int:
+    """Crawl every job of a batch file within one shared worker budget."""
+    parser = argparse.ArgumentParser(
+        prog="mdcrawler batch", description="Crawl several documentation sites in one process."
+    )
+    parser.add_argument("jobs", help="TOML file with [batch] limits and [[job]] tables.")
+    parser.add_argument("--workers", type=int, help="Total fetch/parse workers for all jobs.")
+    parser.add_argument("--per-host", type=int, help="Maximum concurrent requests per host.")
+    args = parser.parse_args(argv)
+    try:
+        config = load_jobs(Path(args.jobs))
+    except (OSError, ValueError, TypeError) as exc:
+        parser.error(str(exc))
+
+    scheduler = BatchScheduler(
+        config.jobs,
+        workers=args.workers or config.workers,
+        per_host=args.per_host or config.per_host,
+    )
+    start = time.monotonic()
+    results = scheduler.run()
+    print(
+        f"Crawled {sum(results.values())} pages for {len(results)} jobs "
+        f"in {time.monotonic() - start:.1f}s",
+        flush=True,
+    )
+    return 0 if all(results.values()) else 1
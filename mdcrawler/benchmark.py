@@ -0,0 +1,462 @@
+from __future__ import annotations
+
+import argparse
+import cProfile
+import json
+import math
+import os
+import platform
+import pstats
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from mdcrawler.content_extractor import extract_content
+from mdcrawler.synthetic import (
+    PAGE_KINDS,
+    SiteConfig,
+    add_site_arguments,
+    generate_page,
+    site_arguments,
+    site_config_from_args,
+)
+
+RESULTS_VERSION = 1
+_BASE_URL = "https://docs.example.com/docs/page"
+_PREFIX = "https://docs.example.com/docs/"
+
+SUITES = ("extract", "crawl")
+
+# Extra crawl CLI arguments per fetch engine compared by the crawl benchmark.
+CRAWL_ENGINES: dict[str, list[str]] = {"threads": [], "http2": ["--http2"]}
+
+
+def run_extraction_benchmark(
+    kinds: tuple[str, ...] = PAGE_KINDS,
+    scale: float = 1.0,
+    repeat: int = 3,
+    include_images: bool = True,
+) -> dict[str, dict[str, Any]]:
+    """Time ``extract_content`` on each synthetic page kind.
+
+    Every kind is timed ``repeat`` times, then profiled once for per-function cumulative time
+    inside ``content_extractor`` and once under tracemalloc for peak memory.
+    """
+    results: dict[str, dict[str, Any]] = {}
+    for kind in kinds:
+        html = generate_page(kind, scale=scale)
+        runs = [_time_extract(html, include_images) for _ in range(max(1, repeat))]
+        median = statistics.median(runs)
+        results[f"extract.{kind}"] = {
+            "unit": "seconds",
+            "runs": runs,
+            "median": median,
+            "pages_per_sec": 1 / median if median else 0.0,
+            "html_bytes": len(html.encode("utf-8")),
+            "functions": _profile_functions(html, include_images),
+            "peak_memory_bytes": _peak_memory(html, include_images),
+        }
+    return results
+
+
+def run_crawl_benchmark(
+    site: SiteConfig,
+    thread_counts: tuple[int, ...] = (1, 4, 16),
+    engines: tuple[str, ...] = ("threads",),
+    repeat: int = 1,
+    include_images: bool = False,
+) -> dict[str, dict[str, Any]]:
+    """Run the full ``mdcrawler`` CLI against a local synthetic site.
+
+    The site and every crawl run in separate processes so CPU time and peak RSS belong to the
+    crawl alone. Each (engine, thread count) pair is run ``repeat`` times.
+    """
+    results: dict[str, dict[str, Any]] = {}
+    with _serve_site(site) as start_url:
+        for engine in engines:
+            for threads in thread_counts:
+                samples = [
+                    _crawl_once(start_url, threads, CRAWL_ENGINES[engine], include_images)
+                    for _ in range(max(1, repeat))
+                ]
+                runs = [sample["elapsed"] for sample in samples]
+                median = statistics.median(runs)
+                pages = statistics.median(sample["pages"] for sample in samples)
+                results[f"crawl.{engine}.threads-{threads}"] = {
+                    "unit": "seconds",
+                    "runs": runs,
+                    "median": median,
+                    "pages": pages,
+                    "pages_per_sec": pages / median if median else 0.0,
+                    "latency_p50": statistics.median(s["latency_p50"] for s in samples),
+                    "latency_p99": statistics.median(s["latency_p99"] for s in samples),
+                    "cpu_utilization": statistics.median(s["cpu_utilization"] for s in samples),
+                    "peak_memory_bytes": max(sample["peak_rss_bytes"] for sample in samples),
+                }
+    return results
+
+
+def results_document(benchmarks: dict[str, dict[str, Any]], **settings: Any) -> dict[str, Any]:
+    return {
+        "version": RESULTS_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": settings,
+        "benchmarks": benchmarks,
+    }
+
+
+def format_results(benchmarks: dict[str, dict[str, Any]]) -> str:
+    lines = [f"{'benchmark':<28} {'median s':>10} {'pages/s':>10} {'peak MiB':>10}"]
+    for name, result in benchmarks.items():
+        lines.append(
+            f"{name:<28} {result['median']:>10.4f} {result['pages_per_sec']:>10.2f} "
+            f"{result.get('peak_memory_bytes', 0) / 1_048_576:>10.1f}"
+        )
+        if "latency_p50" in result:
+            lines.append(
+                f"    latency p50 {result['latency_p50'] * 1000:.1f} ms, "
+                f"p99 {result['latency_p99'] * 1000:.1f} ms, "
+                f"CPU {result['cpu_utilization'] * 100:.0f}%"
+            )
+        for function, seconds in list(result.get("functions", {}).items())[:8]:
+            lines.append(f"    {function:<24} {seconds:>14.4f}")
+    return "\n".join(lines)
+
+
+def bench_main(argv: list[str]) -> int:
+    """``mdcrawler bench``: run extraction and/or crawl benchmarks and save results as JSON.
+
+    With ``--compare BASELINE.json`` the benchmarks recorded in the baseline are re-run with
+    its settings, a diff table is printed and the exit status is 1 on significant regressions.
+    """
+    parser = argparse.ArgumentParser(
+        prog="mdcrawler bench", description="Benchmark extraction and crawling on synthetic data."
+    )
+    parser.add_argument(
+        "--suite",
+        default="extract",
+        help=f"Comma-separated suites: {','.join(SUITES)}. Default: extract",
+    )
+    parser.add_argument(
+        "--kinds",
+        default=",".join(PAGE_KINDS),
+        help=f"Comma-separated page kinds. Default: {','.join(PAGE_KINDS)}",
+    )
+    parser.add_argument("--scale", type=float, default=1.0, help="Page size multiplier.")
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        help="Timed runs per benchmark. Default: 3, or 5 with --compare",
+    )
+    parser.add_argument(
+        "--output", default="bench.json", help="Where to write JSON results. Default: bench.json"
+    )
+    parser.add_argument(
+        "--crawl-threads",
+        default="1,4,16",
+        help="Comma-separated thread counts for the crawl suite. Default: 1,4,16",
+    )
+    parser.add_argument(
+        "--crawl-engines",
+        default="threads",
+        help=f"Comma-separated engines: {','.join(CRAWL_ENGINES)}. Default: threads",
+    )
+    parser.add_argument(
+        "--compare",
+        metavar="BASELINE",
+        help="Re-run the benchmarks in BASELINE (a previous results file) and compare.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Relative slowdown of the median that counts as a regression. Default: 0.10",
+    )
+    parser.add_argument(
+        "--confidence",
+        type=float,
+        default=0.95,
+        help="Required confidence (Mann-Whitney U) that a slowdown is real. Default: 0.95",
+    )
+    add_site_arguments(parser, prefix="site-")
+    args = parser.parse_args(argv)
+
+    baseline: dict[str, Any] | None = None
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        settings = baseline["settings"]
+        suites = tuple(settings["suites"])
+        kinds = tuple(settings.get("kinds", PAGE_KINDS))
+        engines = tuple(settings.get("crawl_engines", ("threads",)))
+        thread_counts = tuple(settings.get("crawl_threads", (1, 4, 16)))
+        scale = settings["scale"]
+        site = SiteConfig(**settings.get("site", {}))
+    else:
+        suites = _split(args.suite)
+        kinds = _split(args.kinds)
+        engines = _split(args.crawl_engines)
+        thread_counts = tuple(int(value) for value in _split(args.crawl_threads))
+        scale = args.scale
+        site = site_config_from_args(args)
+    repeat = args.repeat or (5 if baseline else 3)
+    for label, values, allowed in (
+        ("suite", suites, SUITES),
+        ("page kind", kinds, PAGE_KINDS),
+        ("engine", engines, tuple(CRAWL_ENGINES)),
+    ):
+        unknown = sorted(set(values) - set(allowed))
+        if unknown:
+            parser.error(f"unknown {label}(s): {', '.join(unknown)}")
+
+    benchmarks: dict[str, dict[str, Any]] = {}
+    if "extract" in suites:
+        benchmarks.update(run_extraction_benchmark(kinds, scale=scale, repeat=repeat))
+    if "crawl" in suites:
+        benchmarks.update(run_crawl_benchmark(site, thread_counts, engines=engines, repeat=repeat))
+    document = results_document(
+        benchmarks,
+        suites=list(suites),
+        kinds=list(kinds),
+        scale=scale,
+        repeat=repeat,
+        **(
+            {
+                "site": site.__dict__,
+                "crawl_threads": list(thread_counts),
+                "crawl_engines": list(engines),
+            }
+            if "crawl" in suites
+            else {}
+        ),
+    )
+    Path(args.output).write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+    print(format_results(benchmarks))
+    print(f"Results written to {args.output}", file=sys.stderr)
+    if baseline is None:
+        return 0
+
+    comparisons = compare_results(
+        baseline["benchmarks"], benchmarks, threshold=args.threshold, confidence=args.confidence
+    )
+    print()
+    print(format_comparison(comparisons))
+    return 1 if any(row["status"] == "regression" for row in comparisons) else 0
+
+
+def compare_results(
+    baseline: dict[str, dict[str, Any]],
+    current: dict[str, dict[str, Any]],
+    threshold: float = 0.10,
+    confidence: float = 0.95,
+) -> list[dict[str, Any]]:
+    """Compare per-benchmark run samples (lower is better).
+
+    A benchmark regresses when its median is more than ``threshold`` slower than the baseline
+    and a one-sided Mann-Whitney U test says the slowdown is real with at least ``confidence``.
+    Improvements are reported symmetrically.
+    """
+    rows: list[dict[str, Any]] = []
+    for name in sorted(set(baseline) | set(current)):
+        if name not in current:
+            rows.append({"name": name, "status": "missing"})
+            continue
+        if name not in baseline:
+            rows.append({"name": name, "status": "new", "current": current[name]["median"]})
+            continue
+        before = baseline[name]["runs"]
+        after = current[name]["runs"]
+        base_median = statistics.median(before)
+        new_median = statistics.median(after)
+        change = (new_median - base_median) / base_median if base_median else 0.0
+        p_slower = _mann_whitney_p(after, before)
+        p_faster = _mann_whitney_p(before, after)
+        status = "ok"
+        if change > threshold and p_slower <= 1 - confidence:
+            status = "regression"
+        elif change < -threshold and p_faster <= 1 - confidence:
+            status = "improved"
+        rows.append(
+            {
+                "name": name,
+                "status": status,
+                "baseline": base_median,
+                "current": new_median,
+                "change": change,
+                "p_value": p_slower if change >= 0 else p_faster,
+            }
+        )
+    return rows
+
+
+def format_comparison(rows: list[dict[str, Any]]) -> str:
+    lines = [
+        f"{'benchmark':<28} {'baseline s':>11} {'current s':>11} {'change':>8} {'p':>7}  status"
+    ]
+    for row in rows:
+        if "change" not in row:
+            current = f"{row['current']:>11.4f}" if "current" in row else f"{'-':>11}"
+            lines.append(f"{row['name']:<28} {'-':>11} {current} {'':>8} {'':>7}  {row['status']}")
+            continue
+        status = row["status"].upper() if row["status"] == "regression" else row["status"]
+        lines.append(
+            f"{row['name']:<28} {row['baseline']:>11.4f} {row['current']:>11.4f} "
+            f"{row['change'] * 100:>+7.1f}% {row['p_value']:>7.3f}  {status}"
+        )
+    return "\n".join(lines)
+
+
+def _mann_whitney_p(slower: list[float], faster: list[float]) -> float:
+    """One-sided p-value that ``slower`` tends to be larger than ``faster``.
+
+    Uses the normal approximation with tie and continuity correction, which is adequate for
+    the handful of runs a benchmark takes.
+    """
+    n1, n2 = len(slower), len(faster)
+    if not n1 or not n2:
+        return 1.0
+    combined = sorted([(value, 0) for value in slower] + [(value, 1) for value in faster])
+    ranks = [0.0] * len(combined)
+    tie_term = 0.0
+    index = 0
+    while index < len(combined):
+        end = index
+        while end + 1 < len(combined) and combined[end + 1][0] == combined[index][0]:
+            end += 1
+        for position in range(index, end + 1):
+            ranks[position] = (index + end) / 2 + 1
+        ties = end - index + 1
+        tie_term += ties**3 - ties
+        index = end + 1
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, combined, strict=True) if group == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def _split(value: str) -> tuple[str, ...]:
+    return tuple(item.strip() for item in value.split(",") if item.strip())
+
+
+@contextmanager
+def _serve_site(site: SiteConfig) -> Iterator[str]:
+    process = subprocess.Popen(
+        [sys.executable, "-m", "mdcrawler.synthetic", *site_arguments(site)],
+        stdout=subprocess.PIPE,
+        text=True,
+        env=_subprocess_env(),
+    )
+    try:
+        assert process.stdout is not None
+        yield process.stdout.readline().strip()
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def _crawl_once(
+    start_url: str, threads: int, engine_args: list[str], include_images: bool
+) -> dict[str, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        metrics_path = Path(tmp) / "metrics.jsonl"
+        command = [
+            sys.executable,
+            "-m",
+            "mdcrawler",
+            "--start-url",
+            start_url,
+            "--output",
+            str(Path(tmp) / "output"),
+            "--threads",
+            str(threads),
+            "--metrics",
+            str(metrics_path),
+            "--include-images" if include_images else "--no-include-images",
+            *engine_args,
+        ]
+        # A file rather than a pipe: the child writes progress to stderr throughout the crawl
+        # and would block once a pipe nobody reads until it exits is full.
+        stderr_path = Path(tmp) / "stderr.txt"
+        start = time.perf_counter()
+        with stderr_path.open("wb") as stderr:
+            process = subprocess.Popen(
+                command, stdout=subprocess.DEVNULL, stderr=stderr, env=_subprocess_env()
+            )
+            cpu_seconds, peak_rss = _wait_with_usage(process)
+        wall = time.perf_counter() - start
+        if not metrics_path.exists():
+            errors = stderr_path.read_text(encoding="utf-8", errors="replace")
+            raise RuntimeError(f"Crawl benchmark run failed:\n{errors}")
+        lines = metrics_path.read_text(encoding="utf-8").splitlines()
+    summary = json.loads(lines[-1])
+    fetch = summary["histograms"].get("fetch.seconds", {})
+    return {
+        "elapsed": summary["elapsed"],
+        "pages": summary["counters"].get("pages", 0),
+        "latency_p50": fetch.get("p50", 0.0),
+        "latency_p99": fetch.get("p99", 0.0),
+        "cpu_utilization": cpu_seconds / wall if wall else 0.0,
+        "peak_rss_bytes": peak_rss,
+    }
+
+
+def _subprocess_env() -> dict[str, str]:
+    """Environment that lets child interpreters import this copy of mdcrawler."""
+    package_root = str(Path(__file__).resolve().parents[1])
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [package_root, env.get("PYTHONPATH")]))
+    return env
+
+
+def _wait_with_usage(process: subprocess.Popen[bytes]) -> tuple[float, int]:
+    """Wait for ``process`` and return its CPU seconds and peak RSS (0 where unsupported)."""
+    if not hasattr(os, "wait4"):
+        process.wait()
+        return 0.0, 0
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    peak = usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+    return usage.ru_utime + usage.ru_stime, int(peak)
+
+
+def _extract(html: str, include_images: bool) -> None:
+    extract_content(html, _BASE_URL, _PREFIX, include_images=include_images)
+
+
+def _time_extract(html: str, include_images: bool) -> float:
+    start = time.perf_counter()
+    _extract(html, include_images)
+    return time.perf_counter() - start
+
+
+def _profile_functions(html: str, include_images: bool) -> dict[str, float]:
+    profile = cProfile.Profile()
+    profile.runcall(_extract, html, include_images)
+    stats = pstats.Stats(profile)
+    functions: dict[str, float] = {}
+    for (filename, _, name), row in stats.stats.items():  # type: ignore[attr-defined]
+        if filename.endswith("content_extractor.py") and not name.startswith("<"):
+            functions[name] = functions.get(name, 0.0) + row[3]
+    return dict(sorted(functions.items(), key=lambda item: item[1], reverse=True))
+
+
+def _peak_memory(html: str, include_images: bool) -> int:
+    tracemalloc.start()
+    try:
+        _extract(html, include_images)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import Counter
+from collections.abc import Iterator
+
+
+class BoilerplateDetector:
+    """Learn Markdown blocks that repeat across a site's pages and strip them.
+
+    A block is a run of non-blank lines outside code fences. Once a block has been seen on at
+    least ``threshold`` of the pages observed (and on ``min_pages`` of them), it is treated as
+    boilerplate: banners, cookie notices, "edit this page" footers and the like. Headings and
+    fenced code are never stripped. The frequency table holds at most ``max_entries`` block
+    hashes; when it fills up, blocks seen only once are forgotten first.
+    """
+
+    def __init__(
+        self, threshold: float = 0.5, min_pages: int = 5, max_entries: int = 100_000
+    ) -> None:
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1]")
+        self.threshold = threshold
+        self.min_pages = max(2, min_pages)
+        self.max_entries = max_entries
+        self.pages = 0
+        self.stripped_blocks = 0
+        self._counts: Counter[int] = Counter()
+        self._lock = threading.Lock()
+
+    def process(self, markdown: str) -> str:
+        """Count this page's blocks, then return it without the blocks known as boilerplate."""
+        blocks = list(_iter_blocks(markdown))
+        keys = {_key(text) for text, strippable in blocks if strippable}
+        with self._lock:
+            self.pages += 1
+            self._counts.update(keys)
+            if len(self._counts) > self.max_entries:
+                self._prune()
+        return self._strip(markdown, blocks)
+
+    def clean(self, markdown: str) -> str:
+        """Remove boilerplate from a page without counting it (e.g. pages seen before learning)."""
+        return self._strip(markdown, list(_iter_blocks(markdown)))
+
+    def is_boilerplate(self, block: str) -> bool:
+        with self._lock:
+            return self._is_boilerplate(_key(block))
+
+    def _is_boilerplate(self, key: int) -> bool:
+        count = self._counts.get(key, 0)
+        return count >= self.min_pages and count >= self.threshold * self.pages
+
+    def _strip(self, markdown: str, blocks: list[tuple[str, bool]]) -> str:
+        with self._lock:
+            keep = [
+                text
+                for text, strippable in blocks
+                if not (strippable and self._is_boilerplate(_key(text)))
+            ]
+            self.stripped_blocks += len(blocks) - len(keep)
+        if len(keep) == len(blocks):
+            return markdown
+        return "\n\n".join(keep) + "\n" if keep else ""
+
+    def _prune(self) -> None:
+        floor = 1
+        while len(self._counts) > self.max_entries // 2:
+            for key in [key for key, count in self._counts.items() if count <= floor]:
+                del self._counts[key]
+            floor += 1
+
+
+def _key(block: str) -> int:
+    normalized = " ".join(block.split()).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(normalized, digest_size=8).digest(), "big")
+
+
+def _iter_blocks(markdown: str) -> Iterator[tuple[str, bool]]:
+    """Yield ``(block, strippable)`` for each blank-line separated block of ``markdown``."""
+    lines: list[str] = []
+    in_fence = False
+    fenced = False
+    for line in markdown.splitlines():
+        if line.lstrip().startswith("```"):
+            in_fence = not in_fence
+            fenced = True
+        if not in_fence and not line.strip():
+            if lines:
+                yield _block(lines, fenced)
+            lines, fenced = [], False
+            continue
+        lines.append(line)
+    if lines:
+        yield _block(lines, fenced)
+
+
+def _block(lines: list[str], fenced: bool) -> tuple[str, bool]:
+    text = "\n".join(lines)
+    return text, not fenced and not text.lstrip().startswith("#")
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+
+@dataclass
+class Chunk:
+    heading_path: list[str]
+    text: str
+    start: int
+    end: int
+
+
+def iter_chunks(markdown: str) -> Iterator[Chunk]:
+    """Split markdown into heading-delimited chunks in a single pass.
+
+    ``start``/``end`` are UTF-8 byte offsets into ``markdown``. Headings inside fenced
+    code blocks are ignored.
+    """
+    path: list[tuple[int, str]] = []
+    lines: list[str] = []
+    start = 0
+    offset = 0
+    in_fence = False
+    for line in markdown.splitlines(keepends=True):
+        stripped = line.rstrip("\r\n")
+        if stripped.startswith("```"):
+            in_fence = not in_fence
+        level = _heading_level(stripped) if not in_fence else 0
+        if level:
+            chunk = _make_chunk(path, lines, start, offset)
+            if chunk is not None:
+                yield chunk
+            while path and path[-1][0] >= level:
+                path.pop()
+            path.append((level, stripped[level:].strip()))
+            lines = []
+            start = offset
+        lines.append(line)
+        offset += len(line.encode("utf-8"))
+    chunk = _make_chunk(path, lines, start, offset)
+    if chunk is not None:
+        yield chunk
+
+
+def _heading_level(line: str) -> int:
+    if not line.startswith("#"):
+        return 0
+    level = len(line) - len(line.lstrip("#"))
+    if level > 6 or (len(line) > level and line[level] != " "):
+        return 0
+    return level
+
+
+def _make_chunk(
+    path: list[tuple[int, str]], lines: list[str], start: int, end: int
+) -> Chunk | None:
+    text = "".join(lines).strip()
+    if not text:
+        return None
+    return Chunk(heading_path=[title for _, title in path], text=text, start=start, end=end)
@@ -1,53 +1,390 @@
 from __future__ import annotations
 
 import argparse
+import importlib
+import sys
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from functools import partial
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from mdcrawler.combined_builder import build_combined
-from mdcrawler.content_extractor import DEFAULT_ATTR_BLACKLIST, DEFAULT_TAG_BLACKLIST
-from mdcrawler.crawler import Crawler, derive_prefix
-from mdcrawler.markdown_writer import write_index, write_pages
-from mdcrawler.title_normalizer import normalize_titles
+from mdcrawler.options import (
+    DEFAULT_ATTR_BLACKLIST,
+    DEFAULT_TAG_BLACKLIST,
+    MAX_RESPONSE_BYTES,
+    OUTPUT_FORMATS,
+    PROFILE_MODES,
+    REQUEST_DEADLINE,
+    SPILL_MODES,
+)
+
+# Everything below pulls in bs4, requests, sqlite3 or thread pools; it is imported where it is
+# used so that --help, argument errors and subcommand dispatch stay fast.
+if TYPE_CHECKING:
+    from mdcrawler.crawler import Progress
+    from mdcrawler.fetcher import Fetch
+    from mdcrawler.metrics import Metrics
+    from mdcrawler.profiling import StageProfiler
+    from mdcrawler.spool import BodySpool
+    from mdcrawler.tracing import TraceRecorder
 
 
 def main(argv: list[str] | None = None) -> int:
     """CLI entry point for mdcrawler command."""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in SUBCOMMANDS:
+        return _load_subcommand(argv[0])(argv[1:])
     parser = _build_parser()
     args = parser.parse_args(argv)
-    prefix = args.prefix or derive_prefix(args.start_url)
+    from mdcrawler.crawler import derive_prefix
+    from mdcrawler.replay import INDEX_FILENAME, recorded_start_url
 
-    tag_blacklist = (
-        [t.strip() for t in args.tag_blacklist.split(",") if t.strip()]
-        if args.tag_blacklist
-        else None
-    )
-    attr_blacklist = (
-        [a.strip() for a in args.attr_blacklist.split(",") if a.strip()]
-        if args.attr_blacklist
-        else None
-    )
+    if args.replay and not (Path(args.replay) / INDEX_FILENAME).is_file():
+        parser.error(f"--replay: {args.replay} has no {INDEX_FILENAME} (not a recording)")
+    start_url = args.start_url
+    if start_url is None and args.replay:
+        start_url = recorded_start_url(Path(args.replay))
+    if start_url is None:
+        parser.error("--start-url is required (unless --replay names a non-empty archive)")
+    prefix = args.prefix or derive_prefix(start_url)
+    tag_blacklist, attr_blacklist, formats = _parse_extraction_options(parser, args)
+    if not 0 <= args.dedup_distance < 64:
+        parser.error("--dedup-distance must be between 0 and 63")
+    for option, value in (
+        ("--request-deadline", args.request_deadline),
+        ("--crawl-deadline", args.crawl_deadline),
+        ("--max-per-host", args.max_per_host),
+    ):
+        if value is not None and value <= 0:
+            parser.error(f"{option} must be positive")
+    if not 0.0 < args.boilerplate_threshold <= 1.0:
+        parser.error("--boilerplate-threshold must be greater than 0 and at most 1")
 
     return run(
-        start_url=args.start_url,
+        start_url=start_url,
         prefix=prefix,
         output_dir=args.output,
         threads=args.threads,
         include_images=args.include_images,
         tag_blacklist=tag_blacklist,
         attr_blacklist=attr_blacklist,
+        combined_max_bytes=args.combined_max_bytes,
+        combined_max_tokens=args.combined_max_tokens,
+        formats=formats,
+        jsonl_gzip=args.jsonl_gzip,
+        pack_compress=args.pack_compress,
+        metrics_path=args.metrics,
+        metrics_interval=args.metrics_interval,
+        trace_path=args.trace,
+        profile=args.profile,
+        profile_dir=args.profile_dir,
+        profile_every=args.profile_every,
+        record_dir=args.record,
+        replay_dir=args.replay,
+        spill=args.spill,
+        dedup=args.dedup,
+        dedup_distance=args.dedup_distance,
+        follow_duplicates=args.follow_duplicates,
+        strip_boilerplate=args.strip_boilerplate,
+        boilerplate_threshold=args.boilerplate_threshold,
+        boilerplate_min_pages=args.boilerplate_min_pages,
+        early_links=args.early_links,
+        http2=args.http2,
+        max_response_bytes=args.max_response_bytes,
+        request_deadline=args.request_deadline,
+        crawl_deadline=args.crawl_deadline,
+        max_per_host=args.max_per_host,
+        quarantine=args.quarantine,
+        retries=args.retries,
+    )
+
+
+def search_main(argv: list[str]) -> int:
+    """Query a search index written by ``--format search``."""
+    import sqlite3
+
+    from mdcrawler.search_index import SEARCH_INDEX_FILENAME, search
+
+    parser = argparse.ArgumentParser(
+        prog="mdcrawler search", description="Search a crawl's full-text index."
+    )
+    parser.add_argument("query", help="Words to search for; a hit must contain all of them.")
+    parser.add_argument(
+        "--index",
+        default=str(Path("output") / SEARCH_INDEX_FILENAME),
+        help=f"Path to the index. Default: output/{SEARCH_INDEX_FILENAME}",
+    )
+    parser.add_argument("--limit", type=int, default=10, help="Maximum number of hits.")
+    parser.add_argument(
+        "--pages",
+        action="store_true",
+        help="Rank whole pages instead of heading-level sections.",
+    )
+    parser.add_argument(
+        "--raw",
+        action="store_true",
+        help="Pass the query to FTS5 unchanged, e.g. 'install AND (pip OR conda)' or 'conf*'.",
+    )
+    args = parser.parse_args(argv)
+    if not Path(args.index).exists():
+        parser.error(f"index not found: {args.index}")
+
+    try:
+        hits = search(
+            Path(args.index),
+            args.query,
+            limit=args.limit,
+            kind="page" if args.pages else "section",
+            raw=args.raw,
+        )
+    except sqlite3.OperationalError as exc:
+        parser.error(f"invalid query: {exc}")
+    for position, hit in enumerate(hits, start=1):
+        location = f"{hit.title} > {hit.heading_path}" if hit.heading_path else hit.title
+        print(f"{position}. {location} ({hit.url})")
+        print(f"   {' '.join(hit.snippet.split())}")
+    return 0 if hits else 1
+
+
+def extract_main(argv: list[str]) -> int:
+    """Convert a local HTML mirror (e.g. from ``wget --mirror``) without crawling."""
+    parser = argparse.ArgumentParser(
+        prog="mdcrawler extract", description="Extract a local HTML tree into Markdown."
+    )
+    parser.add_argument("--input", required=True, help="Directory holding the HTML mirror.")
+    parser.add_argument(
+        "--base-url",
+        required=True,
+        help="URL the input directory was mirrored from, e.g. https://docs.example.com/guide/",
+    )
+    parser.add_argument("--output", default="output", help="Output directory.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Extraction processes. Default: number of CPUs",
+    )
+    _add_extraction_arguments(parser)
+    _add_output_arguments(parser)
+    args = parser.parse_args(argv)
+    input_dir = Path(args.input)
+    if not input_dir.is_dir():
+        parser.error(f"input directory not found: {args.input}")
+    tag_blacklist, attr_blacklist, formats = _parse_extraction_options(parser, args)
+    from mdcrawler.mirror import MirrorFetcher, extract_mirror
+    from mdcrawler.outputs import write_outputs
+
+    pages = extract_mirror(
+        input_dir,
+        args.base_url,
+        workers=args.workers,
+        include_images=args.include_images,
+        tag_blacklist=tag_blacklist,
+        attr_blacklist=attr_blacklist,
+    )
+    if not pages:
+        return 1
+    output_path = Path(args.output)
+    output_path.mkdir(parents=True, exist_ok=True)
+    write_outputs(
+        pages,
+        output_path,
+        start_url=args.base_url,
+        formats=formats,
+        fetch=MirrorFetcher(input_dir, args.base_url).fetch,
+        combined_max_bytes=args.combined_max_bytes,
+        combined_max_tokens=args.combined_max_tokens,
+        jsonl_gzip=args.jsonl_gzip,
+        pack_compress=args.pack_compress,
     )
+    print(f"Extracted {len(pages)} pages into {output_path}")
+    return 0
+
+
+SUBCOMMANDS = {
+    "search": "mdcrawler.cli:search_main",
+    "bench": "mdcrawler.benchmark:bench_main",
+    "extract": "mdcrawler.cli:extract_main",
+    "batch": "mdcrawler.batch:batch_main",
+    "serve": "mdcrawler.server:serve_main",
+}
+
+
+_SUBCOMMAND_HELP = """subcommands (see 'mdcrawler <command> --help'):
+  search   query the search index of a crawl (--format search)
+  bench    benchmark extraction and crawling against a synthetic site
+  extract  convert a local HTML mirror into Markdown without crawling
+  batch    crawl several sites from a jobs.toml under one worker budget
+  serve    run an HTTP service that extracts Markdown on request
+"""
+
+
+def _load_subcommand(name: str) -> Callable[[list[str]], int]:
+    module_name, function_name = SUBCOMMANDS[name].split(":")
+    function: Callable[[list[str]], int] = getattr(
+        importlib.import_module(module_name), function_name
+    )
+    return function
 
 
 def _build_parser() -> argparse.ArgumentParser:
     """Build argument parser."""
-    parser = argparse.ArgumentParser(description="Crawl documentation pages into Markdown.")
-    parser.add_argument("--start-url", required=True, help="Starting URL for the crawl.")
+    parser = argparse.ArgumentParser(
+        description="Crawl documentation pages into Markdown.",
+        epilog=_SUBCOMMAND_HELP,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--start-url",
+        help="Starting URL for the crawl. Defaults to the recorded start URL with --replay.",
+    )
     parser.add_argument(
         "--prefix",
         help="URL prefix to limit crawling. Defaults to start URL without last segment.",
     )
     parser.add_argument("--output", default="output", help="Output directory.")
     parser.add_argument("--threads", type=int, default=4, help="Concurrent fetch threads.")
+    _add_extraction_arguments(parser)
+    _add_output_arguments(parser)
+    parser.add_argument(
+        "--metrics",
+        help="Write JSON-lines metrics snapshots and a final summary to FILE ('-' for stderr).",
+    )
+    parser.add_argument(
+        "--metrics-interval",
+        type=float,
+        default=5.0,
+        help="Seconds between metrics snapshots. Default: 5",
+    )
+    parser.add_argument(
+        "--trace",
+        help="Record per-URL crawl spans to FILE as Chrome trace-event JSON (Perfetto).",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=PROFILE_MODES,
+        help="Profile crawl stages: cpu (cProfile per stage) or mem (tracemalloc snapshots).",
+    )
+    parser.add_argument(
+        "--profile-dir",
+        help="Directory for profile output. Default: <output>/profile",
+    )
+    parser.add_argument(
+        "--profile-every",
+        type=int,
+        default=100,
+        help="Take a memory snapshot every N pages with --profile mem. Default: 100",
+    )
+    network = parser.add_mutually_exclusive_group()
+    network.add_argument(
+        "--record",
+        metavar="DIR",
+        help="Append every fetched response (headers and compressed body) to an archive in DIR.",
+    )
+    network.add_argument(
+        "--replay",
+        metavar="DIR",
+        help="Serve all fetches from an archive written by --record instead of the network.",
+    )
+    parser.add_argument(
+        "--spill",
+        choices=SPILL_MODES,
+        help="Keep page bodies compressed in memory or in a temporary file until writing.",
+    )
+    parser.add_argument(
+        "--dedup",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="Detect exact and near-duplicate pages (SimHash); list them only in index.md.",
+    )
+    parser.add_argument(
+        "--dedup-distance",
+        type=int,
+        default=3,
+        help="Maximum differing SimHash bits (of 64) for two pages to count as duplicates. "
+        "Default: 3",
+    )
+    parser.add_argument(
+        "--follow-duplicates",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Follow links found on duplicate pages (--no-follow-duplicates also skips "
+        "extracting byte-identical pages).",
+    )
+    parser.add_argument(
+        "--strip-boilerplate",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="Learn text blocks repeated across pages (banners, footers) and strip them.",
+    )
+    parser.add_argument(
+        "--boilerplate-threshold",
+        type=float,
+        default=0.5,
+        help="Fraction of crawled pages a block must appear on to count as boilerplate. "
+        "Default: 0.5",
+    )
+    parser.add_argument(
+        "--boilerplate-min-pages",
+        type=int,
+        default=5,
+        help="Minimum number of pages a block must appear on to count as boilerplate. Default: 5",
+    )
+    parser.add_argument(
+        "--early-links",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="Scan raw HTML for links and queue them before extraction finishes. Also follows "
+        "links in blacklisted elements such as navigation, so more pages may be crawled.",
+    )
+    parser.add_argument(
+        "--http2",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="Fetch over HTTP/2, multiplexing requests per host over shared connections "
+        "(needs mdcrawler[http2]; falls back to HTTP/1.1).",
+    )
+    parser.add_argument(
+        "--max-response-bytes",
+        type=int,
+        default=MAX_RESPONSE_BYTES,
+        help="Abort responses whose body decodes to more than this many bytes. "
+        f"Default: {MAX_RESPONSE_BYTES}",
+    )
+    parser.add_argument(
+        "--request-deadline",
+        type=float,
+        default=REQUEST_DEADLINE,
+        help="Seconds a response may take in total, however slowly bytes trickle in. "
+        f"Default: {REQUEST_DEADLINE:g}",
+    )
+    parser.add_argument(
+        "--crawl-deadline",
+        type=float,
+        help="Stop queueing new URLs after this many seconds and finish the requests in flight.",
+    )
+    parser.add_argument(
+        "--max-per-host",
+        type=int,
+        help="Maximum concurrent requests per host. Default: --threads",
+    )
+    parser.add_argument(
+        "--quarantine",
+        type=float,
+        default=30.0,
+        help="Seconds a host whose latency spikes (or times out) is limited to one request "
+        "at a time when other hosts are being crawled; 0 disables. Default: 30",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=2,
+        help="Times a URL that timed out is queued again. Default: 2",
+    )
+    return parser
+
+
+def _add_extraction_arguments(parser: argparse.ArgumentParser) -> None:
     parser.add_argument(
         "--include-images",
         action=argparse.BooleanOptionalAction,
@@ -70,7 +407,69 @@ def _build_parser() -> argparse.ArgumentParser:
             f"Default: {','.join(DEFAULT_ATTR_BLACKLIST)}"
         ),
     )
-    return parser
+
+
+def _add_output_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--combined-max-bytes",
+        type=int,
+        help="Split combined output into combined-NNNN.md shards of at most this many bytes.",
+    )
+    parser.add_argument(
+        "--combined-max-tokens",
+        type=int,
+        help="Split combined output into shards of at most this many (approximate) tokens.",
+    )
+    parser.add_argument(
+        "--format",
+        default="markdown",
+        help=f"Comma-separated output formats: {','.join(OUTPUT_FORMATS)}. Default: markdown",
+    )
+    parser.add_argument(
+        "--jsonl-gzip",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="Gzip-compress the JSONL chunk export (chunks.jsonl.gz).",
+    )
+    parser.add_argument(
+        "--pack-compress",
+        action=argparse.BooleanOptionalAction,
+        default=False,
+        help="Compress each record of the packed archive (pages.pack) with zlib.",
+    )
+
+
+def _parse_extraction_options(
+    parser: argparse.ArgumentParser, args: argparse.Namespace
+) -> tuple[list[str] | None, list[str] | None, list[str]]:
+    """Split the blacklist and format options; reject unknown formats and bad shard limits."""
+    tag_blacklist, attr_blacklist = _parse_blacklists(args)
+    for option, value in (
+        ("--combined-max-bytes", args.combined_max_bytes),
+        ("--combined-max-tokens", args.combined_max_tokens),
+    ):
+        if value is not None and value <= 0:
+            parser.error(f"{option} must be positive")
+    formats = [f.strip().lower() for f in args.format.split(",") if f.strip()]
+    unknown = sorted(set(formats) - set(OUTPUT_FORMATS))
+    if unknown:
+        parser.error(f"unknown output format(s): {', '.join(unknown)}")
+    return tag_blacklist, attr_blacklist, formats
+
+
+def _parse_blacklists(args: argparse.Namespace) -> tuple[list[str] | None, list[str] | None]:
+    """Split the options added by :func:`_add_extraction_arguments` (None: use the defaults)."""
+    tag_blacklist = (
+        [t.strip() for t in args.tag_blacklist.split(",") if t.strip()]
+        if args.tag_blacklist
+        else None
+    )
+    attr_blacklist = (
+        [a.strip() for a in args.attr_blacklist.split(",") if a.strip()]
+        if args.attr_blacklist
+        else None
+    )
+    return tag_blacklist, attr_blacklist
 
 
 def run(
@@ -81,27 +480,214 @@ def run(
     include_images: bool,
     tag_blacklist: list[str] | None,
     attr_blacklist: list[str] | None,
+    combined_max_bytes: int | None = None,
+    combined_max_tokens: int | None = None,
+    formats: list[str] | None = None,
+    jsonl_gzip: bool = False,
+    pack_compress: bool = False,
+    metrics_path: str | None = None,
+    metrics_interval: float = 5.0,
+    trace_path: str | None = None,
+    profile: str | None = None,
+    profile_dir: str | None = None,
+    profile_every: int = 100,
+    record_dir: str | None = None,
+    replay_dir: str | None = None,
+    spill: str | None = None,
+    dedup: bool = False,
+    dedup_distance: int = 3,
+    follow_duplicates: bool = True,
+    strip_boilerplate: bool = False,
+    boilerplate_threshold: float = 0.5,
+    boilerplate_min_pages: int = 5,
+    early_links: bool = False,
+    http2: bool = False,
+    max_response_bytes: int = MAX_RESPONSE_BYTES,
+    request_deadline: float | None = REQUEST_DEADLINE,
+    crawl_deadline: float | None = None,
+    max_per_host: int | None = None,
+    quarantine: float = 30.0,
+    retries: int = 2,
 ) -> int:
+    from mdcrawler.boilerplate import BoilerplateDetector
+    from mdcrawler.crawler import Crawler
+    from mdcrawler.dedup import DuplicateIndex
+    from mdcrawler.hosts import HostLimiter
+    from mdcrawler.outputs import write_outputs
+    from mdcrawler.profiling import StageProfiler
+    from mdcrawler.title_normalizer import TitleNormalizer
+    from mdcrawler.tracing import TraceRecorder
+
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
+    formats = formats or ["markdown"]
+    tracer = TraceRecorder(enabled=trace_path is not None)
+    profiler = StageProfiler(
+        profile,
+        Path(profile_dir) if profile_dir else output_path / "profile",
+        snapshot_every=profile_every,
+    )
+    boilerplate = (
+        BoilerplateDetector(boilerplate_threshold, boilerplate_min_pages)
+        if strip_boilerplate
+        else None
+    )
+    titles = TitleNormalizer(prefix)
 
-    crawler = Crawler(
-        start_url=start_url,
-        prefix=prefix,
-        threads=threads,
-        include_images=include_images,
-        tag_blacklist=tag_blacklist,
-        attr_blacklist=attr_blacklist,
+    with (
+        _open_metrics(metrics_path, metrics_interval) as metrics,
+        _write_trace(tracer, trace_path),
+        _close_profiler(profiler),
+        _open_fetch(
+            record_dir,
+            replay_dir,
+            metrics,
+            http2,
+            threads,
+            max_response_bytes,
+            request_deadline,
+        ) as fetch,
+        _open_spool(spill) as spool,
+    ):
+        crawler = Crawler(
+            start_url=start_url,
+            prefix=prefix,
+            threads=threads,
+            include_images=include_images,
+            tag_blacklist=tag_blacklist,
+            attr_blacklist=attr_blacklist,
+            metrics=metrics,
+            tracer=tracer,
+            profiler=profiler,
+            fetch=fetch,
+            spool=spool,
+            dedup=DuplicateIndex(dedup_distance) if dedup else None,
+            follow_duplicates=follow_duplicates,
+            boilerplate=boilerplate,
+            titles=titles,
+            early_links=early_links,
+            hosts=HostLimiter(max_per_host, quarantine=quarantine),
+            retries=retries,
+            deadline=crawl_deadline,
+            # JSON snapshots on stderr would interleave with the human-readable line.
+            on_progress=None if metrics_path == "-" else _print_progress,
+        )
+        # Writers consume the crawl as it streams, overlapping per-page output with fetching.
+        written = write_outputs(
+            crawler.iter_pages(),
+            output_path,
+            start_url=start_url,
+            formats=formats,
+            fetch=fetch,
+            combined_max_bytes=combined_max_bytes,
+            combined_max_tokens=combined_max_tokens,
+            jsonl_gzip=jsonl_gzip,
+            pack_compress=pack_compress,
+            metrics=metrics,
+            tracer=tracer,
+            profiler=profiler,
+            boilerplate=boilerplate,
+            titles=titles,
+            duplicates=crawler.duplicates,
+            unfinished=crawler.unfinished,
+        )
+    return 0 if written else 1
+
+
+@contextmanager
+def _open_fetch(
+    record_dir: str | None,
+    replay_dir: str | None,
+    metrics: Metrics,
+    http2: bool = False,
+    threads: int = 4,
+    max_bytes: int = MAX_RESPONSE_BYTES,
+    deadline: float | None = REQUEST_DEADLINE,
+) -> Iterator[Fetch]:
+    """Yield the fetch function for the crawl: live, recording, or replaying an archive.
+
+    Live fetches count their wire and decoded bytes per host into ``metrics``.
+    """
+    from mdcrawler.fetcher import count_transfers, fetch_url, open_backend
+    from mdcrawler.replay import ReplayFetcher, ResponseRecorder
+
+    if replay_dir is not None:
+        with ReplayFetcher(Path(replay_dir)) as replay:
+            yield replay.fetch
+        return
+    backend = (
+        open_backend(http2=True, pool_size=threads, max_bytes=max_bytes, deadline=deadline)
+        if http2
+        else None
     )
-    pages = crawler.run()
-    if not pages:
-        return 1
+    if backend is not None and backend.name != "http/2":
+        print("HTTP/2 needs 'pip install mdcrawler[http2]'; using HTTP/1.1", file=sys.stderr)
+    if backend is not None:
+        live = count_transfers(backend.fetch, metrics)
+    else:
+        live = count_transfers(partial(fetch_url, max_bytes=max_bytes, deadline=deadline), metrics)
+    try:
+        if record_dir is not None:
+            with ResponseRecorder(Path(record_dir)) as recorder:
+                yield recorder.wrap(live)
+        else:
+            yield live
+    finally:
+        if backend is not None:
+            backend.close()
 
-    normalized_titles = normalize_titles([page.title for page in pages])
-    for page, normalized in zip(pages, normalized_titles, strict=True):
-        page.title = normalized
 
-    write_pages(pages, output_path)
-    write_index(pages, output_path, start_url=start_url)
-    build_combined(pages, output_path)
-    return 0
+@contextmanager
+def _open_spool(spill: str | None) -> Iterator[BodySpool | None]:
+    if spill is None:
+        yield None
+        return
+    from mdcrawler.spool import BodySpool
+
+    with BodySpool(spill) as spool:
+        yield spool
+
+
+def _print_progress(progress: Progress) -> None:
+    print(
+        f"Crawled {progress.processed}/{progress.discovered} pages | "
+        f"Elapsed {progress.elapsed:.1f}s | ETA {progress.eta:.1f}s",
+        file=sys.stderr,
+        flush=True,
+    )
+
+
+@contextmanager
+def _close_profiler(profiler: StageProfiler) -> Iterator[None]:
+    try:
+        yield
+    finally:
+        profiler.close()
+
+
+@contextmanager
+def _write_trace(tracer: TraceRecorder, trace_path: str | None) -> Iterator[None]:
+    try:
+        yield
+    finally:
+        if trace_path is not None:
+            tracer.write(Path(trace_path))
+
+
+@contextmanager
+def _open_metrics(metrics_path: str | None, interval: float) -> Iterator[Metrics]:
+    """Yield the crawl's metrics; with a sink, print the summary and close it afterwards."""
+    from mdcrawler.metrics import Metrics
+
+    if metrics_path is None:
+        yield Metrics()
+        return
+    sink = sys.stderr if metrics_path == "-" else open(metrics_path, "w", encoding="utf-8")
+    metrics = Metrics(sink=sink, interval=interval)
+    try:
+        yield metrics
+    finally:
+        metrics.close()
+        if sink is not sys.stderr:
+            sink.close()
+        print(metrics.summary(), file=sys.stderr)
@@ -1,29 +1,162 @@
 from __future__ import annotations
 
+import json
 from collections.abc import Iterable
 from pathlib import Path
+from typing import Any
 
+from mdcrawler.chunking import iter_chunks
 from mdcrawler.crawler import Page
-from mdcrawler.markdown_writer import render_markdown
+from mdcrawler.markdown_writer import render_markdown, write_if_changed
+from mdcrawler.tokens import TokenCounter, estimate_tokens
 
+COMBINED_HEADER = "# Combined Documentation"
+COMBINED_FILENAME = "combined.md"
+SHARD_MANIFEST = "combined-manifest.json"
+SHARD_PATTERN = "combined-[0-9][0-9][0-9][0-9].md"
 
-def build_combined(pages: Iterable[Page], output_dir: Path) -> None:
-    combined_lines: list[str] = ["# Combined Documentation", ""]
+
+def build_combined(
+    pages: Iterable[Page],
+    output_dir: Path,
+    max_bytes: int | None = None,
+    max_tokens: int | None = None,
+    token_counter: TokenCounter = estimate_tokens,
+) -> None:
+    """Write combined.md, or combined-NNNN.md shards when a limit is set.
+
+    Output of the other layout left by an earlier run is removed, so it cannot look current.
+    """
+    if max_bytes is None and max_tokens is None:
+        _build_single(pages, output_dir)
+        (output_dir / SHARD_MANIFEST).unlink(missing_ok=True)
+        for path in output_dir.glob(SHARD_PATTERN):
+            path.unlink()
+        return
+    with _ShardWriter(output_dir, max_bytes, max_tokens, token_counter) as writer:
+        for page in pages:
+            for piece in _page_pieces(page, writer):
+                writer.add(page, piece)
+
+
+def _build_single(pages: Iterable[Page], output_dir: Path) -> None:
+    combined_lines: list[str] = [COMBINED_HEADER, ""]
     for page in pages:
         combined_lines.append(f"## {page.title}")
         combined_lines.append("")
         markdown = render_markdown(page, image_prefix="images/")
         combined_lines.extend(_shift_headings(markdown, shift=1).splitlines())
         combined_lines.append("")
-    (output_dir / "combined.md").write_text(
-        "\n".join(combined_lines).rstrip() + "\n", encoding="utf-8"
-    )
+    write_if_changed(output_dir / COMBINED_FILENAME, "\n".join(combined_lines).rstrip() + "\n")
+
+
+def _page_pieces(page: Page, writer: _ShardWriter) -> list[str]:
+    """Render a page and split it at heading boundaries if it cannot fit in one shard."""
+    markdown = _shift_headings(render_markdown(page, image_prefix="images/"), shift=1)
+    block = f"## {page.title}\n\n{markdown.strip()}\n\n"
+    if writer.fits_empty(block):
+        return [block]
+    pieces: list[str] = []
+    current = f"## {page.title}\n\n"
+    has_content = False
+    # iter_chunks ignores headings inside code fences, so a piece never splits a fence.
+    for chunk in iter_chunks(markdown.strip()):
+        text = chunk.text + "\n\n"
+        if has_content and not writer.fits_empty(current + text):
+            pieces.append(current)
+            current = ""
+        current += text
+        has_content = True
+    pieces.append(current)
+    return pieces
+
+
+class _ShardWriter:
+    """Stream page blocks into numbered combined-NNNN.md files under the configured limits."""
+
+    def __init__(
+        self,
+        output_dir: Path,
+        max_bytes: int | None,
+        max_tokens: int | None,
+        token_counter: TokenCounter,
+    ) -> None:
+        self.output_dir = output_dir
+        self.max_bytes = max_bytes
+        self.max_tokens = max_tokens
+        self.token_counter = token_counter
+        self.header = f"{COMBINED_HEADER}\n\n"
+        self.header_bytes = len(self.header.encode("utf-8"))
+        self.header_tokens = token_counter(self.header)
+        self.shards: list[dict[str, Any]] = []
+        self._parts: list[str] | None = None
+        self._bytes = 0
+        self._tokens = 0
+
+    def __enter__(self) -> _ShardWriter:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._close_shard()
+        # Shards left over from a previous, larger run would otherwise look current.
+        current = {shard["file"] for shard in self.shards}
+        for path in self.output_dir.glob(SHARD_PATTERN):
+            if path.name not in current:
+                path.unlink()
+        (self.output_dir / COMBINED_FILENAME).unlink(missing_ok=True)
+        write_if_changed(
+            self.output_dir / SHARD_MANIFEST, json.dumps({"shards": self.shards}, indent=2) + "\n"
+        )
+
+    def fits_empty(self, text: str) -> bool:
+        return self._fits(text, self.header_bytes, self.header_tokens)
+
+    def add(self, page: Page, text: str) -> None:
+        if self._parts is not None and not self._fits(text, self._bytes, self._tokens):
+            self._close_shard()
+        if self._parts is None:
+            self._open_shard()
+        assert self._parts is not None
+        size = len(text.encode("utf-8"))
+        tokens = self.token_counter(text)
+        self._parts.append(text)
+        self._bytes += size
+        self._tokens += tokens
+        self.shards[-1]["pages"].append(
+            {"url": page.url, "title": page.title, "bytes": size, "tokens": tokens}
+        )
+
+    def _fits(self, text: str, used_bytes: int, used_tokens: int) -> bool:
+        if self.max_bytes is not None and used_bytes + len(text.encode("utf-8")) > self.max_bytes:
+            return False
+        if self.max_tokens is not None and used_tokens + self.token_counter(text) > self.max_tokens:
+            return False
+        return True
+
+    def _open_shard(self) -> None:
+        filename = f"combined-{len(self.shards) + 1:04d}.md"
+        self._parts = [self.header]
+        self._bytes = self.header_bytes
+        self._tokens = self.header_tokens
+        self.shards.append({"file": filename, "bytes": 0, "tokens": 0, "pages": []})
+
+    def _close_shard(self) -> None:
+        if self._parts is None:
+            return
+        # Unchanged shards keep their mtime, like page files.
+        write_if_changed(self.output_dir / self.shards[-1]["file"], "".join(self._parts))
+        self._parts = None
+        self.shards[-1]["bytes"] = self._bytes
+        self.shards[-1]["tokens"] = self._tokens
 
 
 def _shift_headings(markdown: str, shift: int) -> str:
     shifted_lines: list[str] = []
+    in_fence = False
     for line in markdown.splitlines():
-        if line.startswith("#"):
+        if line.startswith("```"):
+            in_fence = not in_fence
+        if line.startswith("#") and not in_fence:
             hashes = len(line) - len(line.lstrip("#"))
             new_hashes = min(6, hashes + shift)
             content = line.lstrip("#").lstrip()
@@ -1,46 +1,30 @@
 from __future__ import annotations
 
 import re
+from collections.abc import Callable
+from contextlib import AbstractContextManager, nullcontext
 from dataclasses import dataclass
+from html import unescape
 from urllib.parse import urljoin, urlsplit, urlunsplit
 
 from bs4 import BeautifulSoup
 from bs4.element import Tag
 
+from mdcrawler.options import DEFAULT_ATTR_BLACKLIST, DEFAULT_TAG_BLACKLIST
+
 # Pre-compiled regex patterns
 _ID_SPLIT_PATTERN = re.compile(r"[^a-zA-Z0-9]+")
 _URL_PATTERN = re.compile(r"url\((?P<quote>['\"]?)(?P<url>[^)'\"]+)(?P=quote)\)")
+_HREF_VALUE = r"""(?<![\w-])href\s*=\s*(?:"(?P<dq>[^"]*)"|'(?P<sq>[^']*)'|(?P<bare>[^\s>]+))"""
+_LINK_PATTERN = re.compile(r"<a\b[^>]*?" + _HREF_VALUE, re.IGNORECASE)
+_BASE_PATTERN = re.compile(r"<base\b[^>]*?" + _HREF_VALUE, re.IGNORECASE)
+# Markup in these never reaches the extractor as links (unterminated ones run to the end).
+_UNSCANNED_PATTERN = re.compile(
+    r"<!--.*?(?:-->|\Z)|<(script|style)\b.*?(?:</\1\s*>|\Z)", re.IGNORECASE | re.DOTALL
+)
 
 
-# Default blacklists
-DEFAULT_TAG_BLACKLIST = [
-    "nav",
-    "aside",
-    "footer",
-    "form",
-    "button",
-    "input",
-    "textarea",
-    "select",
-    "noscript",
-    "script",
-    "style",
-    "svg",
-    "iframe",
-]
-
-DEFAULT_ATTR_BLACKLIST = [
-    "navigation",
-    "sidebar",
-    "contents",
-    "toolbar",
-    "pagination",
-    "footer",
-    "absolute",
-]
-
-
-@dataclass
+@dataclass(slots=True)
 class ExtractedContent:
     title: str
     markdown: str
@@ -48,7 +32,7 @@ class ExtractedContent:
     images: list[ImageReference]
 
 
-@dataclass
+@dataclass(slots=True)
 class ImageReference:
     token: str
     url: str
@@ -63,48 +47,63 @@ def extract_content(
     include_images: bool = False,
     tag_blacklist: list[str] | None = None,
     attr_blacklist: list[str] | None = None,
+    stage: Callable[[str], AbstractContextManager[object]] | None = None,
 ) -> ExtractedContent:
-    soup = BeautifulSoup(html, "html.parser")
-    images: list[ImageReference] = []
-
-    # Use defaults if not provided
-    tag_bl = {
-        t.lower() for t in (tag_blacklist if tag_blacklist is not None else DEFAULT_TAG_BLACKLIST)
-    }
-    attr_bl = [
-        item.lower()
-        for item in (attr_blacklist if attr_blacklist is not None else DEFAULT_ATTR_BLACKLIST)
-    ]
-
-    if include_images:
-        images = _extract_images(soup, base_url)
-    _promote_data_as_tags(soup)
-    _strip_blacklisted(soup, tag_bl, attr_bl)
-    _strip_layout(soup, include_images=include_images)
-    _replace_tables(soup)
-    _replace_inline_formatting(soup)
-    code_blocks = _replace_code_blocks(soup)
-
-    discovered_urls: list[str] = []
-    for link in soup.find_all("a", href=True):
-        href = link.get("href", "")
-        absolute = urljoin(base_url, href)
-        normalized = _normalize_url(absolute)
-        text = link.get_text(strip=True) or normalized
-        if not normalized:
-            link.replace_with(text)
-            continue
-        if normalized.startswith(prefix):
-            discovered_urls.append(normalized)
-            link.replace_with(text)
-        else:
-            link.replace_with(f"[{text}]({normalized})")
+    """Convert ``html`` to Markdown plus the in-prefix links and images it references.
+
+    ``stage``, if given, is entered around each step by name (e.g. to time it): ``"parse"``
+    (BeautifulSoup), ``"extract"`` (cleanup, links, title) and ``"markdown"`` (rendering).
+    """
+    stage = stage or _no_stage
+    with stage("parse"):
+        soup = BeautifulSoup(html, "html.parser")
+    with stage("extract"):
+        images: list[ImageReference] = []
+        base_tag = soup.find("base", href=True)
+        link_base = (
+            urljoin(base_url, str(base_tag["href"])) if isinstance(base_tag, Tag) else base_url
+        )
+
+        # Use defaults if not provided
+        tag_bl = {
+            t.lower()
+            for t in (tag_blacklist if tag_blacklist is not None else DEFAULT_TAG_BLACKLIST)
+        }
+        attr_bl = [
+            item.lower()
+            for item in (attr_blacklist if attr_blacklist is not None else DEFAULT_ATTR_BLACKLIST)
+        ]
+
+        if include_images:
+            images = _extract_images(soup, link_base)
+        _promote_data_as_tags(soup)
+        _strip_blacklisted(soup, tag_bl, attr_bl)
+        _strip_layout(soup, include_images=include_images)
+        _replace_tables(soup)
+        _replace_inline_formatting(soup)
+        code_blocks = _replace_code_blocks(soup)
+
+        discovered_urls: list[str] = []
+        for link in soup.find_all("a", href=True):
+            href = link.get("href", "")
+            absolute = urljoin(link_base, href)
+            normalized = _normalize_url(absolute)
+            text = link.get_text(strip=True) or normalized
+            if not normalized:
+                link.replace_with(text)
+                continue
+            if normalized.startswith(prefix):
+                discovered_urls.append(normalized)
+                link.replace_with(text)
+            else:
+                link.replace_with(f"[{text}]({normalized})")
 
-    title_tag = soup.find("title")
-    title = title_tag.get_text(strip=True) if title_tag else base_url
+        title_tag = soup.find("title")
+        title = title_tag.get_text(strip=True) if title_tag else base_url
 
-    content_roots = _content_roots(soup)
-    markdown = _html_to_markdown(soup, content_roots, code_blocks)
+        content_roots = _content_roots(soup)
+    with stage("markdown"):
+        markdown = _html_to_markdown(soup, content_roots, code_blocks)
     return ExtractedContent(
         title=title,
         markdown=markdown,
@@ -113,6 +112,33 @@ def extract_content(
     )
 
 
+def _no_stage(name: str) -> AbstractContextManager[object]:
+    return nullcontext()
+
+
+def scan_links(html: str, base_url: str, prefix: str) -> list[str]:
+    """Find in-prefix ``<a href>`` targets in raw HTML without parsing it.
+
+    Meant to run before :func:`extract_content` so the crawl frontier grows early. Unlike the
+    extractor it also sees links inside blacklisted elements (navigation, footers), so the
+    crawled set can differ; links in comments, ``<script>`` and ``<style>`` are skipped.
+    """
+    html = _UNSCANNED_PATTERN.sub(" ", html)
+    base = _BASE_PATTERN.search(html)
+    if base:
+        base_url = urljoin(base_url, unescape(_href(base)))
+    discovered: dict[str, None] = {}
+    for match in _LINK_PATTERN.finditer(html):
+        normalized = _normalize_url(urljoin(base_url, unescape(_href(match))))
+        if normalized and normalized.startswith(prefix):
+            discovered[normalized] = None
+    return list(discovered)
+
+
+def _href(match: re.Match[str]) -> str:
+    return next(value for value in match.group("dq", "sq", "bare") if value is not None).strip()
+
+
 def _strip_blacklisted(
     soup: BeautifulSoup, tag_blacklist: set[str], attr_blacklist: list[str]
 ) -> None:
@@ -1,21 +1,50 @@
 from __future__ import annotations
 
+import asyncio
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import Counter, deque
+from collections.abc import AsyncIterator, Callable, Generator, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, InvalidStateError, ThreadPoolExecutor, wait
+from contextlib import contextmanager, suppress
 from dataclasses import dataclass
+from functools import partial
+from typing import TYPE_CHECKING, Any
 from urllib.parse import urlsplit, urlunsplit
 
-from mdcrawler.content_extractor import ImageReference, extract_content
-from mdcrawler.fetcher import fetch_url
+import requests
 
+from mdcrawler.content_extractor import ImageReference, extract_content, scan_links
+from mdcrawler.dedup import DuplicateIndex, Fingerprint, fingerprint
+from mdcrawler.fetcher import Fetch, fetch_url
+from mdcrawler.hosts import HostLimiter
+from mdcrawler.metrics import Metrics
+from mdcrawler.profiling import StageProfiler
+from mdcrawler.tracing import TraceRecorder
 
-@dataclass
+if TYPE_CHECKING:
+    from mdcrawler.boilerplate import BoilerplateDetector
+    from mdcrawler.spool import BodySpool
+    from mdcrawler.title_normalizer import TitleNormalizer
+
+
+@dataclass(slots=True)
 class Page:
     url: str
     title: str
     markdown: str
     images: list[ImageReference]
+    fetched_at: float = 0.0
+    duplicate_of: str | None = None
+    fingerprint: Fingerprint | None = None
+
+
+@dataclass(slots=True)
+class Progress:
+    processed: int
+    discovered: int
+    elapsed: float
+    eta: float
 
 
 def derive_prefix(start_url: str) -> str:
@@ -37,6 +66,20 @@ class Crawler:
         include_images: bool = False,
         tag_blacklist: list[str] | None = None,
         attr_blacklist: list[str] | None = None,
+        metrics: Metrics | None = None,
+        tracer: TraceRecorder | None = None,
+        profiler: StageProfiler | None = None,
+        fetch: Fetch | None = None,
+        spool: BodySpool | None = None,
+        dedup: DuplicateIndex | None = None,
+        follow_duplicates: bool = True,
+        boilerplate: BoilerplateDetector | None = None,
+        titles: TitleNormalizer | None = None,
+        early_links: bool = False,
+        hosts: HostLimiter | None = None,
+        retries: int = 2,
+        deadline: float | None = None,
+        on_progress: Callable[[Progress], None] | None = None,
     ) -> None:
         self.start_url = start_url
         self.prefix = prefix
@@ -44,74 +87,319 @@ class Crawler:
         self.include_images = include_images
         self.tag_blacklist = tag_blacklist
         self.attr_blacklist = attr_blacklist
+        self.metrics = metrics or Metrics()
+        self.tracer = tracer or TraceRecorder(enabled=False)
+        self.profiler = profiler or StageProfiler()
+        self.fetch = fetch
+        self.spool = spool
+        self.dedup = dedup
+        self.follow_duplicates = follow_duplicates
+        self.boilerplate = boilerplate
+        self.titles = titles
+        self.early_links = early_links
+        self.hosts = hosts or HostLimiter()
+        self.retries = retries
+        self.deadline = deadline
+        self.on_progress = on_progress
         self.visited: set[str] = set()
+        # Pages found to duplicate an earlier one; they are not yielded by iter_pages().
+        self.duplicates: list[Page] = []
+        self.unfinished: list[str] = []
+        self._attempts: Counter[str] = Counter()
         self.lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self._fetches: dict[str, tuple[float, bool]] = {}
 
     def run(self) -> list[Page]:
+        return list(self.iter_pages())
+
+    def iter_pages(self, buffer: int | None = None) -> Generator[Page, None, None]:
+        """Yield pages as they are crawled instead of collecting the whole site first.
+
+        At most ``buffer`` URLs (default: twice ``threads``) are in flight or finished but not
+        yet consumed, so a slow consumer throttles the crawl and memory stays bounded. Closing
+        the generator (e.g. ``break``) or calling :meth:`cancel` stops the crawl; queued URLs
+        are dropped and the generator returns once in-flight fetches have finished.
+
+        With ``early_links``, workers scan the raw HTML for in-prefix links right after the
+        fetch and those URLs join the frontier while the page is still being extracted.
+
+        URLs are handed out round-robin across hosts within the caps of ``hosts``; a URL whose
+        fetch timed out (e.g. hit its response deadline) is queued again up to ``retries``
+        times. Once ``deadline`` seconds have passed, queued URLs are dropped and only the
+        requests in flight are finished.
+
+        With ``dedup``, duplicate pages are collected in :attr:`duplicates` instead of being
+        yielded. URLs that failed or were dropped (deadline, cancellation) are collected in
+        :attr:`unfinished`; pages only linked from them were never discovered.
+
+        Metrics snapshots are emitted on the metrics interval while the crawl runs, and
+        ``on_progress`` (if set) receives a :class:`Progress` at most twice a second.
+        """
+        limit = max(1, buffer if buffer is not None else self.threads * 2)
+        self._attempts.clear()
         with self.lock:
             self.visited.add(self.start_url)
-        pages: list[Page] = []
+        pending: dict[str, deque[str]] = {}
+        futures: dict[Future[tuple[Page, list[str]] | None], str] = {}
         start_time = time.monotonic()
         processed = 0
-        last_log = start_time
-
-        with ThreadPoolExecutor(max_workers=self.threads) as executor:
-            futures = {executor.submit(self._crawl_url, self.start_url): self.start_url}
-            while futures:
-                for future in as_completed(list(futures)):
-                    futures.pop(future, None)
-                    result = future.result()
+        last_report = start_time
+        scanned: deque[str] = deque()
+        wakeup: Future[None] = Future()
+
+        def queue(url: str) -> None:
+            pending.setdefault(urlsplit(url).netloc, deque()).append(url)
+
+        def on_links(urls: list[str]) -> None:
+            scanned.extend(urls)
+            with suppress(InvalidStateError):
+                wakeup.set_result(None)
+
+        queue(self.start_url)
+        executor = ThreadPoolExecutor(max_workers=self.threads)
+        try:
+            while (pending or futures) and not self._cancelled.is_set():
+                if self.deadline is not None and time.monotonic() - start_time > self.deadline:
+                    self.metrics.incr("deadline.dropped", sum(map(len, pending.values())))
+                    self.unfinished.extend(url for urls in pending.values() for url in urls)
+                    pending.clear()
+                while len(futures) < limit:
+                    url = self._pick(pending)
+                    if url is None:
+                        break
+                    early = on_links if self.early_links else None
+                    futures[self._submit(executor, url, early)] = url
+                # Poll so that cancel() from another thread is noticed during slow fetches.
+                waiting: set[Future[Any]] = {*futures, wakeup}
+                done, _ = wait(waiting, timeout=0.1, return_when=FIRST_COMPLETED)
+                if wakeup.done():
+                    wakeup = Future()
+                while scanned:
+                    url = scanned.popleft()
+                    if self.mark_visited(url):
+                        self.metrics.incr("links.early")
+                        queue(url)
+                # Handle completions in submission order so single-threaded crawls are repeatable.
+                for future in [future for future in futures if future in done]:
+                    url = futures.pop(future)
+                    page = self.complete(url, future.result(), queue)
                     processed += 1
-                    if result is None:
-                        self._log_progress(start_time, processed, last_log)
-                        last_log = time.monotonic()
-                        continue
-                    page, discovered = result
-                    if page.markdown.strip():
-                        pages.append(page)
-                    for url in discovered:
-                        if self._mark_visited(url):
-                            futures[executor.submit(self._crawl_url, url)] = url
-                    self._log_progress(start_time, processed, last_log)
-                    last_log = time.monotonic()
-
-        return pages
-
-    def _mark_visited(self, url: str) -> bool:
+                    if page is not None:
+                        yield page
+                # Snapshots follow the metrics interval; on_progress is throttled separately.
+                progress = self._progress(start_time, processed)
+                self.metrics.maybe_emit(
+                    processed=progress.processed,
+                    discovered=progress.discovered,
+                    eta=progress.eta,
+                )
+                if self.on_progress is not None and time.monotonic() - last_report >= 0.5:
+                    last_report = time.monotonic()
+                    self.on_progress(progress)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            self.unfinished.extend(url for urls in pending.values() for url in urls)
+            self.unfinished.extend(futures.values())
+            for url in futures.values():
+                self.hosts.discard(urlsplit(url).netloc)
+            # Cleared only once the crawl is over, so a cancel() issued before it began holds.
+            self._cancelled.clear()
+
+    def complete(
+        self,
+        url: str,
+        result: tuple[Page, list[str]] | None,
+        queue: Callable[[str], None],
+    ) -> Page | None:
+        """Account for a finished :meth:`crawl_url` of ``url``; return its page if it is new.
+
+        Releases the host slot, hands ``url`` back to ``queue`` if its fetch timed out and it
+        has retries left (otherwise a failure goes to :attr:`unfinished`), queues unvisited
+        links and sets duplicates aside. Shared by :meth:`iter_pages` and schedulers that run
+        :meth:`crawl_url` themselves (:class:`~mdcrawler.batch.BatchScheduler`).
+        """
+        latency, timed_out = self.pop_fetch(url)
+        if self.hosts.release(urlsplit(url).netloc, latency, timed_out):
+            self.metrics.incr("hosts.quarantined")
+        if result is None:
+            if timed_out and self._attempts[url] < self.retries:
+                # Retry stalled URLs after the rest of their host's queue.
+                self._attempts[url] += 1
+                self.metrics.incr("retries")
+                queue(url)
+            else:
+                self.unfinished.append(url)
+            return None
+        page, discovered = result
+        if self._is_duplicate(page) and not self.follow_duplicates:
+            discovered = []
+        for link in discovered:
+            if self.mark_visited(link):
+                queue(link)
+            else:
+                self.metrics.incr("dedup.visited")
+        if page.duplicate_of is not None:
+            self.duplicates.append(page)
+            return None
+        if not page.markdown.strip():
+            self.metrics.incr("skipped.empty")
+            return None
+        if self.titles is not None:
+            page.title = self.titles.add(page.url, page.title)
+        self.metrics.incr("pages")
+        self.profiler.page_done()
+        return page
+
+    def _pick(self, pending: dict[str, deque[str]]) -> str | None:
+        """Pop the next URL of the first host (round-robin) that is under its concurrency cap."""
+        for host in list(pending):
+            if not self.hosts.acquire(host):
+                continue
+            urls = pending.pop(host)
+            url = urls.popleft()
+            if urls:
+                pending[host] = urls
+            return url
+        return None
+
+    async def aiter_pages(self, buffer: int | None = None) -> AsyncIterator[Page]:
+        """Async counterpart of :meth:`iter_pages`; the crawl runs on a helper thread."""
+        pages = self.iter_pages(buffer)
+        # One thread drives the generator so that closing it waits for a pending next().
+        driver = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mdcrawler-aiter")
+        try:
+            while True:
+                page = await asyncio.wrap_future(driver.submit(next, pages, None))
+                if page is None:
+                    return
+                yield page
+        finally:
+            self.cancel()
+            await asyncio.wrap_future(driver.submit(pages.close))
+            driver.shutdown()
+            # The crawl may have ended before cancel() above; don't let it stop the next one.
+            self._cancelled.clear()
+
+    def cancel(self) -> None:
+        """Stop a running :meth:`iter_pages` / :meth:`aiter_pages` from any thread.
+
+        Called before the crawl starts, it makes the next crawl stop right away.
+        """
+        self._cancelled.set()
+
+    def _is_duplicate(self, page: Page) -> bool:
+        if self.dedup is None:
+            return False
+        if page.duplicate_of is None and page.fingerprint is not None:
+            page.duplicate_of = self.dedup.add(page.url, page.fingerprint)
+            if page.duplicate_of is not None:
+                self.metrics.incr("dedup.content")
+        return page.duplicate_of is not None
+
+    def _submit(
+        self,
+        executor: ThreadPoolExecutor,
+        url: str,
+        on_links: Callable[[list[str]], None] | None = None,
+    ) -> Future[tuple[Page, list[str]] | None]:
+        self.tracer.instant("queued", url=url)
+        return executor.submit(self.crawl_url, url, on_links)
+
+    def pop_fetch(self, url: str) -> tuple[float, bool]:
+        """Seconds the last fetch of ``url`` took and whether it timed out (then forget it).
+
+        Only the fetch is timed, not queueing or extraction, so host latency stays meaningful
+        when the worker pool is backed up.
+        """
+        with self.lock:
+            return self._fetches.pop(url, (0.0, False))
+
+    def _record_fetch(self, url: str, started: float, timed_out: bool) -> None:
+        with self.lock:
+            self._fetches[url] = (time.monotonic() - started, timed_out)
+
+    def mark_visited(self, url: str) -> bool:
         with self.lock:
             if url in self.visited:
                 return False
             self.visited.add(url)
             return True
 
-    def _log_progress(self, start_time: float, processed: int, last_log: float) -> None:
-        now = time.monotonic()
-        if now - last_log < 0.5:
-            return
+    def _progress(self, start_time: float, processed: int) -> Progress:
         with self.lock:
             discovered = len(self.visited)
-        elapsed = max(now - start_time, 0.001)
+        elapsed = max(time.monotonic() - start_time, 0.001)
         rate = processed / elapsed
         remaining = max(discovered - processed, 0)
-        eta_seconds = remaining / rate if rate > 0 else 0.0
-        print(
-            f"Crawled {processed}/{discovered} pages | "
-            f"Elapsed {elapsed:.1f}s | ETA {eta_seconds:.1f}s",
-            flush=True,
-        )
+        return Progress(processed, discovered, elapsed, remaining / rate if rate > 0 else 0.0)
+
+    @contextmanager
+    def _stage(self, name: str, url: str) -> Iterator[None]:
+        with self.metrics.timer(name), self.tracer.span(name, url=url), self.profiler.stage(name):
+            yield
 
-    def _crawl_url(self, url: str) -> tuple[Page, list[str]] | None:
+    def crawl_url(
+        self, url: str, on_links: Callable[[list[str]], None] | None = None
+    ) -> tuple[Page, list[str]] | None:
+        """Fetch and extract ``url``; ``on_links`` receives links scanned before extraction."""
+        with self.tracer.span("crawl", url=url):
+            return self._crawl_url_traced(url, on_links)
+
+    def _crawl_url_traced(
+        self, url: str, on_links: Callable[[list[str]], None] | None
+    ) -> tuple[Page, list[str]] | None:
+        fetch = self.fetch or fetch_url
+        started = time.monotonic()
         try:
-            response = fetch_url(url)
-        except Exception:
+            with self._stage("fetch", url):
+                response = fetch(url)
+        except Exception as exc:
+            self.metrics.incr(f"errors.{type(exc).__name__}")
+            self._record_fetch(url, started, timed_out=isinstance(exc, requests.Timeout))
             return None
+        self._record_fetch(url, started, timed_out=False)
+        fetched_at = time.time()
+        with self._stage("decode", url):
+            html = response.text
+        self.metrics.observe("html.chars", len(html))
+        if self.dedup is not None and not self.follow_duplicates:
+            # Links of duplicates are not followed, so identical bodies need no extraction.
+            original = self.dedup.add_document(url, html.encode("utf-8"))
+            if original is not None:
+                self.metrics.incr("dedup.document")
+                page = Page(url, url, "", [], fetched_at=fetched_at, duplicate_of=original)
+                return page, []
+        # Links found early cannot be withdrawn, so skip the scan when duplicates are not followed.
+        if on_links is not None and (self.dedup is None or self.follow_duplicates):
+            with self._stage("scan", url):
+                links = scan_links(html, url, self.prefix)
+            on_links(links)
         content = extract_content(
-            response.text,
+            html,
             url,
             self.prefix,
             include_images=self.include_images,
             tag_blacklist=self.tag_blacklist,
             attr_blacklist=self.attr_blacklist,
+            stage=partial(self._stage, url=url),
+        )
+        markdown = content.markdown
+        if self.boilerplate is not None and markdown.strip():
+            with self._stage("boilerplate", url):
+                markdown = self.boilerplate.process(markdown)
+            self.metrics.observe("boilerplate.bytes", len(content.markdown) - len(markdown))
+        self.metrics.observe("markdown.bytes", len(markdown))
+        page = Page(
+            url=url,
+            title=content.title,
+            markdown=markdown,
+            images=content.images,
+            fetched_at=fetched_at,
         )
-        page = Page(url=url, title=content.title, markdown=content.markdown, images=content.images)
+        if self.dedup is not None and markdown.strip():
+            with self._stage("fingerprint", url):
+                page.fingerprint = fingerprint(markdown)
+        if self.spool is not None and markdown.strip():
+            page = self.spool.spill(page)
         return page, content.discovered_urls
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from itertools import pairwise
+
+_WORD_PATTERN = re.compile(r"\w+")
+_BITS = 64
+
+
+@dataclass(slots=True)
+class Fingerprint:
+    """Exact digest plus 64-bit SimHash of a page's normalized text."""
+
+    digest: str
+    simhash: int
+
+
+def fingerprint(text: str, shingle_size: int = 4) -> Fingerprint:
+    words = _WORD_PATTERN.findall(text.lower())
+    digest = hashlib.sha256(" ".join(words).encode("utf-8")).hexdigest()
+    return Fingerprint(digest=digest, simhash=simhash(_shingles(words, shingle_size)))
+
+
+def simhash(features: Counter[str]) -> int:
+    """Charikar SimHash of weighted features; similar inputs differ in few bits."""
+    if not features:
+        return 0
+    rows: list[str] = []
+    for feature, weight in features.items():
+        value = int.from_bytes(
+            hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big"
+        )
+        rows.extend([format(value, "064b")] * weight)
+    half = len(rows) / 2
+    result = 0
+    # Transposing the bit strings counts each bit position in C instead of 64 Python ops/feature.
+    for column in zip(*rows, strict=True):
+        result = (result << 1) | (column.count("1") > half)
+    return result
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def _shingles(words: list[str], size: int) -> Counter[str]:
+    if len(words) <= size:
+        return Counter([" ".join(words)]) if words else Counter()
+    return Counter(" ".join(words[i : i + size]) for i in range(len(words) - size + 1))
+
+
+class DuplicateIndex:
+    """Find exact and near-duplicate pages by fingerprint.
+
+    Near-duplicates are pages whose SimHashes differ in at most ``max_distance`` bits. The
+    hash is split into ``max_distance + 1`` bands; two hashes within that distance must agree
+    on at least one band, so only pages sharing a band are compared.
+    """
+
+    def __init__(self, max_distance: int = 3) -> None:
+        if not 0 <= max_distance < _BITS:
+            raise ValueError(f"max_distance must be between 0 and {_BITS - 1}")
+        self.max_distance = max_distance
+        bands = max_distance + 1
+        edges = [round(i * _BITS / bands) for i in range(bands + 1)]
+        self._bands = [(start, (1 << (end - start)) - 1) for start, end in pairwise(edges)]
+        self._tables: list[dict[int, list[tuple[int, str]]]] = [{} for _ in self._bands]
+        self._exact: dict[str, str] = {}
+        self._documents: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def add_document(self, url: str, body: bytes) -> str | None:
+        """Register a raw response body; return the first URL that served identical bytes."""
+        digest = hashlib.sha256(body).hexdigest()
+        with self._lock:
+            original = self._documents.get(digest)
+            if original is None:
+                self._documents[digest] = url
+            return original
+
+    def add(self, url: str, fp: Fingerprint) -> str | None:
+        """Register a page; return the URL of the page it duplicates, or None if it is new."""
+        keys = [(fp.simhash >> start) & mask for start, mask in self._bands]
+        with self._lock:
+            original = self._exact.get(fp.digest)
+            if original is not None:
+                return original
+            for table, key in zip(self._tables, keys, strict=True):
+                for candidate, candidate_url in table.get(key, ()):
+                    if hamming_distance(candidate, fp.simhash) <= self.max_distance:
+                        return candidate_url
+            self._exact[fp.digest] = url
+            for table, key in zip(self._tables, keys, strict=True):
+                table.setdefault(key, []).append((fp.simhash, url))
+        return None
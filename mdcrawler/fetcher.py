@@ -1,9 +1,255 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
+import time
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Protocol
+from urllib.parse import urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.exceptions import HTTPError as URLLib3Error
+from urllib3.exceptions import ReadTimeoutError
+from urllib3.util.request import ACCEPT_ENCODING
+
+from mdcrawler.metrics import Metrics
+from mdcrawler.options import MAX_RESPONSE_BYTES, REQUEST_DEADLINE
+
+Fetch = Callable[[str], requests.Response]
+
+# urllib3 lists br and zstd only when their decoders (brotli, zstandard) are installed.
+HEADERS = {"Accept-Encoding": ", ".join(ACCEPT_ENCODING.split(","))}
+_CHUNK_SIZE = 64 * 1024
+
+
+class ResponseTooLargeError(requests.RequestException):
+    """A response body decoded to more than the allowed number of bytes."""
+
+
+class DeadlineExceededError(requests.Timeout):
+    """A response did not arrive completely within its total deadline."""
+
+
+class FetchBackend(Protocol):
+    """A reusable HTTP client; :meth:`fetch` has the :data:`Fetch` signature."""
+
+    name: str
+
+    def fetch(self, url: str) -> requests.Response: ...
+
+    def close(self) -> None: ...
+
+
+class RequestsBackend:
+    """HTTP/1.1 through a pooled :class:`requests.Session`: one connection per request in flight."""
+
+    name = "http/1.1"
+
+    def __init__(
+        self,
+        timeout: float = 15,
+        pool_size: int = 10,
+        max_bytes: int = MAX_RESPONSE_BYTES,
+        deadline: float | None = REQUEST_DEADLINE,
+    ) -> None:
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.deadline = deadline
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def fetch(self, url: str) -> requests.Response:
+        deadline_at = _deadline_at(self.deadline)
+        timeout = _op_timeout(self.timeout, self.deadline)
+        response = self.session.get(url, timeout=timeout, stream=True)
+        return _read_body(response, self.max_bytes, deadline_at)
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class HTTP2Backend:
+    """HTTP/2 through httpx (``pip install 'mdcrawler[http2]'``).
+
+    Concurrent requests to a host are multiplexed as streams over a shared connection instead
+    of opening one connection each. Hosts that do not negotiate HTTP/2 via ALPN are fetched
+    over HTTP/1.1 by the same client; ``protocols`` counts responses per HTTP version.
+    ``prior_knowledge`` speaks HTTP/2 without negotiation, which cleartext ``http://`` URLs
+    need. Responses are converted to :class:`requests.Response` for the rest of the pipeline.
+    """
+
+    name = "http/2"
+
+    def __init__(
+        self,
+        timeout: float = 15,
+        pool_size: int = 10,
+        prior_knowledge: bool = False,
+        max_bytes: int = MAX_RESPONSE_BYTES,
+        deadline: float | None = REQUEST_DEADLINE,
+    ) -> None:
+        import httpx
+
+        self._httpx: Any = httpx
+        self.max_bytes = max_bytes
+        self.deadline = deadline
+        self.protocols: Counter[str] = Counter()
+        self.client = httpx.Client(
+            http1=not prior_knowledge,
+            http2=True,
+            timeout=_op_timeout(timeout, deadline),
+            limits=httpx.Limits(max_connections=pool_size),
+            follow_redirects=True,
+        )
+
+    def fetch(self, url: str) -> requests.Response:
+        deadline_at = _deadline_at(self.deadline)
+        response = requests.Response()
+        try:
+            with self.client.stream("GET", url) as reply:
+                response.url = str(reply.url)
+                response.status_code = reply.status_code
+                response.reason = reply.reason_phrase
+                response.headers = CaseInsensitiveDict(reply.headers)
+                response._content = _read_capped(
+                    url, reply.iter_bytes(), self.max_bytes, response, deadline_at
+                )
+                wire_bytes = reply.num_bytes_downloaded
+        except self._httpx.TimeoutException as exc:
+            raise requests.Timeout(str(exc)) from exc
+        except self._httpx.HTTPError as exc:
+            raise requests.ConnectionError(str(exc)) from exc
+        self.protocols[reply.http_version] += 1
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = _WireCount(wire_bytes)  # type: ignore[assignment]
+        response.raise_for_status()
+        return response
+
+    def close(self) -> None:
+        self.client.close()
+
+
+def open_backend(
+    http2: bool = False,
+    timeout: float = 15,
+    pool_size: int = 10,
+    max_bytes: int = MAX_RESPONSE_BYTES,
+    deadline: float | None = REQUEST_DEADLINE,
+) -> FetchBackend:
+    """Return the HTTP/2 backend if requested and httpx is installed, else HTTP/1.1."""
+    if http2:
+        try:
+            return HTTP2Backend(timeout, pool_size, max_bytes=max_bytes, deadline=deadline)
+        except ImportError:
+            pass
+    return RequestsBackend(timeout, pool_size, max_bytes=max_bytes, deadline=deadline)
+
+
+def count_transfers(fetch: Fetch, metrics: Metrics) -> Fetch:
+    """Wrap ``fetch`` to count wire and decoded body bytes, in total and per host."""
+
+    def fetch_and_count(url: str) -> requests.Response:
+        try:
+            response = fetch(url)
+        except requests.HTTPError as exc:
+            if exc.response is not None:
+                _count_transfer(metrics, url, exc.response)
+            raise
+        _count_transfer(metrics, url, response)
+        return response
+
+    return fetch_and_count
+
+
+def transfer_sizes(response: requests.Response) -> tuple[int, int]:
+    """Return ``(wire_bytes, decoded_bytes)`` of a response whose body has been read.
+
+    Wire bytes are the body as received, before content decoding. Responses that did not come
+    off a socket (e.g. replayed ones) report their decoded size for both.
+    """
+    decoded = len(response.content)
+    tell = getattr(response.raw, "tell", None)
+    return (tell() if callable(tell) else decoded), decoded
+
+
+def _count_transfer(metrics: Metrics, url: str, response: requests.Response) -> None:
+    wire, decoded = transfer_sizes(response)
+    host = urlsplit(url).netloc
+    for name, amount in (("wire", wire), ("decoded", decoded)):
+        metrics.incr(f"bytes.{name}", amount)
+        metrics.incr(f"hosts.{host}.bytes.{name}", amount)
+
+
+class _WireCount:
+    """Stands in for urllib3's ``HTTPResponse.tell()`` on converted responses."""
+
+    def __init__(self, wire_bytes: int) -> None:
+        self._wire_bytes = wire_bytes
+
+    def tell(self) -> int:
+        return self._wire_bytes
+
+
+def _deadline_at(deadline: float | None) -> float | None:
+    return None if deadline is None else time.monotonic() + deadline
+
+
+def _op_timeout(timeout: float, deadline: float | None) -> float:
+    return timeout if deadline is None else min(timeout, deadline)
+
+
+def _read_body(
+    response: requests.Response, max_bytes: int, deadline_at: float | None = None
+) -> requests.Response:
+    """Stream and decode the body of a ``stream=True`` response, then raise for its status."""
+    with response:
+        response._content = _read_capped(
+            response.url, _iter_decoded(response), max_bytes, response, deadline_at
+        )
+    response.raise_for_status()
+    return response
+
+
+def _iter_decoded(response: requests.Response) -> Iterator[bytes]:
+    """Yield decoded body chunks as they arrive rather than once a full chunk is buffered."""
+    read1 = getattr(response.raw, "read1", None)
+    if read1 is None:  # urllib3 < 2.3
+        yield from response.iter_content(_CHUNK_SIZE)
+        return
+    try:
+        while chunk := read1(_CHUNK_SIZE, decode_content=True):
+            yield chunk
+    except ReadTimeoutError as exc:
+        raise requests.Timeout(str(exc)) from exc
+    except URLLib3Error as exc:
+        raise requests.ConnectionError(str(exc)) from exc
+
+
+def _read_capped(
+    url: str,
+    chunks: Iterable[bytes],
+    max_bytes: int,
+    response: requests.Response,
+    deadline_at: float | None = None,
+) -> bytes:
+    # Decoding chunk by chunk keeps a compression bomb from inflating past the cap in memory,
+    # and checking the clock per chunk stops servers that trickle bytes under the read timeout.
+    body = bytearray()
+    for chunk in chunks:
+        body += chunk
+        if len(body) > max_bytes:
+            raise ResponseTooLargeError(
+                f"{url}: body exceeds {max_bytes} bytes after decoding", response=response
+            )
+        if deadline_at is not None and time.monotonic() > deadline_at:
+            raise DeadlineExceededError(f"{url}: response deadline exceeded", response=response)
+    return bytes(body)
 
 
 def fetch_urls(urls: Iterable[str], max_workers: int) -> list[tuple[str, requests.Response | None]]:
@@ -20,13 +266,14 @@ def fetch_urls(urls: Iterable[str], max_workers: int) -> list[tuple[str, request
     return results
 
 
-def fetch_url(url: str) -> requests.Response:
-    response = requests.get(url, timeout=15)
-    response.raise_for_status()
-    return response
+def fetch_url(
+    url: str, max_bytes: int = MAX_RESPONSE_BYTES, deadline: float | None = REQUEST_DEADLINE
+) -> requests.Response:
+    """GET ``url``; ``deadline`` bounds the whole response, not just each socket read."""
+    deadline_at = _deadline_at(deadline)
+    response = requests.get(url, timeout=_op_timeout(15, deadline), headers=HEADERS, stream=True)
+    return _read_body(response, max_bytes, deadline_at)
 
 
 def _fetch(url: str) -> requests.Response:
-    response = requests.get(url, timeout=15)
-    response.raise_for_status()
-    return response
+    return fetch_url(url)
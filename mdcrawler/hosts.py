@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class _HostState:
+    in_flight: int = 0
+    samples: int = 0
+    baseline: float = 0.0
+    quarantined_until: float = 0.0
+
+
+class HostLimiter:
+    """Per-host concurrency caps that shrink to one request for hosts whose latency spikes.
+
+    A request counts as a spike when it failed with a timeout, or took ``spike_factor`` times
+    the host's average latency (after ``min_samples`` requests) and at least ``min_spike``
+    seconds. A spiking host is quarantined for ``quarantine`` seconds, during which it may only
+    have one request in flight, so it cannot tie up workers other hosts could use. While only
+    one host has been seen there is nobody to protect, so quarantine does not limit it. Meant
+    to be driven from a single scheduling thread.
+    """
+
+    def __init__(
+        self,
+        max_per_host: int | None = None,
+        quarantine: float = 30.0,
+        spike_factor: float = 4.0,
+        min_spike: float = 1.0,
+        min_samples: int = 5,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_per_host = max_per_host
+        self.quarantine = quarantine
+        self.spike_factor = spike_factor
+        self.min_spike = min_spike
+        self.min_samples = min_samples
+        self.clock = clock
+        self.quarantines: Counter[str] = Counter()
+        self._hosts: dict[str, _HostState] = {}
+
+    def limit(self, host: str) -> int | None:
+        """Requests ``host`` may have in flight right now (None: no per-host cap)."""
+        if self.is_quarantined(host) and len(self._hosts) > 1:
+            return 1
+        return self.max_per_host
+
+    def is_quarantined(self, host: str) -> bool:
+        state = self._hosts.get(host)
+        return state is not None and state.quarantined_until > self.clock()
+
+    def acquire(self, host: str) -> bool:
+        """Reserve a request slot for ``host`` if it is under its limit."""
+        state = self._hosts.setdefault(host, _HostState())
+        limit = self.limit(host)
+        if limit is not None and state.in_flight >= limit:
+            return False
+        state.in_flight += 1
+        return True
+
+    def discard(self, host: str) -> None:
+        """Free a slot whose request was abandoned, without recording its latency."""
+        self._hosts[host].in_flight -= 1
+
+    def release(self, host: str, latency: float, timed_out: bool = False) -> bool:
+        """Free the slot taken by :meth:`acquire`; returns True if ``host`` was just quarantined."""
+        state = self._hosts[host]
+        state.in_flight -= 1
+        spiked = timed_out or (
+            state.samples >= self.min_samples
+            and latency >= self.min_spike
+            and latency > self.spike_factor * state.baseline
+        )
+        if not timed_out:
+            # Exponentially weighted, so the baseline follows gradual changes but not one spike.
+            weight = 1 / min(state.samples + 1, 10)
+            state.baseline += (latency - state.baseline) * weight
+            state.samples += 1
+        if not spiked or self.quarantine <= 0:
+            return False
+        newly = state.quarantined_until <= self.clock()
+        state.quarantined_until = self.clock() + self.quarantine
+        if newly:
+            self.quarantines[host] += 1
+        return newly
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+from collections.abc import Iterable
+from pathlib import Path
+from typing import IO
+
+from mdcrawler.chunking import iter_chunks
+from mdcrawler.crawler import Page
+from mdcrawler.markdown_writer import render_markdown
+from mdcrawler.tokens import estimate_tokens
+
+
+def write_jsonl(pages: Iterable[Page], output_dir: Path, compress: bool = False) -> None:
+    with JsonlWriter(output_dir, compress=compress) as writer:
+        for page in pages:
+            writer.write_page(page)
+
+
+class JsonlWriter:
+    """Stream heading-delimited chunks of each page to chunks.jsonl(.gz), one record per line."""
+
+    def __init__(self, output_dir: Path, compress: bool = False) -> None:
+        self.path = output_dir / ("chunks.jsonl.gz" if compress else "chunks.jsonl")
+        self._handle: IO[str] = (
+            gzip.open(self.path, "wt", encoding="utf-8")
+            if compress
+            else self.path.open("w", encoding="utf-8")
+        )
+
+    def __enter__(self) -> JsonlWriter:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def write_page(self, page: Page) -> None:
+        markdown = render_markdown(page, image_prefix="images/")
+        for chunk in iter_chunks(markdown):
+            record = {
+                "url": page.url,
+                "title": page.title,
+                "heading_path": chunk.heading_path,
+                "text": chunk.text,
+                "start": chunk.start,
+                "end": chunk.end,
+                "hash": hashlib.sha256(chunk.text.encode("utf-8")).hexdigest(),
+                "tokens": estimate_tokens(chunk.text),
+            }
+            self._handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+        # Flush per page so consumers tailing the file see complete records promptly.
+        self._handle.flush()
+
+    def close(self) -> None:
+        self._handle.close()
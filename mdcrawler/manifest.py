@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Iterable, Mapping
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+from mdcrawler.crawler import Page
+from mdcrawler.markdown_writer import render_markdown, slugify
+
+MANIFEST_FILENAME = "manifest.json"
+DELTA_FILENAME = "delta.json"
+
+
+@dataclass
+class ManifestEntry:
+    url: str
+    slug: str
+    title: str
+    hash: str
+    size: int
+    fetched_at: str
+
+
+def build_manifest(pages: Iterable[Page]) -> list[ManifestEntry]:
+    """Describe each page file as written by ``write_pages`` (hash and size of its bytes)."""
+    entries: list[ManifestEntry] = []
+    for page in pages:
+        data = render_markdown(page, image_prefix="../images/").encode("utf-8")
+        fetched_at = (
+            datetime.fromtimestamp(page.fetched_at, tz=timezone.utc).isoformat()
+            if page.fetched_at
+            else ""
+        )
+        entries.append(
+            ManifestEntry(
+                url=page.url,
+                slug=slugify(page.url),
+                title=page.title,
+                hash=hashlib.sha256(data).hexdigest(),
+                size=len(data),
+                fetched_at=fetched_at,
+            )
+        )
+    return entries
+
+
+def load_manifest(output_dir: Path) -> dict[str, ManifestEntry] | None:
+    path = output_dir / MANIFEST_FILENAME
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    return {entry["url"]: ManifestEntry(**entry) for entry in data.get("pages", [])}
+
+
+def compute_delta(
+    previous: Mapping[str, ManifestEntry], current: Iterable[ManifestEntry]
+) -> dict[str, list[str]]:
+    current_by_url = {entry.url: entry for entry in current}
+    added = [url for url in current_by_url if url not in previous]
+    changed = [
+        url
+        for url, entry in current_by_url.items()
+        if url in previous and previous[url].hash != entry.hash
+    ]
+    removed = [url for url in previous if url not in current_by_url]
+    return {"added": added, "changed": changed, "removed": removed}
+
+
+def write_manifest(
+    entries: list[ManifestEntry],
+    output_dir: Path,
+    previous: Mapping[str, ManifestEntry] | None = None,
+    partial: bool = False,
+) -> None:
+    """Write manifest.json and, when a previous manifest is given, delta.json against it.
+
+    Page files of pages in the previous manifest but no longer crawled are deleted, unless the
+    crawl was ``partial`` (failed URLs, deadline or cancellation): then such a page may still
+    exist, so its previous entry and page file are kept.
+    """
+    if previous is not None and partial:
+        current = {entry.url for entry in entries}
+        slugs = {entry.slug for entry in entries}
+        entries = [
+            *entries,
+            *(
+                entry
+                for url, entry in previous.items()
+                if url not in current and entry.slug not in slugs
+            ),
+        ]
+    (output_dir / MANIFEST_FILENAME).write_text(
+        json.dumps({"pages": [asdict(entry) for entry in entries]}, indent=2) + "\n",
+        encoding="utf-8",
+    )
+    if previous is None:
+        return
+    delta = compute_delta(previous, entries)
+    (output_dir / DELTA_FILENAME).write_text(json.dumps(delta, indent=2) + "\n", encoding="utf-8")
+    slugs = {entry.slug for entry in entries}
+    for url in delta["removed"]:
+        slug = previous[url].slug
+        if slug not in slugs:
+            (output_dir / "pages" / f"{slug}.md").unlink(missing_ok=True)
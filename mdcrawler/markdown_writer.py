@@ -9,33 +9,57 @@ import requests
 
 from mdcrawler.content_extractor import ImageReference
 from mdcrawler.crawler import Page
+from mdcrawler.fetcher import Fetch, fetch_url
 
 
-def write_pages(pages: Iterable[Page], output_dir: Path) -> None:
+def write_pages(pages: Iterable[Page], output_dir: Path, fetch: Fetch = fetch_url) -> None:
     pages_dir = output_dir / "pages"
     pages_dir.mkdir(parents=True, exist_ok=True)
-    images_dir = output_dir / "images"
-    pages = list(pages)
     for page in pages:
-        if page.images:
-            images_dir.mkdir(parents=True, exist_ok=True)
-            _materialize_images(page, images_dir)
-        slug = _slugify(page.url)
+        download_images(page, output_dir, fetch)
+        slug = slugify(page.url)
         path = pages_dir / f"{slug}.md"
         markdown = render_markdown(page, image_prefix="../images/")
-        path.write_text(markdown, encoding="utf-8")
+        write_if_changed(path, markdown)
+
+
+def download_images(page: Page, output_dir: Path, fetch: Fetch = fetch_url) -> None:
+    """Store the page's images under ``images/``; already downloaded files are reused."""
+    if not page.images:
+        return
+    images_dir = output_dir / "images"
+    images_dir.mkdir(parents=True, exist_ok=True)
+    _materialize_images(page, images_dir, fetch)
 
 
 def write_index(pages: Iterable[Page], output_dir: Path, start_url: str) -> None:
     lines = ["# Crawl Index", "", f"Start-URL: {start_url}", ""]
+    duplicates = []
     for page in pages:
-        slug = _slugify(page.url)
+        if page.duplicate_of is not None:
+            duplicates.append(f"- {page.url} -> duplicate of {page.duplicate_of}")
+            continue
+        slug = slugify(page.url)
         lines.append(f"- **{page.title}** ({page.url}) -> pages/{slug}.md")
+    if duplicates:
+        lines += ["", "## Duplicates", "", *duplicates]
     lines.append("")
-    (output_dir / "index.md").write_text("\n".join(lines), encoding="utf-8")
+    write_if_changed(output_dir / "index.md", "\n".join(lines))
+
+
+def write_if_changed(path: Path, text: str) -> bool:
+    """Write ``text`` unless the file already holds it, so unchanged files keep their mtime."""
+    data = text.encode("utf-8")
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    path.write_bytes(data)
+    return True
 
 
-def _slugify(url: str) -> str:
+def slugify(url: str) -> str:
     parsed = urlparse(url)
     slug = parsed.netloc + parsed.path
     slug = slug.strip("/") or parsed.netloc
@@ -54,25 +78,24 @@ def render_markdown(page: Page, image_prefix: str) -> str:
     return markdown
 
 
-def _materialize_images(page: Page, images_dir: Path) -> None:
+def _materialize_images(page: Page, images_dir: Path, fetch: Fetch) -> None:
     with ThreadPoolExecutor(max_workers=min(8, max(1, len(page.images)))) as executor:
         futures = {
-            executor.submit(_download_image, image, images_dir, index): image
+            executor.submit(_download_image, image, images_dir, index, fetch): image
             for index, image in enumerate(page.images)
         }
         for future in as_completed(futures):
             future.result()
 
 
-def _download_image(image: ImageReference, images_dir: Path, index: int) -> None:
+def _download_image(image: ImageReference, images_dir: Path, index: int, fetch: Fetch) -> None:
     filename = _image_filename(image.url, index)
     output_path = images_dir / filename
     if output_path.exists():
         image.filename = filename
         return
     try:
-        response = requests.get(image.url, timeout=15)
-        response.raise_for_status()
+        response = fetch(image.url)
     except requests.RequestException:
         return
     output_path.write_bytes(response.content)
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import IO, Any
+
+_RESERVOIR_SIZE = 1024
+
+
+class Histogram:
+    """Count/sum/min/max plus a bounded reservoir sample for percentiles."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+        self._samples: list[float] = []
+        self._random = random.Random(0)
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if len(self._samples) < _RESERVOIR_SIZE:
+            self._samples.append(value)
+        else:
+            slot = self._random.randrange(self.count)
+            if slot < _RESERVOIR_SIZE:
+                self._samples[slot] = value
+
+    def percentile(self, fraction: float) -> float:
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def to_dict(self) -> dict[str, float]:
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(0.5),
+            "p90": self.percentile(0.9),
+            "p99": self.percentile(0.99),
+        }
+
+
+class Metrics:
+    """Thread-safe counters, stage timers and histograms for a crawl.
+
+    When ``sink`` is given, :meth:`maybe_emit` writes a JSON snapshot line to it at most every
+    ``interval`` seconds and :meth:`close` appends a final summary record.
+    """
+
+    def __init__(self, sink: IO[str] | None = None, interval: float = 5.0) -> None:
+        self.sink = sink
+        self.interval = interval
+        self.started = time.monotonic()
+        self.counters: Counter[str] = Counter()
+        self.histograms: dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+        self._last_emit = self.started
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[name] += amount
+
+    def observe(self, name: str, value: float) -> None:
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(f"{stage}.seconds", time.perf_counter() - start)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "elapsed": time.monotonic() - self.started,
+                "counters": dict(self.counters),
+                "histograms": {
+                    name: histogram.to_dict() for name, histogram in sorted(self.histograms.items())
+                },
+            }
+
+    def maybe_emit(self, **progress: Any) -> None:
+        if self.sink is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_emit < self.interval:
+                return
+            self._last_emit = now
+        self._emit({"type": "snapshot", **progress, **self.snapshot()})
+
+    def summary(self) -> str:
+        snapshot = self.snapshot()
+        lines = [f"Crawl summary ({snapshot['elapsed']:.1f}s)"]
+        for name, value in sorted(snapshot["counters"].items()):
+            lines.append(f"  {name}: {value}")
+        for name, stats in snapshot["histograms"].items():
+            if not stats["count"]:
+                continue
+            lines.append(
+                f"  {name}: n={stats['count']} mean={stats['mean']:.4f} "
+                f"p50={stats['p50']:.4f} p99={stats['p99']:.4f} max={stats['max']:.4f}"
+            )
+        return "\n".join(lines)
+
+    def close(self) -> None:
+        if self.sink is None:
+            return
+        self._emit({"type": "summary", **self.snapshot()})
+
+    def _emit(self, record: dict[str, Any]) -> None:
+        assert self.sink is not None
+        with self._lock:
+            self.sink.write(json.dumps(record) + "\n")
+            self.sink.flush()
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import mmap
+import os
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from urllib.parse import quote, unquote
+
+import requests
+
+from mdcrawler.content_extractor import extract_content
+from mdcrawler.crawler import Page
+
+HTML_SUFFIXES = (".html", ".htm")
+INDEX_NAMES = tuple(f"index{suffix}" for suffix in HTML_SUFFIXES)
+
+
+def iter_html_files(input_dir: Path) -> Iterator[Path]:
+    """Yield the HTML files below ``input_dir`` in a stable order."""
+    for root, dirs, files in os.walk(input_dir):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(HTML_SUFFIXES):
+                yield Path(root) / name
+
+
+def path_to_url(path: Path, input_dir: Path, base_url: str) -> str:
+    """Map a mirrored file to the URL it was saved from; ``index.htm(l)`` maps to its directory."""
+    relative = path.relative_to(input_dir).as_posix()
+    if path.name.lower() in INDEX_NAMES:
+        relative = relative[: -len(path.name)]
+    return _base(base_url) + quote(relative)
+
+
+def url_to_path(url: str, input_dir: Path, base_url: str) -> Path | None:
+    """Inverse of :func:`path_to_url` for any file in the mirror, or None if outside it."""
+    base = _base(base_url)
+    if not url.startswith(base):
+        return None
+    relative = unquote(url[len(base) :].split("#", 1)[0].split("?", 1)[0])
+    candidate = input_dir / relative
+    if not relative or relative.endswith("/"):
+        return next(
+            (candidate / name for name in INDEX_NAMES if (candidate / name).is_file()), None
+        )
+    return candidate if candidate.is_file() else None
+
+
+class MirrorFetcher:
+    """Serve ``fetch`` calls (e.g. image downloads) from the local mirror."""
+
+    def __init__(self, input_dir: Path, base_url: str) -> None:
+        self.input_dir = input_dir
+        self.base_url = base_url
+
+    def fetch(self, url: str) -> requests.Response:
+        path = url_to_path(url, self.input_dir, self.base_url)
+        if path is None:
+            raise requests.RequestException(f"Not in mirror: {url}")
+        response = requests.Response()
+        response.url = url
+        response.status_code = 200
+        response._content = path.read_bytes()
+        return response
+
+
+def extract_mirror(
+    input_dir: Path,
+    base_url: str,
+    workers: int | None = None,
+    include_images: bool = False,
+    tag_blacklist: list[str] | None = None,
+    attr_blacklist: list[str] | None = None,
+) -> list[Page]:
+    """Extract every HTML file of a local mirror across a process pool.
+
+    Pages come back in file order; files without any Markdown content are dropped.
+    """
+    prefix = _base(base_url)
+    tasks = [
+        (str(path), path_to_url(path, input_dir, base_url)) for path in iter_html_files(input_dir)
+    ]
+    workers = max(1, workers or os.cpu_count() or 1)
+    options = (prefix, include_images, tag_blacklist, attr_blacklist)
+    if workers == 1 or len(tasks) < 2:
+        results = [_extract_file(task, options) for task in tasks]
+    else:
+        # Large chunks keep pickling overhead low; several per worker keep the load balanced.
+        chunksize = max(1, min(64, len(tasks) // (workers * 4)))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(
+                executor.map(_extract_file, tasks, [options] * len(tasks), chunksize=chunksize)
+            )
+    return [page for page in results if page is not None]
+
+
+def _extract_file(
+    task: tuple[str, str], options: tuple[str, bool, list[str] | None, list[str] | None]
+) -> Page | None:
+    path, url = task
+    prefix, include_images, tag_blacklist, attr_blacklist = options
+    html = _read_html(Path(path))
+    if not html:
+        return None
+    content = extract_content(
+        html,
+        url,
+        prefix,
+        include_images=include_images,
+        tag_blacklist=tag_blacklist,
+        attr_blacklist=attr_blacklist,
+    )
+    if not content.markdown.strip():
+        return None
+    return Page(
+        url=url,
+        title=content.title,
+        markdown=content.markdown,
+        images=content.images,
+        fetched_at=os.path.getmtime(path),
+    )
+
+
+def _read_html(path: Path) -> str:
+    with path.open("rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return ""
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            try:
+                return str(data, "utf-8")
+            except UnicodeDecodeError:
+                # wget keeps the server's bytes; legacy pages are almost always Latin-1.
+                return str(data, "latin-1")
+
+
+def _base(base_url: str) -> str:
+    return base_url.rstrip("/") + "/"
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+# Choices and defaults shared by the CLI parsers and the modules that implement them. This
+# module must stay free of imports so that building the parser (and --help) stays fast.
+
+DEFAULT_TAG_BLACKLIST = [
+    "nav",
+    "aside",
+    "footer",
+    "form",
+    "button",
+    "input",
+    "textarea",
+    "select",
+    "noscript",
+    "script",
+    "style",
+    "svg",
+    "iframe",
+]
+
+DEFAULT_ATTR_BLACKLIST = [
+    "navigation",
+    "sidebar",
+    "contents",
+    "toolbar",
+    "pagination",
+    "footer",
+    "absolute",
+]
+
+OUTPUT_FORMATS = ("markdown", "jsonl", "pack", "search")
+
+PROFILE_MODES = ("cpu", "mem")
+
+SPILL_MODES = ("memory", "disk")
+
+# Largest response body, after content decoding, that a fetch accepts.
+MAX_RESPONSE_BYTES = 64 * 1024 * 1024
+
+# Seconds a single response may take from request to its last body byte.
+REQUEST_DEADLINE = 60.0
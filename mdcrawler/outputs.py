@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from collections.abc import Collection, Iterable, Iterator
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+
+from mdcrawler.archive import write_archive
+from mdcrawler.boilerplate import BoilerplateDetector
+from mdcrawler.combined_builder import build_combined
+from mdcrawler.crawler import Page, derive_prefix
+from mdcrawler.fetcher import Fetch, fetch_url
+from mdcrawler.jsonl_writer import JsonlWriter, write_jsonl
+from mdcrawler.manifest import build_manifest, load_manifest, write_manifest
+from mdcrawler.markdown_writer import download_images, write_index, write_pages
+from mdcrawler.metrics import Metrics
+from mdcrawler.profiling import StageProfiler
+from mdcrawler.search_index import SearchIndexWriter, write_search_index
+from mdcrawler.title_normalizer import TitleNormalizer
+from mdcrawler.tracing import TraceRecorder
+
+
+def write_outputs(
+    pages: Iterable[Page],
+    output_path: Path,
+    start_url: str,
+    formats: list[str],
+    fetch: Fetch = fetch_url,
+    combined_max_bytes: int | None = None,
+    combined_max_tokens: int | None = None,
+    jsonl_gzip: bool = False,
+    pack_compress: bool = False,
+    metrics: Metrics | None = None,
+    tracer: TraceRecorder | None = None,
+    profiler: StageProfiler | None = None,
+    boilerplate: BoilerplateDetector | None = None,
+    titles: TitleNormalizer | None = None,
+    duplicates: Iterable[Page] = (),
+    unfinished: Collection[str] = (),
+) -> int:
+    """Normalize titles and write every requested output format for ``pages``.
+
+    ``pages`` may be a live crawl (:meth:`Crawler.iter_pages`): images and, without
+    ``boilerplate``, page files, JSONL chunks and search index rows are written as pages
+    arrive, so consumers can start before the crawl ends. JSONL records keep the title known
+    at that point; the search index gets the final titles when it is closed.
+    Everything else is written once the iterable is exhausted. Returns the number of
+    distinct pages; nothing else is written when there are none.
+
+    Duplicate pages (``duplicate_of`` set, in ``pages`` or ``duplicates``, which is read
+    after ``pages`` so it may be :attr:`Crawler.duplicates`) are only listed in
+    ``index.md``. ``unfinished`` (read after ``pages`` too, e.g. :attr:`Crawler.unfinished`)
+    lists URLs the crawl failed on or never reached; if there are any, page files of earlier
+    runs are kept rather than pruned, since their pages may still exist. With
+    ``boilerplate``, blocks it learned during the crawl are stripped from every page first,
+    including pages crawled before those blocks reached the threshold. ``titles`` is the
+    normalizer that saw the pages during the crawl; its final pass fixes up provisional titles.
+    """
+    metrics = metrics or Metrics()
+    tracer = tracer or TraceRecorder(enabled=False)
+    profiler = profiler or StageProfiler()
+    # Blocks ``boilerplate`` learns later may still change any page until the crawl ends.
+    streaming = boilerplate is None
+    everything: list[Page] = []
+    with ExitStack() as writers:
+        # Opened on the first distinct page so an empty crawl leaves no files behind.
+        jsonl: JsonlWriter | None = None
+        search: SearchIndexWriter | None = None
+        for page in pages:
+            everything.append(page)
+            if page.duplicate_of is not None:
+                continue
+            if "markdown" in formats:
+                with write_stage("write.pages", metrics, tracer, profiler):
+                    if streaming:
+                        write_pages([page], output_path, fetch=fetch)
+                    else:
+                        download_images(page, output_path, fetch=fetch)
+            if streaming and "jsonl" in formats:
+                with write_stage("write.jsonl", metrics, tracer, profiler):
+                    if jsonl is None:
+                        jsonl = writers.enter_context(JsonlWriter(output_path, jsonl_gzip))
+                    jsonl.write_page(page)
+            if streaming and "search" in formats:
+                with write_stage("write.search", metrics, tracer, profiler):
+                    if search is None:
+                        search = writers.enter_context(SearchIndexWriter(output_path))
+                    search.add_page(page)
+        pages = [page for page in everything if page.duplicate_of is None]
+        if not pages:
+            return 0
+        if titles is None:
+            titles = TitleNormalizer(derive_prefix(start_url), sample_size=len(pages))
+            for page in pages:
+                titles.add(page.url, page.title)
+        final_titles = titles.finalize()
+        for page in pages:
+            page.title = final_titles.get(page.url, page.title)
+        if boilerplate is not None:
+            with write_stage("write.boilerplate", metrics, tracer, profiler):
+                for page in pages:
+                    markdown = page.markdown
+                    stripped = boilerplate.clean(markdown)
+                    if stripped != markdown:
+                        page.markdown = stripped
+
+        if "markdown" in formats:
+            previous_manifest = load_manifest(output_path)
+            if not streaming:
+                with write_stage("write.pages", metrics, tracer, profiler):
+                    write_pages(pages, output_path, fetch=fetch)
+            with write_stage("write.index", metrics, tracer, profiler):
+                write_index([*everything, *duplicates], output_path, start_url=start_url)
+            with write_stage("write.combined", metrics, tracer, profiler):
+                build_combined(
+                    pages,
+                    output_path,
+                    max_bytes=combined_max_bytes,
+                    max_tokens=combined_max_tokens,
+                )
+            with write_stage("write.manifest", metrics, tracer, profiler):
+                write_manifest(
+                    build_manifest(pages),
+                    output_path,
+                    previous=previous_manifest,
+                    partial=bool(unfinished),
+                )
+        if "jsonl" in formats and not streaming:
+            with write_stage("write.jsonl", metrics, tracer, profiler):
+                write_jsonl(pages, output_path, compress=jsonl_gzip)
+        if "pack" in formats:
+            with write_stage("write.pack", metrics, tracer, profiler):
+                write_archive(pages, output_path, compress=pack_compress)
+        if "search" in formats:
+            with write_stage("write.search", metrics, tracer, profiler):
+                if search is None:
+                    write_search_index(pages, output_path)
+                else:
+                    search.set_titles(final_titles)
+                    writers.close()
+    return len(pages)
+
+
+@contextmanager
+def write_stage(
+    name: str, metrics: Metrics, tracer: TraceRecorder, profiler: StageProfiler
+) -> Iterator[None]:
+    with metrics.timer(name), tracer.span(name), profiler.stage("write"):
+        yield
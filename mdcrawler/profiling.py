@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from pathlib import Path
+from typing import Any
+
+from mdcrawler.options import PROFILE_MODES
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
+
+_NULL_STAGE: AbstractContextManager[None] = nullcontext()
+
+
+class StageProfiler:
+    """Collect cProfile stats per crawl stage or periodic tracemalloc snapshots.
+
+    ``mode`` is ``"cpu"``, ``"mem"`` or ``None`` (disabled). CPU profiles are kept per thread
+    and merged per stage on :meth:`close`, which writes ``<stage>.pstats`` files and a
+    ``report.txt`` with the top ``top`` functions into ``output_dir``. Python 3.12+ allows
+    only one active profiler per process, so there profiled stages of all threads run one at
+    a time: the profiles stay complete, at the cost of crawl concurrency.
+    """
+
+    def __init__(
+        self,
+        mode: str | None = None,
+        output_dir: Path = Path("profile"),
+        snapshot_every: int = 100,
+        top: int = 25,
+    ) -> None:
+        if mode is not None and mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode: {mode}")
+        self.mode = mode
+        self.output_dir = output_dir
+        self.snapshot_every = max(1, snapshot_every)
+        self.top = top
+        self.skipped: Counter[str] = Counter()
+        self._local = threading.local()
+        self._profiles: list[tuple[str, cProfile.Profile]] = []
+        self._lock = threading.Lock()
+        # Reentrant so a nested stage in the same thread falls through to ``skipped``.
+        self._exclusive: AbstractContextManager[Any] = (
+            threading.RLock() if sys.version_info >= (3, 12) else nullcontext()
+        )
+        self._pages = 0
+        if mode is not None:
+            output_dir.mkdir(parents=True, exist_ok=True)
+        if mode == "mem":
+            tracemalloc.start()
+
+    def stage(self, name: str) -> AbstractContextManager[None]:
+        if self.mode != "cpu":
+            return _NULL_STAGE
+        return self._profile_stage(name)
+
+    def page_done(self) -> None:
+        if self.mode != "mem":
+            return
+        with self._lock:
+            self._pages += 1
+            if self._pages % self.snapshot_every:
+                return
+            pages = self._pages
+        path = self.output_dir / f"memory-{pages:06d}.txt"
+        path.write_text(self._memory_report(), encoding="utf-8")
+
+    def close(self) -> None:
+        if self.mode == "cpu":
+            report = self._write_cpu_profiles()
+        elif self.mode == "mem":
+            report = self._memory_report()
+            tracemalloc.stop()
+        else:
+            return
+        report += f"\nPeak RSS: {peak_rss_bytes() / 1_048_576:.1f} MiB\n"
+        (self.output_dir / "report.txt").write_text(report, encoding="utf-8")
+
+    @contextmanager
+    def _profile_stage(self, name: str) -> Iterator[None]:
+        profiles: dict[str, cProfile.Profile] | None = getattr(self._local, "profiles", None)
+        if profiles is None:
+            profiles = self._local.profiles = {}
+        profile = profiles.get(name)
+        if profile is None:
+            profile = profiles[name] = cProfile.Profile()
+            with self._lock:
+                self._profiles.append((name, profile))
+        with self._exclusive:
+            try:
+                profile.enable()
+                enabled = True
+            except ValueError:
+                # Another profiler is already active (a nested stage, or one not ours).
+                enabled = False
+                with self._lock:
+                    self.skipped[name] += 1
+            try:
+                yield
+            finally:
+                if enabled:
+                    profile.disable()
+
+    def _write_cpu_profiles(self) -> str:
+        report = io.StringIO()
+        merged: dict[str, pstats.Stats] = {}
+        with self._lock:
+            profiles = list(self._profiles)
+        for name, profile in profiles:
+            if not profile.getstats():
+                continue
+            if name in merged:
+                merged[name].add(profile)
+            else:
+                merged[name] = pstats.Stats(profile, stream=report)
+        for name, stats in sorted(merged.items()):
+            stats.dump_stats(str(self.output_dir / f"{name}.pstats"))
+            report.write(f"=== {name} ===\n")
+            stats.sort_stats("cumulative").print_stats(self.top)
+        if self.skipped:
+            report.write("Calls not profiled because another profiler was active:\n")
+            for name, count in sorted(self.skipped.items()):
+                report.write(f"  {name}: {count}\n")
+        return report.getvalue()
+
+    def _memory_report(self) -> str:
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [
+            f"Pages: {self._pages}",
+            f"Traced memory: current {current / 1_048_576:.1f} MiB, peak {peak / 1_048_576:.1f} MiB",
+            f"Top {self.top} allocation sites:",
+        ]
+        for stat in snapshot.statistics("lineno")[: self.top]:
+            lines.append(f"  {stat}")
+        return "\n".join(lines) + "\n"
+
+
+def peak_rss_bytes() -> int:
+    """Peak resident set size of this process, or 0 where unsupported."""
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere.
+    return int(peak if sys.platform == "darwin" else peak * 1024)
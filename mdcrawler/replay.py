@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import gzip
+import json
+import mmap
+import os
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from mdcrawler.fetcher import Fetch
+
+RESPONSES_FILENAME = "responses.warc.gz"
+INDEX_FILENAME = "responses.index.jsonl"
+
+
+class NotRecordedError(requests.RequestException):
+    """Raised when replaying a URL that is not in the archive."""
+
+
+class ResponseRecorder:
+    """Append fetched responses to a WARC-like archive of gzip members plus a JSONL index.
+
+    Each record is its own gzip member holding a JSON header line followed by the body, so
+    the archive can be appended to across runs and still be read as one gzip stream.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        directory.mkdir(parents=True, exist_ok=True)
+        self._archive = (directory / RESPONSES_FILENAME).open("ab")
+        self._index = (directory / INDEX_FILENAME).open("a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> ResponseRecorder:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def wrap(self, fetch: Fetch) -> Fetch:
+        """Return a fetch function that records every response ``fetch`` produces."""
+
+        def fetch_and_record(url: str) -> requests.Response:
+            try:
+                response = fetch(url)
+            except requests.HTTPError as exc:
+                if exc.response is not None:
+                    self.record(url, exc.response)
+                raise
+            self.record(url, response)
+            return response
+
+        return fetch_and_record
+
+    def record(self, url: str, response: requests.Response) -> None:
+        header = {
+            "url": url,
+            "final_url": response.url or url,
+            "status": response.status_code,
+            "headers": dict(response.headers),
+            "recorded_at": time.time(),
+        }
+        payload = json.dumps(header).encode("utf-8") + b"\n" + response.content
+        member = gzip.compress(payload, compresslevel=6)
+        with self._lock:
+            offset = self._archive.tell()
+            self._archive.write(member)
+            self._archive.flush()
+            entry = {"url": url, "offset": offset, "length": len(member)}
+            self._index.write(json.dumps(entry) + "\n")
+            self._index.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._archive.close()
+            self._index.close()
+
+
+class ReplayFetcher:
+    """Serve responses from a recorded archive instead of the network."""
+
+    def __init__(self, directory: Path) -> None:
+        self.offsets: dict[str, tuple[int, int]] = {}
+        for entry in _read_index(directory):
+            # Later records win, so re-recording a URL replaces its earlier response.
+            self.offsets[entry["url"]] = (entry["offset"], entry["length"])
+        self._file = (directory / RESPONSES_FILENAME).open("rb")
+        # mmap cannot map an empty file; a recording without responses has nothing to serve.
+        self._mmap = (
+            mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if os.fstat(self._file.fileno()).st_size
+            else None
+        )
+
+    def __enter__(self) -> ReplayFetcher:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def fetch(self, url: str) -> requests.Response:
+        location = self.offsets.get(url)
+        if location is None or self._mmap is None:
+            raise NotRecordedError(f"Not recorded: {url}")
+        offset, length = location
+        header_line, body = gzip.decompress(self._mmap[offset : offset + length]).split(b"\n", 1)
+        header = json.loads(header_line)
+        response = requests.Response()
+        response.url = header["final_url"]
+        response.status_code = header["status"]
+        response.headers = CaseInsensitiveDict(header["headers"])
+        response._content = body
+        response.raise_for_status()
+        return response
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
+
+
+def recorded_start_url(directory: Path) -> str | None:
+    """The first URL recorded in ``directory``, i.e. the start URL of the recorded crawl."""
+    for entry in _read_index(directory):
+        return str(entry["url"])
+    return None
+
+
+def _read_index(directory: Path) -> Iterator[dict[str, Any]]:
+    with (directory / INDEX_FILENAME).open(encoding="utf-8") as index:
+        for line in index:
+            if line.strip():
+                yield json.loads(line)
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from mdcrawler.chunking import iter_chunks
+
+# Querying (``mdcrawler search``) must not pay for the crawler's bs4/requests imports.
+if TYPE_CHECKING:
+    from mdcrawler.crawler import Page
+
+SEARCH_INDEX_FILENAME = "search.sqlite"
+HEADING_SEPARATOR = " > "
+
+_SCHEMA = """
+CREATE VIRTUAL TABLE documents USING fts5(
+    url UNINDEXED,
+    kind UNINDEXED,
+    title,
+    heading_path,
+    body,
+    tokenize = 'unicode61'
+)
+"""
+
+
+@dataclass
+class SearchHit:
+    url: str
+    kind: str
+    title: str
+    heading_path: str
+    snippet: str
+    score: float
+
+
+def write_search_index(pages: Iterable[Page], output_dir: Path) -> None:
+    with SearchIndexWriter(output_dir) as writer:
+        for page in pages:
+            writer.add_page(page)
+
+
+class SearchIndexWriter:
+    """Build an FTS5 index over pages and their heading sections in batched transactions."""
+
+    def __init__(self, output_dir: Path, batch_size: int = 200) -> None:
+        self.path = output_dir / SEARCH_INDEX_FILENAME
+        self.path.unlink(missing_ok=True)
+        self.batch_size = max(1, batch_size)
+        self._connection = sqlite3.connect(self.path)
+        self._connection.execute("PRAGMA journal_mode = OFF")
+        self._connection.execute("PRAGMA synchronous = OFF")
+        self._connection.execute(_SCHEMA)
+        self._rows: list[tuple[str, str, str, str, str]] = []
+        self._pending_pages = 0
+        self._titles: dict[str, str] = {}
+        self._final_titles: dict[str, str] = {}
+
+    def __enter__(self) -> SearchIndexWriter:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def add_page(self, page: Page) -> None:
+        from mdcrawler.markdown_writer import render_markdown
+
+        markdown = render_markdown(page, image_prefix="images/")
+        self._rows.append((page.url, "page", page.title, "", markdown))
+        for chunk in iter_chunks(markdown):
+            heading_path = HEADING_SEPARATOR.join(chunk.heading_path)
+            self._rows.append((page.url, "section", page.title, heading_path, chunk.text))
+        self._titles[page.url] = page.title
+        self._pending_pages += 1
+        if self._pending_pages >= self.batch_size:
+            self.flush()
+
+    def set_titles(self, titles: Mapping[str, str]) -> None:
+        """Record final ``titles`` to replace the ones pages were added with on :meth:`close`."""
+        self._final_titles = dict(titles)
+
+    def flush(self) -> None:
+        if not self._rows:
+            return
+        with self._connection:
+            self._connection.executemany(
+                "INSERT INTO documents (url, kind, title, heading_path, body) "
+                "VALUES (?, ?, ?, ?, ?)",
+                self._rows,
+            )
+        self._rows = []
+        self._pending_pages = 0
+
+    def close(self) -> None:
+        self.flush()
+        changed = [
+            (url, title)
+            for url, title in self._final_titles.items()
+            if self._titles.get(url, title) != title
+        ]
+        with self._connection:
+            if changed:
+                # ``url`` is not indexed, so one joined UPDATE scans the table once in total.
+                self._connection.execute(
+                    "CREATE TEMP TABLE final_titles (url TEXT PRIMARY KEY, title TEXT)"
+                )
+                self._connection.executemany("INSERT INTO final_titles VALUES (?, ?)", changed)
+                self._connection.execute(
+                    "UPDATE documents SET title = "
+                    "(SELECT title FROM final_titles WHERE final_titles.url = documents.url) "
+                    "WHERE url IN (SELECT url FROM final_titles)"
+                )
+            self._connection.execute("INSERT INTO documents (documents) VALUES ('optimize')")
+        self._connection.close()
+
+
+def quote_query(query: str) -> str:
+    """Turn free text into an FTS5 query matching every word literally (``C++``, ``foo-bar``)."""
+    return " ".join('"' + term.replace('"', '""') + '"' for term in query.split())
+
+
+def search(
+    index_path: Path,
+    query: str,
+    limit: int = 10,
+    kind: str | None = "section",
+    raw: bool = False,
+) -> list[SearchHit]:
+    """Return hits for ``query`` ordered by bm25 rank (best first).
+
+    The query's words are matched literally unless ``raw`` is set, in which case it is passed
+    to FTS5 as is (``AND``/``OR``, ``prefix*``, ``NEAR``) and a malformed query raises
+    :class:`sqlite3.OperationalError`.
+    """
+    if not raw:
+        query = quote_query(query)
+        if not query:
+            return []
+    sql = (
+        "SELECT url, kind, title, heading_path, "
+        "snippet(documents, 4, '[', ']', '…', 16), bm25(documents) AS score "
+        "FROM documents WHERE documents MATCH ?"
+    )
+    params: list[str | int] = [query]
+    if kind is not None:
+        sql += " AND kind = ?"
+        params.append(kind)
+    sql += " ORDER BY score LIMIT ?"
+    params.append(limit)
+    connection = sqlite3.connect(f"file:{index_path}?mode=ro", uri=True)
+    try:
+        rows = connection.execute(sql, params).fetchall()
+    finally:
+        connection.close()
+    return [SearchHit(*row) for row in rows]
@@ -0,0 +1,375 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import ThreadingMixIn, UnixStreamServer
+from typing import Any
+
+import requests
+
+from mdcrawler.cli import _add_extraction_arguments, _parse_blacklists
+from mdcrawler.content_extractor import (
+    DEFAULT_ATTR_BLACKLIST,
+    DEFAULT_TAG_BLACKLIST,
+    ExtractedContent,
+    extract_content,
+)
+from mdcrawler.crawler import derive_prefix
+from mdcrawler.fetcher import RequestsBackend
+from mdcrawler.metrics import Metrics
+from mdcrawler.options import MAX_RESPONSE_BYTES, REQUEST_DEADLINE
+
+_MAX_BODY_BYTES = 32 * 1024 * 1024
+
+
+@dataclass(frozen=True)
+class ExtractionProfile:
+    """Extraction options normalized once at startup and shared by every request."""
+
+    tag_blacklist: list[str] = field(default_factory=lambda: list(DEFAULT_TAG_BLACKLIST))
+    attr_blacklist: list[str] = field(default_factory=lambda: list(DEFAULT_ATTR_BLACKLIST))
+    include_images: bool = False
+
+    @classmethod
+    def from_options(
+        cls,
+        tag_blacklist: list[str] | None,
+        attr_blacklist: list[str] | None,
+        include_images: bool,
+    ) -> ExtractionProfile:
+        """Build a profile from parsed CLI options; ``None`` keeps the default blacklist."""
+        return cls(
+            tag_blacklist=sorted({tag.lower() for tag in tag_blacklist or DEFAULT_TAG_BLACKLIST}),
+            attr_blacklist=[item.lower() for item in attr_blacklist or DEFAULT_ATTR_BLACKLIST],
+            include_images=include_images,
+        )
+
+
+class ServiceError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class _ResultCache:
+    """Thread-safe LRU of response documents with an optional per-entry TTL."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Any, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Any, value: dict[str, Any], ttl: float | None = None) -> None:
+        if self.max_entries <= 0:
+            return
+        expires = time.monotonic() + ttl if ttl is not None else float("inf")
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class ExtractionService:
+    """Extract HTML blobs or fetched URLs to Markdown with warm pools and a result cache.
+
+    With ``workers`` > 0, extraction runs in a process pool that is started (and has imported
+    the extractor) before the first request; otherwise it runs on the request thread. ``/fetch``
+    goes through a pooled :class:`~mdcrawler.fetcher.RequestsBackend` with up to ``sessions``
+    keep-alive connections per host, so ``max_bytes`` and ``deadline`` bound every response.
+    """
+
+    def __init__(
+        self,
+        profile: ExtractionProfile | None = None,
+        workers: int = 0,
+        sessions: int = 8,
+        cache_size: int = 0,
+        cache_ttl: float = 300.0,
+        timeout: float = 15.0,
+        max_bytes: int = MAX_RESPONSE_BYTES,
+        deadline: float | None = REQUEST_DEADLINE,
+    ) -> None:
+        self.profile = profile or ExtractionProfile()
+        self.metrics = Metrics()
+        self.cache = _ResultCache(cache_size)
+        self.cache_ttl = cache_ttl
+        self._backend = RequestsBackend(
+            timeout, pool_size=max(1, sessions), max_bytes=max_bytes, deadline=deadline
+        )
+        self._executor: ProcessPoolExecutor | None = None
+        if workers > 0:
+            self._executor = ProcessPoolExecutor(max_workers=workers)
+            # Start every worker process (and its bs4 import) before the first request arrives.
+            warm = [
+                self._executor.submit(_extract, "<p></p>", "http://warm/", "", self.profile)
+                for _ in range(workers)
+            ]
+            for future in warm:
+                future.result()
+
+    def extract(self, html: str, url: str, prefix: str | None = None) -> dict[str, Any]:
+        prefix = prefix or derive_prefix(url)
+        key = ("extract", hashlib.sha256(html.encode("utf-8")).hexdigest(), url, prefix)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+        document = self._extract(html, url, prefix)
+        self.cache.put(key, document)
+        return {**document, "cached": False}
+
+    def fetch(self, url: str, prefix: str | None = None) -> dict[str, Any]:
+        prefix = prefix or derive_prefix(url)
+        key = ("fetch", url, prefix)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+        try:
+            with self.metrics.timer("fetch"):
+                response = self._backend.fetch(url)
+        except requests.RequestException as exc:
+            self.metrics.incr(f"errors.{type(exc).__name__}")
+            raise ServiceError(502, f"fetch failed: {exc}") from exc
+        document = {**self._extract(response.text, response.url, prefix), "final_url": response.url}
+        self.cache.put(key, document, ttl=self.cache_ttl)
+        return {**document, "cached": False}
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+        self._backend.close()
+
+    def _cached(self, key: Any) -> dict[str, Any] | None:
+        if self.cache.max_entries <= 0:
+            return None
+        document = self.cache.get(key)
+        self.metrics.incr("cache.hit" if document is not None else "cache.miss")
+        return {**document, "cached": True} if document is not None else None
+
+    def _extract(self, html: str, url: str, prefix: str) -> dict[str, Any]:
+        self.metrics.observe("html.chars", len(html))
+        with self.metrics.timer("extract"):
+            if self._executor is not None:
+                content = self._executor.submit(_extract, html, url, prefix, self.profile).result()
+            else:
+                content = _extract(html, url, prefix, self.profile)
+        markdown = content.markdown
+        for image in content.images:
+            markdown = markdown.replace(image.token, f"![{image.alt or 'Image'}]({image.url})")
+        return {
+            "url": url,
+            "title": content.title,
+            "markdown": markdown,
+            "discovered_urls": content.discovered_urls,
+            "images": [{"url": image.url, "alt": image.alt} for image in content.images],
+        }
+
+
+def _extract(html: str, url: str, prefix: str, profile: ExtractionProfile) -> ExtractedContent:
+    return extract_content(
+        html,
+        url,
+        prefix,
+        include_images=profile.include_images,
+        tag_blacklist=profile.tag_blacklist,
+        attr_blacklist=profile.attr_blacklist,
+    )
+
+
+def _make_handler(service: ExtractionService) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:  # noqa: N802 - http.server naming
+            if self.path == "/metrics":
+                self._send(200, service.metrics.snapshot())
+            elif self.path == "/health":
+                self._send(200, {"status": "ok"})
+            else:
+                self._send(404, {"error": f"unknown path: {self.path}"})
+
+        def do_POST(self) -> None:  # noqa: N802 - http.server naming
+            route = self.path.strip("/") if self.path in ("/extract", "/fetch") else "other"
+            with service.metrics.timer(f"request.{route}"):
+                try:
+                    request = self._read_json()
+                    prefix = (
+                        _field(request, "prefix") if request.get("prefix") is not None else None
+                    )
+                    if route == "extract":
+                        document = service.extract(
+                            _field(request, "html"), _field(request, "url"), prefix
+                        )
+                    elif route == "fetch":
+                        document = service.fetch(_field(request, "url"), prefix)
+                    else:
+                        raise ServiceError(404, f"unknown path: {self.path}")
+                except ServiceError as exc:
+                    service.metrics.incr(f"http.{exc.status}")
+                    self._send(exc.status, {"error": str(exc)})
+                    return
+                except Exception as exc:
+                    service.metrics.incr("http.500")
+                    self._send(500, {"error": f"{type(exc).__name__}: {exc}"})
+                    return
+                self._send(200, document)
+
+        def log_message(self, format: str, *args: object) -> None:
+            return
+
+        def _read_json(self) -> dict[str, Any]:
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+            except ValueError:
+                length = -1
+            # The body is left unread in both cases, so the connection cannot be reused.
+            if length < 0:
+                self.close_connection = True
+                raise ServiceError(400, "invalid Content-Length")
+            if length > _MAX_BODY_BYTES:
+                self.close_connection = True
+                raise ServiceError(413, "request body too large")
+            try:
+                request = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError as exc:
+                raise ServiceError(400, f"invalid JSON: {exc}") from exc
+            if not isinstance(request, dict):
+                raise ServiceError(400, "request body must be a JSON object")
+            return request
+
+        def _send(self, status: int, document: dict[str, Any]) -> None:
+            body = json.dumps(document).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            if self.close_connection:
+                self.send_header("Connection", "close")
+            self.end_headers()
+            self.wfile.write(body)
+
+    return Handler
+
+
+def _field(request: dict[str, Any], name: str) -> str:
+    value = request.get(name)
+    if not isinstance(value, str) or not value:
+        raise ServiceError(400, f"missing string field: {name}")
+    return value
+
+
+class _ThreadingUnixHTTPServer(ThreadingMixIn, UnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self) -> tuple[Any, Any]:
+        connection, _ = super().get_request()
+        # BaseHTTPRequestHandler expects an (host, port)-style client address.
+        return connection, ("unix", 0)
+
+
+def make_server(
+    service: ExtractionService,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    socket_path: str | None = None,
+) -> ThreadingHTTPServer | _ThreadingUnixHTTPServer:
+    """Bind the service to a TCP port or, with ``socket_path``, a Unix domain socket."""
+    handler = _make_handler(service)
+    if socket_path is not None:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        return _ThreadingUnixHTTPServer(socket_path, handler)
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def serve_main(argv: list[str]) -> int:
+    """Run the extraction service until interrupted."""
+    parser = argparse.ArgumentParser(
+        prog="mdcrawler serve",
+        description="Serve POST /extract, POST /fetch and GET /metrics over HTTP.",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind. Default: 127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765, help="TCP port. Default: 8765")
+    parser.add_argument("--socket", help="Listen on this Unix domain socket instead of TCP.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Extraction processes (0 extracts on the request threads). Default: 0",
+    )
+    parser.add_argument(
+        "--sessions",
+        type=int,
+        default=8,
+        help="Keep-alive connections per host for /fetch. Default: 8",
+    )
+    parser.add_argument(
+        "--max-response-bytes",
+        type=int,
+        default=MAX_RESPONSE_BYTES,
+        help=f"Reject /fetch responses that decode to more bytes. Default: {MAX_RESPONSE_BYTES}",
+    )
+    parser.add_argument(
+        "--request-deadline",
+        type=float,
+        default=REQUEST_DEADLINE,
+        help=f"Seconds a /fetch response may take in total. Default: {REQUEST_DEADLINE:g}",
+    )
+    parser.add_argument(
+        "--cache-size", type=int, default=0, help="Cached results (0 disables). Default: 0"
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=300.0,
+        help="Seconds to cache /fetch results. Default: 300",
+    )
+    _add_extraction_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.max_response_bytes <= 0 or args.request_deadline <= 0:
+        parser.error("--max-response-bytes and --request-deadline must be positive")
+
+    profile = ExtractionProfile.from_options(*_parse_blacklists(args), args.include_images)
+    service = ExtractionService(
+        profile,
+        workers=args.workers,
+        sessions=args.sessions,
+        cache_size=args.cache_size,
+        cache_ttl=args.cache_ttl,
+        max_bytes=args.max_response_bytes,
+        deadline=args.request_deadline,
+    )
+    server = make_server(service, args.host, args.port, args.socket)
+    if isinstance(server, ThreadingHTTPServer):
+        print(f"Serving on http://{args.host}:{server.server_port}", flush=True)
+    else:
+        print(f"Serving on {args.socket}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+    return 0
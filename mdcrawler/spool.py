@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import tempfile
+import threading
+import zlib
+from pathlib import Path
+
+from mdcrawler.crawler import Page
+from mdcrawler.options import SPILL_MODES
+
+
+class BodySpool:
+    """Compressed storage for page bodies so a crawl keeps only page metadata resident.
+
+    ``mode="memory"`` keeps each body as a zlib-compressed bytes object; ``mode="disk"``
+    appends it to an anonymous temporary file (in ``directory`` if given) and keeps only its
+    offset and length.
+    """
+
+    def __init__(self, mode: str = "memory", directory: Path | None = None) -> None:
+        if mode not in SPILL_MODES:
+            raise ValueError(f"Unknown spill mode: {mode}")
+        self.mode = mode
+        self.stored_bytes = 0
+        self._blobs: list[bytes] = []
+        self._file = tempfile.TemporaryFile(dir=directory) if mode == "disk" else None
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> BodySpool:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def spill(self, page: Page) -> Page:
+        """Return a page that reads its Markdown back from the spool on access."""
+        if isinstance(page, SpilledPage):
+            return page
+        return SpilledPage(page, self, *self.store(page.markdown))
+
+    def store(self, text: str) -> tuple[int, int]:
+        """Compress and store ``text``; returns the ``(offset, length)`` to :meth:`read` it."""
+        data = zlib.compress(text.encode("utf-8"), 6)
+        with self._lock:
+            if self._file is None:
+                offset = len(self._blobs)
+                self._blobs.append(data)
+            else:
+                offset = self._file.seek(0, 2)
+                self._file.write(data)
+            self.stored_bytes += len(data)
+        return offset, len(data)
+
+    def read(self, offset: int, length: int) -> str:
+        with self._lock:
+            if self._file is None:
+                data = self._blobs[offset]
+            else:
+                self._file.seek(offset)
+                data = self._file.read(length)
+        return zlib.decompress(data).decode("utf-8")
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        self._blobs.clear()
+
+
+class SpilledPage(Page):
+    """A :class:`Page` whose ``markdown`` lives in a :class:`BodySpool` until it is read."""
+
+    __slots__ = ("_spool", "_offset", "_length")
+
+    def __init__(self, page: Page, spool: BodySpool, offset: int, length: int) -> None:
+        for name in Page.__slots__:
+            if name != "markdown":
+                setattr(self, name, getattr(page, name))
+        self._spool = spool
+        self._offset = offset
+        self._length = length
+
+    @property  # type: ignore[override]
+    def markdown(self) -> str:
+        return self._spool.read(self._offset, self._length)
+
+    @markdown.setter
+    def markdown(self, value: str) -> None:
+        self._offset, self._length = self._spool.store(value)
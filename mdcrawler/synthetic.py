@@ -0,0 +1,321 @@
+from __future__ import annotations
+
+import argparse
+import random
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, fields
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PAGE_KINDS = (
+    "long_list",
+    "deep_nesting",
+    "big_table",
+    "code_blocks",
+    "images",
+    "nav_sidebar",
+    "mixed",
+)
+
+_WORDS = (
+    "install configure request response client server token cache header payload "
+    "deploy module package function argument return value error retry timeout "
+    "session cookie schema field index query result page section example"
+).split()
+
+
+def generate_page(kind: str, scale: float = 1.0, seed: int = 0) -> str:
+    """Build a deterministic, pathological-but-realistic documentation page.
+
+    ``scale`` multiplies the size of the dominant structure (1.0 gives e.g. a 10k-item list
+    or a 500-row table).
+    """
+    try:
+        builder = _BUILDERS[kind]
+    except KeyError:
+        raise ValueError(f"Unknown page kind: {kind}") from None
+    rng = random.Random(f"{kind}:{seed}")
+    body = builder(rng, scale)
+    return (
+        "<!DOCTYPE html><html><head>"
+        f"<title>{kind.replace('_', ' ').title()} - Synthetic Docs</title>"
+        "</head><body>"
+        f"{_nav(rng, 40)}"
+        f"<main><h1>{_sentence(rng, 4)}</h1>{body}</main>"
+        "<footer><p>Edit this page</p><p>Was this page helpful?</p></footer>"
+        "</body></html>"
+    )
+
+
+def generate_corpus(scale: float = 1.0, seed: int = 0) -> dict[str, str]:
+    return {kind: generate_page(kind, scale=scale, seed=seed) for kind in PAGE_KINDS}
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize()
+
+
+def _paragraph(rng: random.Random) -> str:
+    return f"<p>{_sentence(rng, rng.randint(12, 40))}.</p>"
+
+
+def _count(base: int, scale: float) -> int:
+    return max(1, int(base * scale))
+
+
+def _nav(rng: random.Random, links: int) -> str:
+    items = "".join(
+        f'<li><a href="/docs/{rng.choice(_WORDS)}-{i}">{_sentence(rng, 2)}</a></li>'
+        for i in range(links)
+    )
+    return f'<nav class="sidebar"><ul>{items}</ul></nav>'
+
+
+def _long_list(rng: random.Random, scale: float) -> str:
+    items = "".join(
+        f"<li>{_sentence(rng, 6)} <code>{rng.choice(_WORDS)}</code></li>"
+        for _ in range(_count(10_000, scale))
+    )
+    return f"<ul>{items}</ul>"
+
+
+def _deep_nesting(rng: random.Random, scale: float) -> str:
+    depth = _count(200, scale)
+    opening = "".join(f'<div class="wrapper-{i}">' for i in range(depth))
+    closing = "</div>" * depth
+    return f"{opening}{''.join(_paragraph(rng) for _ in range(20))}{closing}"
+
+
+def _big_table(rng: random.Random, scale: float) -> str:
+    header = "<tr>" + "".join(f"<th>{rng.choice(_WORDS)}</th>" for _ in range(6)) + "</tr>"
+    rows = "".join(
+        "<tr>" + "".join(f"<td>{_sentence(rng, 3)}</td>" for _ in range(6)) + "</tr>"
+        for _ in range(_count(500, scale))
+    )
+    return f"<table>{header}{rows}</table>"
+
+
+def _code_blocks(rng: random.Random, scale: float) -> str:
+    blocks = []
+    for _ in range(_count(300, scale)):
+        code = "\n".join(
+            f"{rng.choice(_WORDS)} = {rng.choice(_WORDS)}({rng.randint(0, 99)})"
+            for _ in range(rng.randint(3, 15))
+        )
+        blocks.append(f'{_paragraph(rng)}<div class="code"><pre><code>{code}</code></pre></div>')
+    return "".join(blocks)
+
+
+def _images(rng: random.Random, scale: float) -> str:
+    parts = []
+    for i in range(_count(300, scale)):
+        parts.append(
+            f'<picture><img src="/img/{rng.choice(_WORDS)}-{i}.png" alt="{_sentence(rng, 2)}"/>'
+            "</picture>"
+        )
+        if i % 3 == 0:
+            parts.append(f"<div style=\"background-image: url('/img/bg-{i}.jpg')\">Hero</div>")
+        parts.append(_paragraph(rng))
+    return "".join(parts)
+
+
+def _nav_sidebar(rng: random.Random, scale: float) -> str:
+    return (
+        f'<aside class="toc">{_nav(rng, _count(2_000, scale))}</aside>'
+        f'<div id="sidebar-navigation">{_nav(rng, _count(2_000, scale))}</div>'
+        f"{''.join(_paragraph(rng) for _ in range(30))}"
+    )
+
+
+def _mixed(rng: random.Random, scale: float) -> str:
+    sub = scale / 10
+    return "".join(
+        [
+            f"<h2>{_sentence(rng, 3)}</h2>",
+            _long_list(rng, sub),
+            f"<h2>{_sentence(rng, 3)}</h2>",
+            _big_table(rng, sub),
+            f"<h2>{_sentence(rng, 3)}</h2>",
+            _code_blocks(rng, sub),
+            _images(rng, sub),
+            f"<details><summary>{_sentence(rng, 3)}</summary>{_paragraph(rng)}</details>",
+        ]
+    )
+
+
+_BUILDERS: dict[str, Callable[[random.Random, float], str]] = {
+    "long_list": _long_list,
+    "deep_nesting": _deep_nesting,
+    "big_table": _big_table,
+    "code_blocks": _code_blocks,
+    "images": _images,
+    "nav_sidebar": _nav_sidebar,
+    "mixed": _mixed,
+}
+
+
+# Smallest valid PNG (1x1 transparent pixel).
+_PNG_PIXEL = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6300010000050001"
+    "0d0a2db40000000049454e44ae426082"
+)
+
+
+@dataclass
+class SiteConfig:
+    """Shape of a synthetic documentation site served by :class:`SyntheticSite`."""
+
+    pages: int = 200
+    fanout: int = 5
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    page_kind: str = "code_blocks"
+    page_scale: float = 0.05
+    images: int = 2
+    seed: int = 0
+
+
+class SyntheticSite:
+    """Serve a synthetic docs site on localhost from a background thread.
+
+    Pages live at ``/docs/page-N``; each links to the next page plus ``fanout - 1``
+    pseudo-random others so the whole site is reachable from ``start_url``.
+    """
+
+    def __init__(self, config: SiteConfig | None = None, host: str = "127.0.0.1") -> None:
+        self.config = config or SiteConfig()
+        self._random = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self._server = ThreadingHTTPServer((host, 0), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    @property
+    def start_url(self) -> str:
+        return f"{self.base_url}/docs/page-0"
+
+    @property
+    def prefix(self) -> str:
+        return f"{self.base_url}/docs/"
+
+    def __enter__(self) -> SyntheticSite:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def page(self, index: int) -> str:
+        config = self.config
+        rng = random.Random(f"site:{config.seed}:{index}")
+        targets = [(index + 1) % config.pages]
+        targets += [rng.randrange(config.pages) for _ in range(max(0, config.fanout - 1))]
+        links = "".join(f'<li><a href="/docs/page-{t}">Page {t}</a></li>' for t in targets)
+        body = _BUILDERS[config.page_kind](rng, config.page_scale)
+        body += "".join(
+            f'<p><img src="/img/page-{index}-{i}.png" alt="Figure {i}"/></p>'
+            for i in range(config.images)
+        )
+        return (
+            "<!DOCTYPE html><html><head>"
+            f"<title>Page {index} - Synthetic Docs</title></head><body>"
+            f"{_nav(rng, 20)}"
+            f"<main><h1>Page {index}</h1><ul>{links}</ul>{body}</main>"
+            "</body></html>"
+        )
+
+    def respond(self, path: str) -> tuple[int, str, bytes]:
+        config = self.config
+        with self._lock:
+            self.requests += 1
+            delay = max(0.0, config.latency + self._random.uniform(-config.jitter, config.jitter))
+            roll = self._random.random()
+        if delay:
+            time.sleep(delay)
+        if roll < config.error_rate:
+            return 500, "text/plain", b"synthetic error"
+        if roll < config.error_rate + config.throttle_rate:
+            return 429, "text/plain", b"slow down"
+        if path.startswith("/img/"):
+            return 200, "image/png", _PNG_PIXEL
+        if path.startswith("/docs/page-"):
+            suffix = path[len("/docs/page-") :]
+            if suffix.isdigit() and int(suffix) < config.pages:
+                return 200, "text/html; charset=utf-8", self.page(int(suffix)).encode("utf-8")
+        return 404, "text/plain", b"not found"
+
+
+def _make_handler(site: SyntheticSite) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:  # noqa: N802 - http.server naming
+            status, content_type, body = site.respond(self.path.split("?", 1)[0])
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: object) -> None:
+            return
+
+    return Handler
+
+
+def add_site_arguments(parser: argparse.ArgumentParser, prefix: str = "") -> None:
+    """Add one ``--<prefix><field>`` option per :class:`SiteConfig` field."""
+    defaults = SiteConfig()
+    for field in fields(SiteConfig):
+        default = getattr(defaults, field.name)
+        parser.add_argument(
+            f"--{prefix}{field.name.replace('_', '-')}",
+            dest=f"site_{field.name}",
+            type=type(default),
+            default=default,
+            help=f"Synthetic site {field.name.replace('_', ' ')}. Default: {default}",
+        )
+
+
+def site_config_from_args(args: argparse.Namespace) -> SiteConfig:
+    return SiteConfig(
+        **{field.name: getattr(args, f"site_{field.name}") for field in fields(SiteConfig)}
+    )
+
+
+def site_arguments(config: SiteConfig) -> list[str]:
+    """Command-line arguments that reproduce ``config`` for :func:`main`."""
+    argv: list[str] = []
+    for field in fields(SiteConfig):
+        argv += [f"--{field.name.replace('_', '-')}", str(getattr(config, field.name))]
+    return argv
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Serve a synthetic site until interrupted; prints the start URL on the first line."""
+    parser = argparse.ArgumentParser(description="Serve a synthetic documentation site.")
+    add_site_arguments(parser)
+    args = parser.parse_args(argv)
+    with SyntheticSite(site_config_from_args(args)) as site:
+        print(site.start_url, flush=True)
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
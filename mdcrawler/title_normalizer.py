@@ -54,3 +54,76 @@ def _strip_affixes(title: str, prefix: str | None, suffix: str | None) -> str:
     if suffix and cleaned.endswith(suffix):
         cleaned = cleaned[: -len(suffix)].rstrip(" -|–")
     return cleaned.strip() or title
+
+
+class TitleNormalizer:
+    """Normalize titles as pages stream in, learning affixes from the first titles seen.
+
+    Site-wide affixes are inferred from the first ``sample_size`` titles. Titles are also
+    grouped into sections by the first path segment below ``prefix``; once a section has
+    ``min_section_titles`` sampled titles, affixes shared within it (e.g. "API Reference") are
+    stripped after the site-wide ones. :meth:`add` returns a provisional title using what has
+    been learned so far; :meth:`finalize` re-normalizes every added title with the final
+    statistics, keeping only ``url -> raw title`` in memory.
+    """
+
+    def __init__(
+        self, prefix: str = "", sample_size: int = 200, min_section_titles: int = 3
+    ) -> None:
+        self.prefix = prefix
+        self.sample_size = sample_size
+        self.min_section_titles = max(2, min_section_titles)
+        self._sample: list[str] = []
+        self._sections: dict[str, list[str]] = {}
+        self._affixes: tuple[str | None, str | None] | None = None
+        self._section_affixes: dict[str, tuple[str | None, str | None]] = {}
+        self._raw: dict[str, str] = {}
+
+    def add(self, url: str, title: str) -> str:
+        """Learn from ``title`` (while sampling) and return its provisional normalized form."""
+        self._raw[url] = title
+        section = self._section(url)
+        if len(self._sample) < self.sample_size:
+            self._sample.append(title)
+            self._affixes = None
+            self._section_affixes.clear()
+        sampled = self._sections.setdefault(section, [])
+        if len(sampled) < self.sample_size:
+            sampled.append(title)
+            self._section_affixes.pop(section, None)
+        return self.normalize(url, title)
+
+    def normalize(self, url: str, title: str) -> str:
+        """Normalize ``title`` with the current statistics without learning from it."""
+        if self._affixes is None:
+            self._affixes = _infer_common_affixes(self._sample) if self._sample else (None, None)
+        cleaned = _strip_affixes(title, *self._affixes)
+        section = self._section(url)
+        if section:
+            cleaned = _strip_affixes(cleaned, *self._affixes_for(section, self._affixes))
+        return cleaned
+
+    def finalize(self) -> dict[str, str]:
+        """Consistency pass: the final normalized title of every URL passed to :meth:`add`."""
+        return {url: self.normalize(url, title) for url, title in self._raw.items()}
+
+    def _affixes_for(
+        self, section: str, site_affixes: tuple[str | None, str | None]
+    ) -> tuple[str | None, str | None]:
+        affixes = self._section_affixes.get(section)
+        if affixes is None:
+            sampled = self._sections.get(section, [])
+            stripped = [_strip_affixes(title, *site_affixes) for title in sampled]
+            # Only titles that still have separators can carry a section affix.
+            compound = [title for title in stripped if len(_split_title(title)) > 1]
+            affixes = (None, None)
+            if len(compound) >= self.min_section_titles:
+                affixes = _infer_common_affixes(compound)
+            self._section_affixes[section] = affixes
+        return affixes
+
+    def _section(self, url: str) -> str:
+        if not url.startswith(self.prefix):
+            return ""
+        segments = url[len(self.prefix) :].split("?", 1)[0].strip("/").split("/")
+        return segments[0] if len(segments) > 1 else ""
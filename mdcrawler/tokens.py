@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+
+TokenCounter = Callable[[str], int]
+
+# Typical BPE tokenizers average roughly four characters per token on English prose.
+_CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate that avoids loading a real tokenizer."""
+    if not text:
+        return 0
+    return (len(text) + _CHARS_PER_TOKEN - 1) // _CHARS_PER_TOKEN
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from pathlib import Path
+from typing import Any
+
+_NULL_SPAN: AbstractContextManager[None] = nullcontext()
+
+
+class TraceRecorder:
+    """Record crawl spans as Chrome trace events (viewable in Perfetto or chrome://tracing).
+
+    Each thread appends to its own buffer, so recording takes no lock after a thread's first
+    event. A disabled recorder hands out a shared no-op context manager.
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self._origin = time.perf_counter_ns()
+        self._pid = os.getpid()
+        self._local = threading.local()
+        self._buffers: list[tuple[int, str, list[dict[str, Any]]]] = []
+        self._lock = threading.Lock()
+
+    def span(self, name: str, **args: Any) -> AbstractContextManager[None]:
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._span(name, args)
+
+    def instant(self, name: str, **args: Any) -> None:
+        if not self.enabled:
+            return
+        self._buffer().append({"name": name, "ph": "i", "s": "t", "ts": self._now(), "args": args})
+
+    def events(self) -> list[dict[str, Any]]:
+        with self._lock:
+            buffers = list(self._buffers)
+        events: list[dict[str, Any]] = []
+        for tid, thread_name, buffer in buffers:
+            events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": self._pid,
+                    "tid": tid,
+                    "args": {"name": thread_name},
+                }
+            )
+            events.extend({**event, "pid": self._pid, "tid": tid} for event in buffer)
+        return events
+
+    def write(self, path: Path) -> None:
+        trace = {"traceEvents": self.events(), "displayTimeUnit": "ms"}
+        path.write_text(json.dumps(trace), encoding="utf-8")
+
+    @contextmanager
+    def _span(self, name: str, args: dict[str, Any]) -> Iterator[None]:
+        start = self._now()
+        try:
+            yield
+        finally:
+            self._buffer().append(
+                {"name": name, "ph": "X", "ts": start, "dur": self._now() - start, "args": args}
+            )
+
+    def _buffer(self) -> list[dict[str, Any]]:
+        buffer: list[dict[str, Any]] | None = getattr(self._local, "buffer", None)
+        if buffer is None:
+            buffer = self._local.buffer = []
+            thread = threading.current_thread()
+            with self._lock:
+                self._buffers.append((threading.get_native_id(), thread.name, buffer))
+        return buffer
+
+    def _now(self) -> float:
+        return (time.perf_counter_ns() - self._origin) / 1000
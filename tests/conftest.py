@@ -1,8 +1,26 @@
 from __future__ import annotations
 
 import sys
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+from mdcrawler.crawler import Page  # noqa: E402 - needs ROOT on sys.path
+
+
+@dataclass
+class FakeResponse:
+    """Stands in for ``requests.Response`` in fetch fakes; only ``text`` is read."""
+
+    text: str
+
+
+def make_page(slug: str, markdown: str = "", **fields: Any) -> Page:
+    """A page at ``https://example.com/docs/<slug>`` titled after the slug."""
+    fields.setdefault("title", slug.title())
+    fields.setdefault("images", [])
+    return Page(url=f"https://example.com/docs/{slug}", markdown=markdown, **fields)
@@ -0,0 +1,28 @@
+from pathlib import Path
+
+import pytest
+
+from mdcrawler.archive import Archive, write_archive
+from mdcrawler.crawler import Page
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_archive_round_trip_by_url_and_slug(tmp_path: Path, compress: bool) -> None:
+    pages = [
+        Page(url="https://example.com/docs/a", title="A", markdown="# A\n\nalpha\n", images=[]),
+        Page(url="https://example.com/docs/b", title="B", markdown="# B\n\nbeta ü\n", images=[]),
+    ]
+
+    write_archive(pages, tmp_path, compress=compress)
+
+    with Archive(tmp_path) as archive:
+        assert len(archive) == 2
+        assert "https://example.com/docs/b" in archive
+        page = archive.get("https://example.com/docs/b")
+        assert page is not None
+        assert page.title == "B"
+        assert page.markdown == "# B\n\nbeta ü\n"
+        by_slug = archive.get_by_slug("example-com-docs-a")
+        assert by_slug is not None
+        assert by_slug.markdown == "# A\n\nalpha\n"
+        assert archive.get("https://example.com/docs/missing") is None
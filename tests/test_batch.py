@@ -0,0 +1,112 @@
+from pathlib import Path
+
+import pytest
+import requests
+from conftest import FakeResponse
+
+from mdcrawler.batch import BatchScheduler, Job, load_jobs
+from mdcrawler.cli import main
+from mdcrawler.synthetic import SiteConfig, SyntheticSite
+
+
+def test_load_jobs_reads_limits_and_validates(tmp_path: Path) -> None:
+    path = tmp_path / "jobs.toml"
+    path.write_text(
+        '[batch]\nworkers = 8\n\n[[job]]\nstart_url = "https://a.example.com/docs/intro"\n'
+        'output = "out/a"\nformat = ["markdown", "jsonl"]\n',
+        encoding="utf-8",
+    )
+
+    config = load_jobs(path)
+
+    assert config.workers == 8
+    assert config.per_host == 4
+    assert config.jobs[0].name == "a.example.com"
+    assert config.jobs[0].formats == ["markdown", "jsonl"]
+    path.write_text(
+        '[[job]]\nstart_url = "https://a.example.com/"\noutput = "a"\nformat = "jsonl"\n',
+        encoding="utf-8",
+    )
+    assert load_jobs(path).jobs[0].formats == ["jsonl"]
+    path.write_text('[[job]]\nstart_url = "https://a.example.com/"\n', encoding="utf-8")
+    with pytest.raises(ValueError, match="missing output"):
+        load_jobs(path)
+
+
+def test_scheduler_alternates_jobs_within_host_limit() -> None:
+    jobs = [
+        Job(name="a", start_url="https://a.example.com/docs/0", output="a"),
+        Job(name="b", start_url="https://b.example.com/docs/0", output="b"),
+    ]
+    scheduler = BatchScheduler(jobs, workers=8, per_host=2)
+    for state in scheduler.states:
+        for i in range(1, 4):
+            state.queue(f"{state.job.start_url[:-1]}{i}")
+
+    picked = []
+    while (choice := scheduler._pick()) is not None:
+        picked.append(choice[0].job.name)
+
+    assert picked == ["a", "b", "a", "b"]
+
+
+def test_batch_subcommand_crawls_all_jobs(tmp_path: Path) -> None:
+    with (
+        SyntheticSite(SiteConfig(pages=6, fanout=2, images=0)) as small,
+        SyntheticSite(SiteConfig(pages=12, fanout=3, images=0)) as large,
+    ):
+        path = tmp_path / "jobs.toml"
+        path.write_text(
+            "[batch]\nworkers = 4\nper_host = 2\n\n"
+            f'[[job]]\nname = "small"\nstart_url = "{small.start_url}"\n'
+            f'output = "{(tmp_path / "small").as_posix()}"\n\n'
+            f'[[job]]\nname = "large"\nstart_url = "{large.start_url}"\n'
+            f'output = "{(tmp_path / "large").as_posix()}"\nformat = ["jsonl"]\n',
+            encoding="utf-8",
+        )
+
+        assert main(["batch", str(path)]) == 0
+
+    assert len(list((tmp_path / "small" / "pages").glob("*.md"))) == 6
+    assert (tmp_path / "large" / "chunks.jsonl").exists()
+    assert not (tmp_path / "large" / "pages").exists()
+
+
+def test_failed_write_only_fails_its_own_job(tmp_path: Path) -> None:
+    blocked = tmp_path / "blocked"
+    blocked.write_text("not a directory", encoding="utf-8")
+    with SyntheticSite(SiteConfig(pages=3, fanout=2, images=0)) as site:
+        jobs = [
+            Job(name="blocked", start_url=site.start_url, output=str(blocked)),
+            Job(name="ok", start_url=site.start_url, output=str(tmp_path / "ok")),
+        ]
+        scheduler = BatchScheduler(jobs, workers=2)
+
+        results = scheduler.run()
+
+    assert results == {"blocked": 0, "ok": 3}
+    assert list(scheduler.errors) == ["blocked"]
+    assert len(list((tmp_path / "ok" / "pages").glob("*.md"))) == 3
+
+
+def test_retries_are_counted_per_job(tmp_path: Path) -> None:
+    url = "https://example.com/docs/start"
+    jobs = [Job(name=name, start_url=url, output=str(tmp_path / name)) for name in ("a", "b")]
+    scheduler = BatchScheduler(jobs, workers=1)
+    for state in scheduler.states:
+        calls: list[str] = []
+
+        def flaky(url: str, calls: list[str] = calls) -> FakeResponse:
+            calls.append(url)
+            if len(calls) == 1:
+                raise requests.Timeout("stalled")
+            return FakeResponse(text="<html><body><p>Recovered</p></body></html>")
+
+        state.crawler.fetch = flaky  # type: ignore[assignment]
+        state.crawler.retries = 1
+        state.job.formats = []
+
+    results = scheduler.run()
+
+    assert results == {"a": 1, "b": 1}
+    assert all(state.crawler.unfinished == [] for state in scheduler.states)
@@ -0,0 +1,145 @@
+import json
+from pathlib import Path
+from typing import Any
+
+import requests
+
+from mdcrawler.benchmark import (
+    compare_results,
+    format_comparison,
+    run_crawl_benchmark,
+    run_extraction_benchmark,
+)
+from mdcrawler.cli import main
+from mdcrawler.synthetic import PAGE_KINDS, SiteConfig, SyntheticSite, generate_page
+
+
+def test_generate_page_is_deterministic() -> None:
+    for kind in PAGE_KINDS:
+        assert generate_page(kind, scale=0.01) == generate_page(kind, scale=0.01)
+    assert generate_page("mixed", scale=0.01, seed=1) != generate_page("mixed", scale=0.01)
+
+
+def test_extraction_benchmark_reports_timings_functions_and_memory() -> None:
+    results = run_extraction_benchmark(("big_table",), scale=0.02, repeat=2)
+
+    result = results["extract.big_table"]
+    assert len(result["runs"]) == 2
+    assert result["pages_per_sec"] > 0
+    assert result["peak_memory_bytes"] > 0
+    assert "_table_to_markdown" in result["functions"]
+
+
+def test_bench_subcommand_writes_json(tmp_path: Path) -> None:
+    output = tmp_path / "bench.json"
+
+    exit_code = main(
+        [
+            "bench",
+            "--kinds",
+            "code_blocks",
+            "--scale",
+            "0.02",
+            "--repeat",
+            "1",
+            "--output",
+            str(output),
+        ]
+    )
+
+    assert exit_code == 0
+    document = json.loads(output.read_text(encoding="utf-8"))
+    assert document["settings"] == {
+        "suites": ["extract"],
+        "kinds": ["code_blocks"],
+        "scale": 0.02,
+        "repeat": 1,
+    }
+    assert list(document["benchmarks"]) == ["extract.code_blocks"]
+
+
+def test_synthetic_site_serves_linked_pages_images_and_errors() -> None:
+    config = SiteConfig(pages=3, fanout=2, error_rate=0.0, images=1)
+    with SyntheticSite(config) as site:
+        page = requests.get(site.start_url, timeout=5)
+        image = requests.get(f"{site.base_url}/img/page-0-0.png", timeout=5)
+        missing = requests.get(f"{site.base_url}/docs/page-3", timeout=5)
+
+    assert page.status_code == 200
+    assert 'href="/docs/page-1"' in page.text
+    assert image.content.startswith(b"\x89PNG")
+    assert missing.status_code == 404
+    with SyntheticSite(SiteConfig(pages=3, throttle_rate=1.0)) as site:
+        assert requests.get(site.start_url, timeout=5).status_code == 429
+
+
+def test_crawl_benchmark_runs_cli_against_synthetic_site() -> None:
+    results = run_crawl_benchmark(SiteConfig(pages=8, fanout=2), thread_counts=(2,))
+
+    result = results["crawl.threads.threads-2"]
+    assert result["pages"] == 8
+    assert result["pages_per_sec"] > 0
+    assert result["latency_p99"] >= result["latency_p50"] > 0
+
+
+def _result(runs: list[float]) -> dict[str, Any]:
+    return {"runs": runs, "median": sorted(runs)[len(runs) // 2]}
+
+
+def test_compare_results_flags_only_significant_slowdowns() -> None:
+    baseline = {
+        "extract.a": _result([1.0, 1.01, 0.99, 1.02, 0.98]),
+        "extract.b": _result([1.0, 1.01, 0.99, 1.02, 0.98]),
+        "extract.c": _result([1.0, 1.01, 0.99, 1.02, 0.98]),
+        "extract.gone": _result([1.0]),
+    }
+    current = {
+        "extract.a": _result([1.5, 1.52, 1.49, 1.51, 1.48]),
+        "extract.b": _result([0.5, 2.0, 0.9, 1.4, 1.2]),
+        "extract.c": _result([0.5, 0.51, 0.49, 0.52, 0.48]),
+        "extract.new": _result([1.0]),
+    }
+
+    rows = {row["name"]: row for row in compare_results(baseline, current)}
+
+    assert rows["extract.a"]["status"] == "regression"
+    assert rows["extract.a"]["change"] > 0.4
+    assert rows["extract.b"]["status"] == "ok"
+    assert rows["extract.c"]["status"] == "improved"
+    assert rows["extract.gone"]["status"] == "missing"
+    assert rows["extract.new"]["status"] == "new"
+    assert "REGRESSION" in format_comparison(list(rows.values()))
+
+
+def test_bench_compare_reuses_baseline_settings_and_exits_nonzero_on_regression(
+    tmp_path: Path,
+) -> None:
+    baseline_path = tmp_path / "baseline.json"
+    assert (
+        main(
+            [
+                "bench",
+                "--kinds",
+                "big_table",
+                "--scale",
+                "0.02",
+                "--repeat",
+                "3",
+                "--output",
+                str(baseline_path),
+            ]
+        )
+        == 0
+    )
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    baseline["benchmarks"]["extract.big_table"]["runs"] = [1e-9, 1e-9, 1e-9]
+    baseline_path.write_text(json.dumps(baseline), encoding="utf-8")
+
+    exit_code = main(
+        ["bench", "--compare", str(baseline_path), "--output", str(tmp_path / "current.json")]
+    )
+
+    assert exit_code == 1
+    current = json.loads((tmp_path / "current.json").read_text(encoding="utf-8"))
+    assert list(current["benchmarks"]) == ["extract.big_table"]
+    assert len(current["benchmarks"]["extract.big_table"]["runs"]) == 5
@@ -0,0 +1,63 @@
+from pathlib import Path
+
+from conftest import FakeResponse
+
+from mdcrawler.boilerplate import BoilerplateDetector
+from mdcrawler.crawler import Crawler
+from mdcrawler.outputs import write_outputs
+
+BANNER = "We use cookies to improve this site."
+
+
+def test_detector_strips_blocks_repeated_across_pages() -> None:
+    detector = BoilerplateDetector(threshold=0.5, min_pages=3)
+    pages = [
+        f"# Parameters\n\nBody of page {index}.\n\n{BANNER}\n\n```\npip install x\n```\n"
+        for index in range(4)
+    ]
+
+    first, second, third, fourth = (detector.process(page) for page in pages)
+
+    assert BANNER in first and BANNER in second
+    assert BANNER not in third and BANNER not in fourth
+    assert fourth == "# Parameters\n\nBody of page 3.\n\n```\npip install x\n```\n"
+    assert BANNER not in detector.clean(first)
+    assert detector.clean("# Other\n\nUnique text.\n") == "# Other\n\nUnique text.\n"
+
+
+def test_detector_keeps_its_table_bounded() -> None:
+    detector = BoilerplateDetector(min_pages=2, max_entries=100)
+    for index in range(500):
+        detector.process(f"Unique {index}\n\n{BANNER}\n")
+
+    assert len(detector._counts) <= 100
+    assert detector.is_boilerplate(BANNER)
+
+
+def test_crawl_strips_boilerplate_from_earlier_pages_on_write(tmp_path: Path) -> None:
+    links = "".join(f'<a href="/docs/{index}">{index}</a>' for index in range(6))
+
+    def fake_fetch(url: str) -> FakeResponse:
+        return FakeResponse(text=f"<html><body><p>{url}</p><p>{BANNER}</p>{links}</body></html>")
+
+    detector = BoilerplateDetector(threshold=0.5, min_pages=3)
+    crawler = Crawler(
+        start_url="https://example.com/docs/",
+        prefix="https://example.com/docs/",
+        threads=1,
+        fetch=fake_fetch,  # type: ignore[arg-type]
+        boilerplate=detector,
+    )
+    pages = crawler.run()
+
+    assert BANNER in pages[0].markdown
+    assert BANNER not in pages[-1].markdown
+    write_outputs(
+        pages,
+        tmp_path,
+        start_url="https://example.com/docs/",
+        formats=["markdown"],
+        boilerplate=detector,
+    )
+    assert BANNER not in (tmp_path / "combined.md").read_text(encoding="utf-8")
+    assert "https://example.com/docs/0" in (tmp_path / "combined.md").read_text(encoding="utf-8")
@@ -0,0 +1,122 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from mdcrawler.cli import SUBCOMMANDS, main
+
+ROOT = Path(__file__).resolve().parents[1]
+HEAVY_MODULES = ("bs4", "requests", "concurrent.futures", "sqlite3", "asyncio", "http.server")
+
+# Cumulative import time of mdcrawler.cli, in microseconds. Loading bs4 and requests alone
+# costs well over this, so the budget catches a heavy module creeping back to module level.
+IMPORT_BUDGET_US = 100_000
+
+
+def _python(*args: str) -> subprocess.CompletedProcess[str]:
+    env = {**os.environ, "PYTHONPATH": str(ROOT)}
+    return subprocess.run(
+        [sys.executable, *args], capture_output=True, text=True, env=env, check=False
+    )
+
+
+def _loaded_heavy_modules(code: str) -> list[str]:
+    result = _python(
+        "-c",
+        f"import sys\n{code}\n"
+        f"print('loaded:' + ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))",
+    )
+    loaded = result.stdout.rsplit("loaded:", 1)[1].strip()
+    return loaded.split(",") if loaded else []
+
+
+def test_cli_import_stays_within_budget() -> None:
+    result = _python("-X", "importtime", "-c", "import mdcrawler.cli")
+
+    cumulative = {
+        parts[2].strip(): int(parts[1])
+        for parts in (line.split("|") for line in result.stderr.splitlines()[1:])
+        if len(parts) == 3
+    }
+    assert cumulative["mdcrawler.cli"] < IMPORT_BUDGET_US
+    assert not set(HEAVY_MODULES) & set(cumulative)
+
+
+def test_help_and_dispatch_load_only_what_they_need() -> None:
+    help_code = (
+        "from mdcrawler.cli import main\n"
+        "try:\n    main(['--help'])\nexcept SystemExit as exc:\n    assert exc.code == 0"
+    )
+    search_code = help_code.replace("'--help'", "'search', '--help'")
+
+    assert _loaded_heavy_modules(help_code) == []
+    assert _loaded_heavy_modules(search_code) == ["sqlite3"]
+
+
+def test_help_lists_the_subcommands(capsys: pytest.CaptureFixture[str]) -> None:
+    with pytest.raises(SystemExit):
+        main(["--help"])
+
+    epilog = capsys.readouterr().out.split("subcommands", 1)[1]
+    assert [line.split()[0] for line in epilog.splitlines()[1:] if line] == list(SUBCOMMANDS)
+
+
+def test_request_deadline_flag_bounds_slow_responses(tmp_path: Path) -> None:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802 - http.server naming
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", "400")
+            self.end_headers()
+            try:
+                for _ in range(400):
+                    self.wfile.write(b" ")
+                    self.wfile.flush()
+                    time.sleep(0.05)
+            except OSError:
+                pass
+
+        def log_message(self, format: str, *args: object) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    argv = [
+        "--start-url",
+        f"http://127.0.0.1:{server.server_port}/docs/",
+        "--output",
+        str(tmp_path),
+        "--request-deadline",
+        "0.3",
+        "--retries",
+        "0",
+    ]
+    started = time.monotonic()
+    try:
+        assert main(argv) == 1
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert time.monotonic() - started < 5
+
+
+@pytest.mark.parametrize("option", ["--combined-max-bytes", "--combined-max-tokens"])
+@pytest.mark.parametrize(
+    "command",
+    [
+        ["--start-url", "https://example.com/docs/"],
+        ["extract", "--input", ".", "--base-url", "https://example.com/docs/"],
+    ],
+)
+def test_non_positive_combined_limits_are_rejected(
+    command: list[str], option: str, capsys: pytest.CaptureFixture[str]
+) -> None:
+    with pytest.raises(SystemExit):
+        main([*command, option, "0"])
+
+    assert f"{option} must be positive" in capsys.readouterr().err
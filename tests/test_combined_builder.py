@@ -0,0 +1,89 @@
+import json
+import os
+from pathlib import Path
+
+from conftest import make_page
+
+from mdcrawler.combined_builder import build_combined
+
+
+def test_build_combined_without_limits_writes_single_file(tmp_path: Path) -> None:
+    build_combined([make_page("one", "# Intro\n\nHello\n")], tmp_path)
+
+    assert (tmp_path / "combined.md").read_text(encoding="utf-8") == (
+        "# Combined Documentation\n\n## One\n\n## Intro\n\nHello\n"
+    )
+    assert not (tmp_path / "combined-manifest.json").exists()
+
+
+def test_build_combined_shards_at_page_boundaries(tmp_path: Path) -> None:
+    pages = [make_page(name, "Text " * 20) for name in ("one", "two", "three")]
+
+    build_combined(pages, tmp_path, max_bytes=200)
+
+    manifest = json.loads((tmp_path / "combined-manifest.json").read_text(encoding="utf-8"))
+    files = [shard["file"] for shard in manifest["shards"]]
+    assert files == ["combined-0001.md", "combined-0002.md", "combined-0003.md"]
+    for shard in manifest["shards"]:
+        assert shard["bytes"] <= 200
+        assert len(shard["pages"]) == 1
+        assert shard["pages"][0]["tokens"] > 0
+        content = (tmp_path / shard["file"]).read_text(encoding="utf-8")
+        assert content.startswith("# Combined Documentation\n\n## ")
+
+
+def test_build_combined_splits_large_page_at_headings(tmp_path: Path) -> None:
+    body = "\n\n".join(f"# Section {i}\n\n" + "word " * 30 for i in range(4))
+
+    build_combined([make_page("big", body)], tmp_path, max_tokens=80)
+
+    manifest = json.loads((tmp_path / "combined-manifest.json").read_text(encoding="utf-8"))
+    assert len(manifest["shards"]) > 1
+    assert all(shard["tokens"] <= 80 for shard in manifest["shards"])
+    assert all(shard["pages"][0]["url"].endswith("/big") for shard in manifest["shards"])
+    second = (tmp_path / manifest["shards"][1]["file"]).read_text(encoding="utf-8")
+    assert "## Section" in second.split("\n", 2)[2]
+
+
+def test_build_combined_never_splits_inside_code_fences(tmp_path: Path) -> None:
+    script = "\n".join(f"# step {i}\necho {i}" for i in range(40))
+    body = f"# Setup\n\nRun this:\n\n```bash\n{script}\n```\n\n# Next\n\n" + "Done. " * 60
+
+    build_combined([make_page("script", body)], tmp_path, max_bytes=800)
+
+    manifest = json.loads((tmp_path / "combined-manifest.json").read_text(encoding="utf-8"))
+    assert len(manifest["shards"]) > 1
+    for shard in manifest["shards"]:
+        content = (tmp_path / shard["file"]).read_text(encoding="utf-8")
+        assert content.count("```") % 2 == 0
+    combined = "".join(
+        (tmp_path / shard["file"]).read_text(encoding="utf-8") for shard in manifest["shards"]
+    )
+    assert "# step 39\n" in combined and "## step" not in combined
+
+
+def test_build_combined_keeps_unchanged_shards_and_drops_stale_ones(tmp_path: Path) -> None:
+    pages = [make_page(name, "Text " * 20) for name in ("one", "two", "three")]
+    build_combined(pages, tmp_path, max_bytes=200)
+    first = tmp_path / "combined-0001.md"
+    os.utime(first, (1, 1))
+
+    build_combined(pages[:2], tmp_path, max_bytes=200)
+
+    assert first.stat().st_mtime == 1
+    assert sorted(path.name for path in tmp_path.glob("combined-*.md")) == [
+        "combined-0001.md",
+        "combined-0002.md",
+    ]
+
+
+def test_build_combined_removes_the_other_layout(tmp_path: Path) -> None:
+    pages = [make_page(name, "Text " * 20) for name in ("one", "two")]
+    build_combined(pages, tmp_path)
+
+    build_combined(pages, tmp_path, max_bytes=200)
+    assert not (tmp_path / "combined.md").exists()
+    assert (tmp_path / "combined-manifest.json").exists()
+
+    build_combined(pages, tmp_path)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["combined.md"]
@@ -1,4 +1,4 @@
-from mdcrawler.content_extractor import extract_content
+from mdcrawler.content_extractor import extract_content, scan_links
 
 
 def test_extract_content_rewrites_links_and_discovers_internal_urls() -> None:
@@ -274,3 +274,37 @@ def test_images_in_picture_elements_appear_at_correct_position() -> None:
     assert (
         first_para_pos < image_pos < second_para_pos
     ), "Image should appear between the two paragraphs"
+
+
+def test_scan_links_matches_extracted_links_and_honors_base_href() -> None:
+    html = """
+        <html><head><base href="/docs/v2/"></head><body>
+        <a data-href="/elsewhere" href='guide?q=1&amp;r=2#intro'>Guide</a>
+        <a href=/docs/v2/api>API</a>
+        <a href="https://other.example.com/">Other</a>
+        <a href="mailto:docs@example.com">Mail</a>
+        </body></html>
+    """
+    base_url = "https://example.com/docs/index.html"
+    prefix = "https://example.com/docs/"
+
+    expected = ["https://example.com/docs/v2/guide?q=1&r=2", "https://example.com/docs/v2/api"]
+    assert scan_links(html, base_url, prefix) == expected
+    assert extract_content(html, base_url, prefix).discovered_urls == expected
+
+
+def test_scan_links_skips_scripts_styles_and_comments() -> None:
+    html = """
+        <html><head>
+        <style>a[href="/docs/styled"] { color: red }</style>
+        <script>document.write('<a href="/docs/scripted">x</a>');</script>
+        </head><body>
+        <!-- <a href="/docs/commented">old</a> -->
+        <a href="/docs/real">Real</a>
+        <SCRIPT type="text/template"><a href="/docs/template">t</a></SCRIPT>
+        <!-- unterminated <a href="/docs/tail">
+    """
+
+    assert scan_links(html, "https://example.com/docs/", "https://example.com/docs/") == [
+        "https://example.com/docs/real"
+    ]
@@ -1,13 +1,15 @@
-from dataclasses import dataclass
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
 
 import pytest
+import requests
+from conftest import FakeResponse
 
 import mdcrawler.crawler as crawler_module
-
-
-@dataclass
-class FakeResponse:
-    text: str
+from mdcrawler.content_extractor import ExtractedContent
 
 
 def test_crawler_recurses_and_visits_discovered_urls(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -40,3 +42,160 @@ def test_crawler_recurses_and_visits_discovered_urls(monkeypatch: pytest.MonkeyP
         "https://example.com/docs/start",
         "https://example.com/docs/child",
     }
+
+
+def _endless_site(fetched: list[str]) -> Callable[[str], FakeResponse]:
+    def fake_fetch(url: str) -> FakeResponse:
+        fetched.append(url)
+        index = int(url.rsplit("-", 1)[1])
+        links = "".join(f'<a href="/docs/page-{index * 3 + i}">Next</a>' for i in range(1, 4))
+        return FakeResponse(text=f"<html><body><p>Page {index} {links}</p></body></html>")
+
+    return fake_fetch
+
+
+def test_iter_pages_streams_with_bounded_lookahead() -> None:
+    fetched: list[str] = []
+    crawler = crawler_module.Crawler(
+        start_url="https://example.com/docs/page-0",
+        prefix="https://example.com/docs/",
+        threads=2,
+        fetch=_endless_site(fetched),
+    )
+
+    pages = crawler.iter_pages(buffer=3)
+    first = [next(pages) for _ in range(5)]
+    pages.close()
+
+    assert first[0].url == "https://example.com/docs/page-0"
+    assert len(fetched) <= 5 + 3
+    assert len(fetched) == len(set(fetched))
+
+
+def test_aiter_pages_can_be_cancelled() -> None:
+    fetched: list[str] = []
+    crawler = crawler_module.Crawler(
+        start_url="https://example.com/docs/page-0",
+        prefix="https://example.com/docs/",
+        threads=2,
+        fetch=_endless_site(fetched),
+    )
+
+    async def take(count: int) -> list[str]:
+        urls = []
+        async for page in crawler.aiter_pages(buffer=2):
+            urls.append(page.url)
+            if len(urls) == count:
+                break
+        return urls
+
+    assert len(asyncio.run(take(4))) == 4
+    assert len(fetched) <= 4 + 2
+
+
+def test_early_links_are_fetched_before_extraction_finishes(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    child_fetched = threading.Event()
+    pages = {
+        "https://example.com/docs/start": """
+            <html><head><base href="/docs/v2/"></head>
+            <body><nav><a href="child">Child</a></nav><p>Start</p></body></html>
+        """,
+        "https://example.com/docs/v2/child": "<html><body><p>Child page</p></body></html>",
+    }
+
+    def fake_fetch(url: str) -> FakeResponse:
+        if url.endswith("/child"):
+            child_fetched.set()
+        return FakeResponse(text=pages[url])
+
+    extract_content = crawler_module.extract_content
+    waited: list[bool] = []
+
+    def slow_extract(html: str, url: str, *args: Any, **kwargs: Any) -> ExtractedContent:
+        if url.endswith("/start"):
+            waited.append(child_fetched.wait(timeout=5))
+        return extract_content(html, url, *args, **kwargs)
+
+    monkeypatch.setattr(crawler_module, "extract_content", slow_extract)
+    crawler = crawler_module.Crawler(
+        start_url="https://example.com/docs/start",
+        prefix="https://example.com/docs/",
+        threads=2,
+        fetch=fake_fetch,  # type: ignore[arg-type]
+        early_links=True,
+    )
+
+    urls = {page.url for page in crawler.run()}
+
+    assert waited == [True]
+    assert urls == {"https://example.com/docs/start", "https://example.com/docs/v2/child"}
+
+
+def test_timed_out_urls_are_retried_later() -> None:
+    attempts: list[str] = []
+
+    def flaky_fetch(url: str) -> FakeResponse:
+        attempts.append(url)
+        if url.endswith("/slow") and attempts.count(url) == 1:
+            raise requests.Timeout("stalled")
+        if url.endswith("/start"):
+            return FakeResponse(
+                text='<html><body><p><a href="/docs/slow">Slow</a></p></body></html>'
+            )
+        return FakeResponse(text="<html><body><p>Finally</p></body></html>")
+
+    crawler = crawler_module.Crawler(
+        start_url="https://example.com/docs/start",
+        prefix="https://example.com/docs/",
+        threads=2,
+        fetch=flaky_fetch,  # type: ignore[arg-type]
+    )
+    urls = [page.url for page in crawler.run()]
+
+    assert "https://example.com/docs/slow" in urls
+    assert crawler.metrics.counters["retries"] == 1
+    assert crawler.unfinished == []
+    assert crawler.hosts.is_quarantined("example.com")
+
+
+def test_crawl_deadline_stops_queueing_new_urls() -> None:
+    fetched: list[str] = []
+    slow_site = _endless_site(fetched)
+
+    def slow_fetch(url: str) -> FakeResponse:
+        time.sleep(0.02)
+        return slow_site(url)
+
+    crawler = crawler_module.Crawler(
+        start_url="https://example.com/docs/page-0",
+        prefix="https://example.com/docs/",
+        threads=2,
+        fetch=slow_fetch,
+        deadline=0.2,
+    )
+    started = time.monotonic()
+    crawler.run()
+
+    assert time.monotonic() - started < 2
+    assert crawler.metrics.counters["deadline.dropped"] > 0
+    assert len(crawler.unfinished) >= crawler.metrics.counters["deadline.dropped"]
+
+
+def test_cancel_before_iter_pages_stops_that_crawl_only() -> None:
+    fetched: list[str] = []
+    crawler = crawler_module.Crawler(
+        start_url="https://example.com/docs/page-0",
+        prefix="https://example.com/docs/",
+        threads=2,
+        fetch=_endless_site(fetched),
+    )
+
+    crawler.cancel()
+    assert list(crawler.iter_pages()) == []
+
+    crawler.visited.clear()
+    pages = crawler.iter_pages(buffer=2)
+    assert next(pages).url == "https://example.com/docs/page-0"
+    pages.close()
@@ -0,0 +1,85 @@
+import random
+from pathlib import Path
+
+from conftest import FakeResponse
+
+from mdcrawler.crawler import Crawler, Page
+from mdcrawler.dedup import DuplicateIndex, fingerprint, hamming_distance
+from mdcrawler.outputs import write_outputs
+
+WORDS = (
+    "install configure request response client server token cache header payload "
+    "deploy module package function argument return value error retry timeout"
+).split()
+
+
+def _text(seed: int, words: int = 3000) -> str:
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def test_duplicate_index_finds_exact_and_near_duplicates() -> None:
+    original = _text(1)
+    edited = original.replace("install", "INSTALL", 1) + " updated"
+    index = DuplicateIndex(max_distance=3)
+
+    assert hamming_distance(fingerprint(original).simhash, fingerprint(edited).simhash) <= 3
+    assert index.add("https://example.com/a", fingerprint(original)) is None
+    assert index.add("https://example.com/a-copy", fingerprint(original)) == "https://example.com/a"
+    assert index.add("https://example.com/print/a", fingerprint(edited)) == "https://example.com/a"
+    assert index.add("https://example.com/b", fingerprint(_text(2))) is None
+
+
+def _site() -> dict[str, str]:
+    body = f"<p>{_text(3)}</p>"
+    return {
+        "https://example.com/docs/": '<a href="/docs/v1/">v1</a><a href="/docs/v2/">v2</a>',
+        "https://example.com/docs/v1/": f'<title>Guide</title>{body}<a href="/docs/v1/x">x</a>',
+        "https://example.com/docs/v2/": f'<title>Guide</title>{body}<a href="/docs/v2/x">x</a>',
+        "https://example.com/docs/v1/x": "<p>Only in v1</p>",
+        "https://example.com/docs/v2/x": "<p>Only in v2</p>",
+    }
+
+
+def _crawl(follow_duplicates: bool) -> tuple[Crawler, list[Page], list[str]]:
+    fetched: list[str] = []
+    site = _site()
+
+    def fake_fetch(url: str) -> FakeResponse:
+        fetched.append(url)
+        return FakeResponse(text=f"<html><body>{site[url]}</body></html>")
+
+    crawler = Crawler(
+        start_url="https://example.com/docs/",
+        prefix="https://example.com/docs/",
+        threads=1,
+        fetch=fake_fetch,  # type: ignore[arg-type]
+        dedup=DuplicateIndex(),
+        follow_duplicates=follow_duplicates,
+    )
+    return crawler, crawler.run(), fetched
+
+
+def test_crawler_marks_duplicates_and_can_stop_following_them(tmp_path: Path) -> None:
+    crawler, pages, fetched = _crawl(follow_duplicates=True)
+
+    assert all(page.duplicate_of is None for page in pages)
+    assert [page.url for page in crawler.duplicates] == ["https://example.com/docs/v2/"]
+    assert crawler.duplicates[0].duplicate_of == "https://example.com/docs/v1/"
+    assert len(fetched) == 5
+
+    crawler, pages, fetched = _crawl(follow_duplicates=False)
+    assert "https://example.com/docs/v2/x" not in fetched
+    assert len(pages) == 2
+
+    write_outputs(
+        pages,
+        tmp_path,
+        start_url="https://example.com/docs/",
+        formats=["markdown"],
+        duplicates=crawler.duplicates,
+    )
+    index = (tmp_path / "index.md").read_text(encoding="utf-8")
+    assert "https://example.com/docs/v2/ -> duplicate of https://example.com/docs/v1/" in index
+    assert "docs/v2/" not in (tmp_path / "combined.md").read_text(encoding="utf-8")
+    assert len(list((tmp_path / "pages").glob("*.md"))) == 2
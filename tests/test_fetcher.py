@@ -0,0 +1,197 @@
+import gzip
+import socket
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from mdcrawler.cli import main
+from mdcrawler.fetcher import (
+    HEADERS,
+    DeadlineExceededError,
+    HTTP2Backend,
+    RequestsBackend,
+    ResponseTooLargeError,
+    count_transfers,
+    fetch_url,
+    open_backend,
+    transfer_sizes,
+)
+from mdcrawler.metrics import Metrics
+from mdcrawler.synthetic import SiteConfig, SyntheticSite
+
+
+@pytest.fixture
+def h2_server() -> Iterator[tuple[str, list[int]]]:
+    """A cleartext HTTP/2 (prior knowledge) stand-in that counts accepted connections."""
+    pytest.importorskip("httpx")
+    h2_config = pytest.importorskip("h2.config")
+    h2_connection = pytest.importorskip("h2.connection")
+    h2_events = pytest.importorskip("h2.events")
+    listener = socket.create_server(("127.0.0.1", 0))
+    connections: list[int] = []
+
+    def serve(client: socket.socket) -> None:
+        config = h2_config.H2Configuration(client_side=False, header_encoding="utf-8")
+        conn = h2_connection.H2Connection(config=config)
+        conn.initiate_connection()
+        client.sendall(conn.data_to_send())
+        with client:
+            while data := client.recv(65535):
+                for event in conn.receive_data(data):
+                    if isinstance(event, h2_events.RequestReceived):
+                        path = dict(event.headers)[":path"]
+                        body = f"<html><body><p>Page {path}</p></body></html>".encode()
+                        headers = [
+                            (":status", "200"),
+                            ("content-type", "text/html; charset=utf-8"),
+                            ("content-length", str(len(body))),
+                        ]
+                        conn.send_headers(event.stream_id, headers)
+                        conn.send_data(event.stream_id, body, end_stream=True)
+                client.sendall(conn.data_to_send())
+
+    def accept() -> None:
+        while True:
+            try:
+                client, _ = listener.accept()
+            except OSError:
+                return
+            connections.append(1)
+            threading.Thread(target=serve, args=(client,), daemon=True).start()
+
+    threading.Thread(target=accept, daemon=True).start()
+    yield f"http://127.0.0.1:{listener.getsockname()[1]}", connections
+    listener.close()
+
+
+def test_http2_backend_multiplexes_requests_over_one_connection(
+    h2_server: tuple[str, list[int]],
+) -> None:
+    base_url, connections = h2_server
+    backend = HTTP2Backend(pool_size=8, prior_knowledge=True)
+    urls = [f"{base_url}/docs/{index}" for index in range(16)]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        responses = list(executor.map(backend.fetch, urls))
+    backend.close()
+
+    assert [response.text for response in responses] == [
+        f"<html><body><p>Page /docs/{index}</p></body></html>" for index in range(16)
+    ]
+    assert backend.protocols == {"HTTP/2": 16}
+    assert len(connections) == 1
+
+
+def test_open_backend_falls_back_to_http1_without_httpx(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setitem(sys.modules, "httpx", None)
+    backend = open_backend(http2=True)
+
+    assert isinstance(backend, RequestsBackend)
+    with SyntheticSite(SiteConfig(pages=2, images=0)) as site:
+        assert "<html" in backend.fetch(site.start_url).text
+    backend.close()
+
+
+def test_http2_flag_does_not_change_crawl_output(tmp_path: Path) -> None:
+    with SyntheticSite(SiteConfig(pages=4, fanout=2, images=0)) as site:
+        for name, extra in (("plain", []), ("http2", ["--http2"])):
+            argv = [
+                "--start-url",
+                site.start_url,
+                "--threads",
+                "1",
+                "--output",
+                str(tmp_path / name),
+            ]
+            assert main(argv + extra) == 0
+
+    for path in (tmp_path / "plain").rglob("*.md"):
+        other = tmp_path / "http2" / path.relative_to(tmp_path / "plain")
+        assert other.read_bytes() == path.read_bytes()
+
+
+@pytest.fixture
+def gzip_server() -> Iterator[str]:
+    """Serves ``/page`` gzip-encoded (when accepted) and ``/bomb``, 8 MB of zeros, always gzipped."""
+    page = ("<html><body>" + "<p>Compressible text. </p>" * 2000 + "</body></html>").encode()
+    bodies = {"/page": page, "/bomb": b"\0" * (8 * 1024 * 1024)}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802 - http.server naming
+            body = bodies[self.path]
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            if "gzip" in self.headers.get("Accept-Encoding", "") or self.path == "/bomb":
+                body = gzip.compress(body)
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: object) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_fetch_counts_wire_and_decoded_bytes_per_host(gzip_server: str) -> None:
+    metrics = Metrics()
+    fetch = count_transfers(fetch_url, metrics)
+
+    response = fetch(f"{gzip_server}/page")
+    wire, decoded = transfer_sizes(response)
+
+    assert "gzip" in HEADERS["Accept-Encoding"]
+    assert response.text.startswith("<html>")
+    assert wire < decoded / 10
+    host = gzip_server.removeprefix("http://")
+    assert metrics.counters[f"hosts.{host}.bytes.wire"] == wire
+    assert metrics.counters[f"hosts.{host}.bytes.decoded"] == decoded == len(response.content)
+    assert metrics.counters["bytes.decoded"] == decoded
+
+
+def test_fetch_stops_decoding_past_the_size_cap(gzip_server: str) -> None:
+    with pytest.raises(ResponseTooLargeError):
+        fetch_url(f"{gzip_server}/bomb", max_bytes=1024 * 1024)
+
+    backend = RequestsBackend(max_bytes=1024 * 1024)
+    with pytest.raises(ResponseTooLargeError):
+        backend.fetch(f"{gzip_server}/bomb")
+    assert backend.fetch(f"{gzip_server}/page").text.startswith("<html>")
+    backend.close()
+
+
+def test_fetch_deadline_bounds_responses_that_trickle_in() -> None:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802 - http.server naming
+            self.send_response(200)
+            self.send_header("Content-Length", "100")
+            self.end_headers()
+            for _ in range(100):
+                self.wfile.write(b"x")
+                self.wfile.flush()
+                time.sleep(0.05)
+
+        def log_message(self, format: str, *args: object) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    started = time.monotonic()
+    try:
+        with pytest.raises(DeadlineExceededError):
+            fetch_url(f"http://127.0.0.1:{server.server_port}/", deadline=0.5)
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert time.monotonic() - started < 2
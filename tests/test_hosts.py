@@ -0,0 +1,53 @@
+from mdcrawler.hosts import HostLimiter
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_host_limiter_caps_concurrency_per_host() -> None:
+    limiter = HostLimiter(max_per_host=2)
+
+    assert limiter.acquire("a.example") and limiter.acquire("a.example")
+    assert not limiter.acquire("a.example")
+    assert limiter.acquire("b.example")
+    limiter.release("a.example", 0.1)
+    assert limiter.acquire("a.example")
+
+
+def test_latency_spike_quarantines_a_host_until_it_expires() -> None:
+    clock = FakeClock()
+    limiter = HostLimiter(max_per_host=8, quarantine=30.0, min_samples=3, clock=clock)
+    limiter.acquire("fast.example")
+    for _ in range(5):
+        assert limiter.acquire("slow.example")
+        assert not limiter.release("slow.example", 0.5)
+
+    assert limiter.acquire("slow.example")
+    assert limiter.release("slow.example", 5.0)
+    assert limiter.is_quarantined("slow.example")
+    assert limiter.acquire("slow.example")
+    assert not limiter.acquire("slow.example")
+
+    clock.now = 31.0
+    assert not limiter.is_quarantined("slow.example")
+    assert limiter.acquire("slow.example")
+    assert limiter.quarantines == {"slow.example": 1}
+
+
+def test_timeouts_quarantine_immediately_and_zero_disables() -> None:
+    limiter = HostLimiter()
+    limiter.acquire("a.example")
+    assert limiter.release("a.example", 60.0, timed_out=True)
+    assert limiter.limit("a.example") is None
+    limiter.acquire("b.example")
+    assert limiter.limit("a.example") == 1
+
+    disabled = HostLimiter(quarantine=0)
+    disabled.acquire("a.example")
+    assert not disabled.release("a.example", 60.0, timed_out=True)
+    assert disabled.limit("a.example") is None
@@ -0,0 +1,46 @@
+import gzip
+import json
+from pathlib import Path
+
+from mdcrawler.chunking import iter_chunks
+from mdcrawler.crawler import Page
+from mdcrawler.jsonl_writer import write_jsonl
+
+
+def test_iter_chunks_tracks_heading_path_and_byte_offsets() -> None:
+    markdown = (
+        "Intro ä\n\n# Guide\n\nText\n\n## Setup\n\n```\n# not a heading\n```\n\n# Other\n\nMore\n"
+    )
+
+    chunks = list(iter_chunks(markdown))
+
+    assert [chunk.heading_path for chunk in chunks] == [
+        [],
+        ["Guide"],
+        ["Guide", "Setup"],
+        ["Other"],
+    ]
+    encoded = markdown.encode("utf-8")
+    for chunk in chunks:
+        assert encoded[chunk.start : chunk.end].decode("utf-8").strip() == chunk.text
+    assert "# not a heading" in chunks[2].text
+
+
+def test_write_jsonl_writes_one_record_per_chunk(tmp_path: Path) -> None:
+    page = Page(
+        url="https://example.com/docs/start",
+        title="Start",
+        markdown="# A\n\nalpha\n\n# B\n\nbeta\n",
+        images=[],
+    )
+
+    write_jsonl([page], tmp_path, compress=True)
+
+    with gzip.open(tmp_path / "chunks.jsonl.gz", "rt", encoding="utf-8") as handle:
+        records = [json.loads(line) for line in handle]
+    assert [record["heading_path"] for record in records] == [["A"], ["B"]]
+    assert records[0]["url"] == "https://example.com/docs/start"
+    assert records[0]["title"] == "Start"
+    assert records[1]["text"] == "# B\n\nbeta"
+    assert records[1]["tokens"] > 0
+    assert len(records[1]["hash"]) == 64
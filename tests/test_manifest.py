@@ -0,0 +1,62 @@
+import json
+import os
+from pathlib import Path
+
+from conftest import make_page
+
+from mdcrawler.manifest import build_manifest, load_manifest, write_manifest
+from mdcrawler.markdown_writer import write_pages
+
+FETCHED_AT = 1_700_000_000.0
+
+
+def test_manifest_delta_and_unchanged_pages_keep_mtime(tmp_path: Path) -> None:
+    first = [
+        make_page(slug, body, fetched_at=FETCHED_AT)
+        for slug, body in (("a", "alpha\n"), ("b", "beta\n"), ("c", "gamma\n"))
+    ]
+    write_pages(first, tmp_path)
+    write_manifest(build_manifest(first), tmp_path)
+    unchanged = tmp_path / "pages" / "example-com-docs-a.md"
+    os.utime(unchanged, (1, 1))
+
+    second = [
+        make_page(slug, body, fetched_at=FETCHED_AT)
+        for slug, body in (("a", "alpha\n"), ("b", "beta v2\n"), ("d", "delta\n"))
+    ]
+    previous = load_manifest(tmp_path)
+    write_pages(second, tmp_path)
+    write_manifest(build_manifest(second), tmp_path, previous=previous)
+
+    assert unchanged.stat().st_mtime == 1
+    delta = json.loads((tmp_path / "delta.json").read_text(encoding="utf-8"))
+    assert delta == {
+        "added": ["https://example.com/docs/d"],
+        "changed": ["https://example.com/docs/b"],
+        "removed": ["https://example.com/docs/c"],
+    }
+    assert not (tmp_path / "pages" / "example-com-docs-c.md").exists()
+    manifest = load_manifest(tmp_path)
+    assert manifest is not None
+    entry = manifest["https://example.com/docs/a"]
+    assert entry.slug == "example-com-docs-a"
+    assert entry.size == len("alpha\n")
+    assert entry.fetched_at.startswith("2023-11-14T")
+
+
+def test_partial_crawl_keeps_pages_it_did_not_reach(tmp_path: Path) -> None:
+    first = [make_page(slug, f"{slug}\n") for slug in ("a", "b")]
+    write_pages(first, tmp_path)
+    write_manifest(build_manifest(first), tmp_path)
+
+    second = [make_page("a", "a v2\n")]
+    previous = load_manifest(tmp_path)
+    write_pages(second, tmp_path)
+    write_manifest(build_manifest(second), tmp_path, previous=previous, partial=True)
+
+    assert (tmp_path / "pages" / "example-com-docs-b.md").exists()
+    delta = json.loads((tmp_path / "delta.json").read_text(encoding="utf-8"))
+    assert delta == {"added": [], "changed": ["https://example.com/docs/a"], "removed": []}
+    manifest = load_manifest(tmp_path)
+    assert manifest is not None
+    assert set(manifest) == {"https://example.com/docs/a", "https://example.com/docs/b"}
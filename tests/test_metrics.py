@@ -0,0 +1,83 @@
+import io
+import json
+
+import pytest
+from conftest import FakeResponse
+
+import mdcrawler.crawler as crawler_module
+from mdcrawler.metrics import Histogram, Metrics
+
+
+def test_histogram_reports_percentiles() -> None:
+    histogram = Histogram()
+    for value in range(1, 101):
+        histogram.observe(float(value))
+
+    stats = histogram.to_dict()
+
+    assert stats["count"] == 100
+    assert stats["min"] == 1.0
+    assert stats["max"] == 100.0
+    assert stats["p50"] == 51.0
+    assert stats["p99"] == 100.0
+
+
+def test_metrics_emits_snapshots_and_summary() -> None:
+    sink = io.StringIO()
+    metrics = Metrics(sink=sink, interval=0.0)
+    metrics.incr("pages")
+    with metrics.timer("fetch"):
+        pass
+    metrics.maybe_emit(processed=1)
+    metrics.close()
+
+    records = [json.loads(line) for line in sink.getvalue().splitlines()]
+    assert [record["type"] for record in records] == ["snapshot", "summary"]
+    assert records[0]["processed"] == 1
+    assert records[1]["counters"] == {"pages": 1}
+    assert records[1]["histograms"]["fetch.seconds"]["count"] == 1
+    assert "pages: 1" in metrics.summary()
+
+
+def test_crawler_records_stage_metrics(monkeypatch: pytest.MonkeyPatch) -> None:
+    pages = {
+        "https://example.com/docs/start": '<p><a href="/docs/child">Child</a></p>',
+        "https://example.com/docs/child": '<p><a href="/docs/start">Back</a></p>',
+    }
+
+    def fake_fetch(url: str) -> FakeResponse:
+        if url not in pages:
+            raise ValueError(url)
+        return FakeResponse(text=pages[url])
+
+    monkeypatch.setattr(crawler_module, "fetch_url", fake_fetch)
+    metrics = Metrics()
+    crawler = crawler_module.Crawler(
+        start_url="https://example.com/docs/start",
+        prefix="https://example.com/docs/",
+        metrics=metrics,
+    )
+    crawler.run()
+
+    assert metrics.counters["pages"] == 2
+    assert metrics.counters["dedup.visited"] == 1
+    assert metrics.histograms["fetch.seconds"].count == 2
+    assert metrics.histograms["extract.seconds"].count == 2
+
+
+def test_crawler_emits_snapshots_while_crawling(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        crawler_module, "fetch_url", lambda url: FakeResponse(text=f"<p>Page {url}</p>")
+    )
+    sink = io.StringIO()
+    crawler = crawler_module.Crawler(
+        start_url="https://example.com/docs/start",
+        prefix="https://example.com/docs/",
+        metrics=Metrics(sink=sink, interval=0.0),
+    )
+    crawler.run()
+
+    records = [json.loads(line) for line in sink.getvalue().splitlines()]
+    assert records and {record["type"] for record in records} == {"snapshot"}
+    assert records[-1]["processed"] == 1
+    assert records[-1]["discovered"] == 1
@@ -0,0 +1,85 @@
+from pathlib import Path
+
+from mdcrawler.cli import main
+from mdcrawler.mirror import extract_mirror, path_to_url, url_to_path
+
+BASE_URL = "https://docs.example.com/guide"
+
+
+def _write_mirror(root: Path) -> None:
+    (root / "api").mkdir(parents=True)
+    (root / "img").mkdir()
+    (root / "index.html").write_text(
+        "<html><head><title>Home - Docs</title></head><body><main><h1>Home</h1>"
+        '<p>Welcome. See <a href="api/">the API</a>.</p>'
+        '<img src="img/logo.png" alt="Logo"/></main></body></html>',
+        encoding="utf-8",
+    )
+    (root / "api" / "index.html").write_text(
+        "<html><head><title>API - Docs</title></head><body><main><h1>API</h1>"
+        "<p>Call <code>fetch()</code>.</p></main></body></html>",
+        encoding="utf-8",
+    )
+    (root / "api" / "legacy.htm").write_bytes(
+        "<html><head><title>Caf\xe9 - Docs</title></head><body><main><p>Caf\xe9 notes</p>"
+        "</main></body></html>".encode("latin-1")
+    )
+    (root / "empty.html").write_text("", encoding="utf-8")
+    (root / "img" / "logo.png").write_bytes(b"\x89PNG logo")
+
+
+def test_paths_map_to_urls_and_back(tmp_path: Path) -> None:
+    _write_mirror(tmp_path)
+
+    assert path_to_url(tmp_path / "index.html", tmp_path, BASE_URL) == f"{BASE_URL}/"
+    assert path_to_url(tmp_path / "api" / "index.html", tmp_path, BASE_URL) == f"{BASE_URL}/api/"
+    assert url_to_path(f"{BASE_URL}/api/#usage", tmp_path, BASE_URL) == (
+        tmp_path / "api" / "index.html"
+    )
+    assert url_to_path(f"{BASE_URL}/img/logo.png", tmp_path, BASE_URL) == (
+        tmp_path / "img" / "logo.png"
+    )
+    assert url_to_path("https://other.example.com/img/logo.png", tmp_path, BASE_URL) is None
+    (tmp_path / "old").mkdir()
+    (tmp_path / "old" / "index.htm").write_text("<p>Old</p>", encoding="utf-8")
+    assert path_to_url(tmp_path / "old" / "index.htm", tmp_path, BASE_URL) == f"{BASE_URL}/old/"
+    assert url_to_path(f"{BASE_URL}/old/", tmp_path, BASE_URL) == tmp_path / "old" / "index.htm"
+
+
+def test_extract_mirror_reads_all_pages_in_parallel(tmp_path: Path) -> None:
+    _write_mirror(tmp_path)
+
+    pages = extract_mirror(tmp_path, BASE_URL, workers=2)
+
+    assert [page.url for page in pages] == [
+        f"{BASE_URL}/",
+        f"{BASE_URL}/api/",
+        f"{BASE_URL}/api/legacy.htm",
+    ]
+    assert "Café notes" in pages[2].markdown
+
+
+def test_extract_subcommand_writes_pages_and_local_images(tmp_path: Path) -> None:
+    mirror = tmp_path / "mirror"
+    output = tmp_path / "output"
+    _write_mirror(mirror)
+
+    exit_code = main(
+        [
+            "extract",
+            "--input",
+            str(mirror),
+            "--base-url",
+            BASE_URL,
+            "--output",
+            str(output),
+            "--workers",
+            "1",
+            "--include-images",
+        ]
+    )
+
+    assert exit_code == 0
+    assert len(list((output / "pages").glob("*.md"))) == 3
+    assert (output / "images" / "docs.example.com-logo.png").read_bytes() == b"\x89PNG logo"
+    assert f"Start-URL: {BASE_URL}" in (output / "index.md").read_text(encoding="utf-8")
@@ -0,0 +1,69 @@
+from collections.abc import Iterator
+from pathlib import Path
+
+from conftest import make_page
+
+from mdcrawler.crawler import Page
+from mdcrawler.outputs import write_outputs
+from mdcrawler.search_index import SEARCH_INDEX_FILENAME, search
+
+
+def test_write_outputs_writes_page_files_while_pages_stream_in(tmp_path: Path) -> None:
+    seen_on_disk: list[bool] = []
+
+    def crawl() -> Iterator[Page]:
+        for name in ("one", "two"):
+            yield make_page(name, f"# {name}\n")
+        seen_on_disk.append((tmp_path / "pages" / "example-com-docs-one.md").exists())
+
+    written = write_outputs(
+        crawl(), tmp_path, start_url="https://example.com/docs/", formats=["markdown"]
+    )
+
+    assert written == 2
+    assert seen_on_disk == [True]
+    assert (tmp_path / "index.md").exists()
+
+
+def test_write_outputs_streams_jsonl_chunks_before_the_crawl_ends(tmp_path: Path) -> None:
+    lines_on_disk: list[int] = []
+
+    def crawl() -> Iterator[Page]:
+        yield make_page("one", "# One\n\nFirst.\n")
+        lines_on_disk.append(len((tmp_path / "chunks.jsonl").read_text().splitlines()))
+        yield make_page("two", "# Two\n\nSecond.\n")
+
+    write_outputs(crawl(), tmp_path, start_url="https://example.com/docs/", formats=["jsonl"])
+
+    assert lines_on_disk == [1]
+    assert len((tmp_path / "chunks.jsonl").read_text().splitlines()) == 2
+
+
+def test_write_outputs_writes_nothing_for_an_empty_crawl(tmp_path: Path) -> None:
+    written = write_outputs(
+        iter([]),
+        tmp_path,
+        start_url="https://example.com/docs/",
+        formats=["markdown", "jsonl", "search"],
+    )
+
+    assert written == 0
+    assert not any(tmp_path.iterdir())
+
+
+def test_write_outputs_indexes_pages_as_they_stream_in_with_final_titles(
+    tmp_path: Path,
+) -> None:
+    index_path = tmp_path / SEARCH_INDEX_FILENAME
+    indexed_early: list[bool] = []
+
+    def crawl() -> Iterator[Page]:
+        for name in ("one", "two", "three"):
+            yield make_page(name, "# Install\n\nRun the installer.\n", title=f"Docs - {name}")
+        indexed_early.append(index_path.exists())
+
+    write_outputs(crawl(), tmp_path, start_url="https://example.com/docs/", formats=["search"])
+
+    assert indexed_early == [True]
+    titles = {hit.title for hit in search(index_path, "installer", kind="page")}
+    assert titles == {"one", "two", "three"}
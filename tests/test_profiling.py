@@ -0,0 +1,67 @@
+import pstats
+import threading
+from pathlib import Path
+
+from mdcrawler.profiling import StageProfiler, peak_rss_bytes
+
+
+def _busy() -> int:
+    return sum(i * i for i in range(10_000))
+
+
+def test_cpu_profiler_writes_stage_pstats_and_report(tmp_path: Path) -> None:
+    profiler = StageProfiler("cpu", tmp_path)
+    with profiler.stage("extract"):
+        _busy()
+    profiler.close()
+
+    stats = pstats.Stats(str(tmp_path / "extract.pstats"))
+    assert any(func[2] == "_busy" for func in stats.stats)
+    report = (tmp_path / "report.txt").read_text(encoding="utf-8")
+    assert "=== extract ===" in report
+    assert "Peak RSS" in report
+
+
+def test_cpu_profiler_profiles_concurrent_stages_completely(tmp_path: Path) -> None:
+    profiler = StageProfiler("cpu", tmp_path)
+
+    def work() -> None:
+        for _ in range(5):
+            with profiler.stage("extract"):
+                _busy()
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    profiler.close()
+
+    assert not profiler.skipped
+    stats = pstats.Stats(str(tmp_path / "extract.pstats"))
+    calls = [stat[1] for func, stat in stats.stats.items() if func[2] == "_busy"]
+    assert calls == [20]
+
+
+def test_mem_profiler_snapshots_every_n_pages(tmp_path: Path) -> None:
+    profiler = StageProfiler("mem", tmp_path, snapshot_every=2)
+    for _ in range(4):
+        profiler.page_done()
+    profiler.close()
+
+    assert sorted(path.name for path in tmp_path.glob("memory-*.txt")) == [
+        "memory-000002.txt",
+        "memory-000004.txt",
+    ]
+    assert "Top 25 allocation sites" in (tmp_path / "report.txt").read_text(encoding="utf-8")
+
+
+def test_disabled_profiler_writes_nothing(tmp_path: Path) -> None:
+    profiler = StageProfiler(None, tmp_path / "profile")
+    with profiler.stage("fetch"):
+        pass
+    profiler.page_done()
+    profiler.close()
+
+    assert not (tmp_path / "profile").exists()
+    assert peak_rss_bytes() >= 0
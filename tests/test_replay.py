@@ -0,0 +1,103 @@
+from pathlib import Path
+
+import pytest
+import requests
+
+from mdcrawler.cli import main
+from mdcrawler.replay import NotRecordedError, ReplayFetcher, ResponseRecorder
+from mdcrawler.synthetic import SiteConfig, SyntheticSite
+
+
+def _tree(directory: Path) -> dict[str, bytes]:
+    return {
+        str(path.relative_to(directory)): path.read_bytes()
+        for path in sorted(directory.rglob("*"))
+        if path.is_file() and path.name != "manifest.json"
+    }
+
+
+def test_replay_reproduces_recorded_crawl_without_network(tmp_path: Path) -> None:
+    archive = tmp_path / "archive"
+    with SyntheticSite(SiteConfig(pages=5, fanout=2, images=1)) as site:
+        assert (
+            main(
+                [
+                    "--start-url",
+                    site.start_url,
+                    "--output",
+                    str(tmp_path / "live"),
+                    "--include-images",
+                    "--threads",
+                    "1",
+                    "--record",
+                    str(archive),
+                ]
+            )
+            == 0
+        )
+
+    # The site is gone; replay has to serve pages and images from the archive.
+    assert (
+        main(
+            [
+                "--output",
+                str(tmp_path / "replayed"),
+                "--include-images",
+                "--threads",
+                "1",
+                "--replay",
+                str(archive),
+            ]
+        )
+        == 0
+    )
+
+    live = _tree(tmp_path / "live")
+    assert len([name for name in live if name.startswith("pages")]) == 5
+    assert any(name.startswith("images") for name in live)
+    assert _tree(tmp_path / "replayed") == live
+
+
+def test_replay_keeps_status_and_latest_record(tmp_path: Path) -> None:
+    with SyntheticSite(SiteConfig(pages=2)) as site:
+        with ResponseRecorder(tmp_path) as recorder:
+            fetch = recorder.wrap(_get)
+            fetch(site.start_url)
+            with pytest.raises(requests.HTTPError):
+                fetch(f"{site.base_url}/docs/missing")
+            fetch(site.start_url)
+
+    with ReplayFetcher(tmp_path) as replay:
+        assert "Page 0" in replay.fetch(site.start_url).text
+        with pytest.raises(requests.HTTPError) as error:
+            replay.fetch(f"{site.base_url}/docs/missing")
+        assert error.value.response is not None
+        assert error.value.response.status_code == 404
+        with pytest.raises(NotRecordedError):
+            replay.fetch(f"{site.base_url}/docs/page-1")
+    assert len((tmp_path / "responses.index.jsonl").read_text().splitlines()) == 3
+
+
+def _get(url: str) -> requests.Response:
+    response = requests.get(url, timeout=5)
+    response.raise_for_status()
+    return response
+
+
+def test_replay_of_an_empty_recording(tmp_path: Path) -> None:
+    with ResponseRecorder(tmp_path):
+        pass
+
+    with ReplayFetcher(tmp_path) as replay, pytest.raises(NotRecordedError):
+        replay.fetch("https://example.com/docs/")
+
+
+@pytest.mark.parametrize("start_url", [[], ["--start-url", "https://example.com/docs/"]])
+def test_replay_of_a_missing_recording_is_a_usage_error(
+    tmp_path: Path, start_url: list[str], capsys: pytest.CaptureFixture[str]
+) -> None:
+    with pytest.raises(SystemExit) as exc_info:
+        main([*start_url, "--replay", str(tmp_path / "missing"), "--output", str(tmp_path / "out")])
+
+    assert exc_info.value.code == 2
+    assert "responses.index.jsonl" in capsys.readouterr().err
@@ -0,0 +1,73 @@
+from pathlib import Path
+
+import pytest
+
+from mdcrawler.cli import main
+from mdcrawler.crawler import Page
+from mdcrawler.search_index import SearchIndexWriter, search
+
+
+def _pages() -> list[Page]:
+    return [
+        Page(
+            url="https://example.com/docs/install",
+            title="Install",
+            markdown="# Install\n\nUse pip.\n\n## Virtualenv\n\nCreate a virtualenv first.\n",
+            images=[],
+        ),
+        Page(
+            url="https://example.com/docs/usage",
+            title="Usage",
+            markdown="# Usage\n\nRun the crawler.\n",
+            images=[],
+        ),
+    ]
+
+
+def test_search_returns_ranked_sections_with_heading_path(tmp_path: Path) -> None:
+    with SearchIndexWriter(tmp_path, batch_size=1) as writer:
+        for page in _pages():
+            writer.add_page(page)
+
+    hits = search(tmp_path / "search.sqlite", "virtualenv")
+
+    assert hits[0].url == "https://example.com/docs/install"
+    assert hits[0].heading_path == "Install > Virtualenv"
+    assert "[virtualenv]" in hits[0].snippet
+    page_hits = search(tmp_path / "search.sqlite", "crawler", kind="page")
+    assert [hit.url for hit in page_hits] == ["https://example.com/docs/usage"]
+
+
+def test_search_subcommand_prints_hits(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    with SearchIndexWriter(tmp_path) as writer:
+        for page in _pages():
+            writer.add_page(page)
+
+    exit_code = main(["search", "pip", "--index", str(tmp_path / "search.sqlite")])
+
+    assert exit_code == 0
+    output = capsys.readouterr().out
+    assert output.startswith("1. Install > Install (https://example.com/docs/install)")
+
+
+def test_search_matches_punctuated_terms_literally(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    page = Page(
+        url="https://example.com/docs/cpp",
+        title="C++",
+        markdown='# C++\n\nBuild foo-bar with "abc flags.\n',
+        images=[],
+    )
+    with SearchIndexWriter(tmp_path) as writer:
+        writer.add_page(page)
+    index = tmp_path / "search.sqlite"
+
+    for query in ("foo-bar", "C++", '"abc'):
+        assert [hit.url for hit in search(index, query)] == [page.url]
+    assert search(index, "  ") == []
+    assert search(index, "build OR missing", raw=True)[0].url == page.url
+
+    with pytest.raises(SystemExit):
+        main(["search", "--raw", '"abc', "--index", str(index)])
+    assert "invalid query" in capsys.readouterr().err
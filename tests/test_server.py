@@ -0,0 +1,99 @@
+import socket
+import threading
+from collections.abc import Iterator
+
+import pytest
+import requests
+
+from mdcrawler.server import ExtractionService, ServiceError, make_server
+from mdcrawler.synthetic import SiteConfig, SyntheticSite
+
+HTML = (
+    "<html><head><title>Intro - Docs</title></head><body><nav>Menu</nav>"
+    '<main><h1>Intro</h1><p>See <a href="/docs/setup">setup</a>.</p></main></body></html>'
+)
+
+
+@pytest.fixture()
+def service_url() -> Iterator[str]:
+    service = ExtractionService(cache_size=8)
+    server = make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.close()
+
+
+def test_extract_endpoint_caches_results_and_reports_latency(service_url: str) -> None:
+    payload = {"html": HTML, "url": "https://docs.example.com/docs/intro"}
+
+    first = requests.post(f"{service_url}/extract", json=payload, timeout=5).json()
+    second = requests.post(f"{service_url}/extract", json=payload, timeout=5).json()
+    metrics = requests.get(f"{service_url}/metrics", timeout=5).json()
+
+    assert first["title"] == "Intro - Docs"
+    assert "Menu" not in first["markdown"]
+    assert first["discovered_urls"] == ["https://docs.example.com/docs/setup"]
+    assert (first["cached"], second["cached"]) == (False, True)
+    assert metrics["counters"]["cache.hit"] == 1
+    assert metrics["histograms"]["request.extract.seconds"]["count"] == 2
+    assert metrics["histograms"]["extract.seconds"]["count"] == 1
+
+
+def test_fetch_endpoint_and_errors(service_url: str) -> None:
+    with SyntheticSite(SiteConfig(pages=2, images=0)) as site:
+        document = requests.post(
+            f"{service_url}/fetch", json={"url": site.start_url}, timeout=5
+        ).json()
+        missing = requests.post(
+            f"{service_url}/fetch", json={"url": f"{site.base_url}/docs/nope"}, timeout=5
+        )
+
+    assert document["title"] == "Page 0 - Synthetic Docs"
+    assert document["final_url"] == site.start_url
+    assert missing.status_code == 502
+    assert requests.post(f"{service_url}/extract", json={"url": "x"}, timeout=5).status_code == 400
+    assert requests.post(f"{service_url}/nope", json={}, timeout=5).status_code == 404
+
+
+def _raw_post(service_url: str, content_length: str) -> bytes:
+    host, port = service_url.removeprefix("http://").split(":")
+    with socket.create_connection((host, int(port)), timeout=5) as connection:
+        connection.sendall(
+            f"POST /extract HTTP/1.1\r\nHost: {host}\r\nContent-Length: {content_length}\r\n\r\n".encode()
+        )
+        # The server must answer and then close the connection without reading a body.
+        chunks = []
+        while chunk := connection.recv(65536):
+            chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def test_bad_or_oversized_content_length_is_rejected_and_closes(service_url: str) -> None:
+    assert _raw_post(service_url, "-1").startswith(b"HTTP/1.1 400")
+    assert _raw_post(service_url, "ten").startswith(b"HTTP/1.1 400")
+    too_large = _raw_post(service_url, str(64 * 1024 * 1024))
+    assert too_large.startswith(b"HTTP/1.1 413")
+    assert b"Connection: close" in too_large
+
+    payload = {"html": HTML, "url": "https://docs.example.com/docs/intro", "prefix": 3}
+    response = requests.post(f"{service_url}/extract", json=payload, timeout=5)
+    assert response.status_code == 400
+    assert response.json() == {"error": "missing string field: prefix"}
+
+
+def test_fetch_rejects_responses_over_the_size_cap() -> None:
+    service = ExtractionService(max_bytes=256)
+    try:
+        with SyntheticSite(SiteConfig(pages=2, images=0)) as site:
+            with pytest.raises(ServiceError) as error:
+                service.fetch(site.start_url)
+    finally:
+        service.close()
+
+    assert error.value.status == 502
+    assert service.metrics.counters["errors.ResponseTooLargeError"] == 1
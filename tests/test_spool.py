@@ -0,0 +1,53 @@
+from pathlib import Path
+
+import pytest
+from conftest import make_page
+
+from mdcrawler.cli import main
+from mdcrawler.content_extractor import ImageReference
+from mdcrawler.spool import BodySpool, SpilledPage
+from mdcrawler.synthetic import SiteConfig, SyntheticSite
+
+BODY = "# Page\n\n" + "Lorem ipsum dolor sit amet. " * 200
+IMAGE = ImageReference(token="@@IMG0@@", url="https://example.com/a.png", alt="A")
+
+
+def test_page_and_image_reference_are_slotted() -> None:
+    page = make_page("0", BODY, images=[IMAGE])
+
+    assert not hasattr(page, "__dict__")
+    assert not hasattr(page.images[0], "__dict__")
+
+
+@pytest.mark.parametrize("mode", ["memory", "disk"])
+def test_spilled_pages_read_back_their_markdown(mode: str) -> None:
+    with BodySpool(mode) as spool:
+        pages = [
+            spool.spill(make_page(str(index), BODY * index, images=[IMAGE])) for index in (1, 2, 3)
+        ]
+
+        assert all(isinstance(page, SpilledPage) for page in pages)
+        assert [page.markdown for page in pages] == [BODY * index for index in (1, 2, 3)]
+        assert pages[2].images[0].url == "https://example.com/a.png"
+        assert spool.stored_bytes < sum(len(page.markdown) for page in pages) / 10
+        pages[1].title = "Renamed"
+        pages[1].markdown = "# Replaced\n"
+        assert (pages[1].title, pages[1].markdown) == ("Renamed", "# Replaced\n")
+
+
+def test_spill_does_not_change_crawl_output(tmp_path: Path) -> None:
+    with SyntheticSite(SiteConfig(pages=4, fanout=2, images=0)) as site:
+        for name, extra in (("plain", []), ("spilled", ["--spill", "disk"])):
+            argv = [
+                "--start-url",
+                site.start_url,
+                "--threads",
+                "1",
+                "--output",
+                str(tmp_path / name),
+            ]
+            assert main(argv + extra) == 0
+
+    for path in (tmp_path / "plain").rglob("*.md"):
+        spilled = tmp_path / "spilled" / path.relative_to(tmp_path / "plain")
+        assert spilled.read_bytes() == path.read_bytes()
@@ -0,0 +1,51 @@
+from mdcrawler.title_normalizer import TitleNormalizer, normalize_titles
+
+PREFIX = "https://example.com/docs/"
+
+
+def test_normalize_titles_strips_site_wide_affixes() -> None:
+    titles = ["Install - MyLib", "Configure - MyLib", "Upgrade - MyLib"]
+
+    assert normalize_titles(titles) == ["Install", "Configure", "Upgrade"]
+
+
+def test_streaming_normalizer_learns_per_section_affixes() -> None:
+    normalizer = TitleNormalizer(PREFIX)
+    pages = [
+        (f"{PREFIX}api/{name}", f"{name} | API Reference | MyLib")
+        for name in ("Client", "Session", "Response")
+    ] + [
+        (f"{PREFIX}guide/{name}", f"{name} | Guides | MyLib")
+        for name in ("Install", "Configure", "Deploy")
+    ]
+
+    provisional = [normalizer.add(url, title) for url, title in pages]
+
+    assert provisional[0] == "Client | API Reference | MyLib"
+    assert provisional[-1] == "Deploy"
+    assert list(normalizer.finalize().values()) == [
+        "Client",
+        "Session",
+        "Response",
+        "Install",
+        "Configure",
+        "Deploy",
+    ]
+
+
+def test_streaming_normalizer_stops_learning_after_its_sample() -> None:
+    normalizer = TitleNormalizer(PREFIX, sample_size=3)
+    for index in range(3):
+        normalizer.add(f"{PREFIX}{index}", f"Page {index} - MyLib")
+
+    assert normalizer.add(f"{PREFIX}other", "Other - Elsewhere") == "Other - Elsewhere"
+    assert normalizer.add(f"{PREFIX}late", "Late - MyLib") == "Late"
+
+
+def test_normalize_handles_sections_it_has_not_seen() -> None:
+    normalizer = TitleNormalizer(PREFIX)
+    for name in ("Install", "Configure", "Deploy"):
+        normalizer.add(f"{PREFIX}guide/{name}", f"{name} - MyLib")
+
+    assert normalizer.normalize(f"{PREFIX}api/Client", "Client - MyLib") == "Client"
+    assert TitleNormalizer(PREFIX).normalize(f"{PREFIX}api/Client", "Client") == "Client"
@@ -0,0 +1,58 @@
+import json
+import threading
+from pathlib import Path
+
+import pytest
+from conftest import FakeResponse
+
+import mdcrawler.crawler as crawler_module
+from mdcrawler.tracing import TraceRecorder
+
+
+def test_disabled_recorder_records_nothing() -> None:
+    tracer = TraceRecorder(enabled=False)
+    with tracer.span("fetch", url="https://example.com/"):
+        tracer.instant("queued")
+
+    assert tracer.events() == []
+
+
+def test_recorder_writes_chrome_trace_per_thread(tmp_path: Path) -> None:
+    tracer = TraceRecorder()
+
+    def work() -> None:
+        with tracer.span("fetch", url="https://example.com/"):
+            pass
+
+    thread = threading.Thread(target=work, name="worker-1")
+    thread.start()
+    thread.join()
+    tracer.instant("queued", url="https://example.com/")
+    tracer.write(tmp_path / "trace.json")
+
+    events = json.loads((tmp_path / "trace.json").read_text(encoding="utf-8"))["traceEvents"]
+    names = {event["args"]["name"] for event in events if event["ph"] == "M"}
+    assert "worker-1" in names
+    span = next(event for event in events if event["ph"] == "X")
+    assert span["name"] == "fetch"
+    assert span["dur"] >= 0
+    assert span["args"] == {"url": "https://example.com/"}
+    assert {event["tid"] for event in events if event["ph"] != "M"} == {
+        event["tid"] for event in events if event["ph"] == "M"
+    }
+
+
+def test_crawler_records_url_lifecycle(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        crawler_module, "fetch_url", lambda url: FakeResponse(text="<p>Only page</p>")
+    )
+    tracer = TraceRecorder()
+    crawler = crawler_module.Crawler(
+        start_url="https://example.com/docs/start",
+        prefix="https://example.com/docs/",
+        tracer=tracer,
+    )
+    crawler.run()
+
+    names = [event["name"] for event in tracer.events() if event["ph"] != "M"]
+    assert sorted(names) == ["crawl", "decode", "extract", "fetch", "markdown", "parse", "queued"]